@@ -0,0 +1,75 @@
+# Benchmark: memory of a MySQL-shaped result frame, object dtypes + replace({None: ''}) vs. typed loader
+# Usage: python benchmarks/bench_frame_memory.py --rows 100000
+
+# Import argparse for the command-line options
+import argparse
+# Import sys/os so the repo root is importable when run from anywhere
+import os
+import sys
+# Import datetime for Placement_Date values
+import datetime
+# Import numpy and pandas for building the synthetic frame
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from typed_frames import apply_schema_dtypes  # noqa: E402
+
+# ___________________________________________ #
+
+# Define builder for the full search join as pd.read_sql returns it (Python objects, None for NULL)
+def build_raw_frame(rows, seed=1):
+    rng = np.random.default_rng(seed)
+    placed = rng.random(rows) < 0.4
+    ids = [f'G25AIML_{i:06d}' for i in range(1, rows + 1)]
+    frame = {
+        'Student_ID': ids,
+        'Name': [f'Student {i}' for i in range(rows)],
+        'Age': rng.integers(22, 61, rows),
+        'Gender': rng.choice(['Male', 'Female', 'Other'], rows),
+        'Email': [f'student{i}@gmail.com' for i in range(rows)],
+        'Phone': rng.integers(7000000000, 9999999999, rows).astype(str),
+        'Enrollment_Year': rng.choice(['2024', '2025'], rows),
+        'Course_Batch': rng.choice(['JNY25WD', 'FY25WE', 'MH24WD', 'AL25WE'], rows),
+        'City': rng.choice(['Chennai', 'Mumbai', 'Delhi', 'Pune', 'Kolkata'], rows),
+        'Graduation_Year': rng.integers(1990, 2026, rows),
+        'Language': rng.choice(['python, mysql, pandas, numpy', 'python, mysql, pandas, pytorch'], rows),
+        'Problems_Solved': rng.integers(250, 1001, rows),
+        'Assessments_Completed': rng.integers(10, 16, rows),
+        'Mini_Projects': rng.integers(6, 11, rows),
+        'Certifications_Earned': rng.choice(['python', 'mysql, AI', 'Pytorch, ML in AWS'], rows),
+        'Latest_Project_Score': rng.integers(50, 101, rows),
+    }
+    for name in ['Communication_Score', 'Teamwork_Score', 'Presentation_Score',
+                 'Leadership_Score', 'Critical_Thinking', 'Interpersonal_Skills', 'Mock_Interview_Score']:
+        frame[name] = rng.integers(40, 101, rows)
+    frame['Internships_Completed'] = rng.integers(1, 5, rows)
+    frame['Company_Name'] = [f'Company {i % 500}' if p else None for i, p in enumerate(placed)]
+    frame['Placement_Package'] = [int(v) if p else None for v, p in zip(rng.integers(400000, 3000000, rows), placed)]
+    frame['Interview_Rounds_Cleared'] = rng.integers(0, 3, rows)
+    frame['Placement_Date'] = [datetime.date(2025, 1, 1) + datetime.timedelta(days=int(d)) if p else None
+                               for d, p in zip(rng.integers(0, 365, rows), placed)]
+    frame['Placement_Status'] = np.where(placed, 'Placed', rng.choice(['Ready', 'Not Ready'], rows))
+    # pd.read_sql hands back Python objects; nullable INT columns arrive as object
+    return pd.DataFrame({k: pd.Series(list(v), dtype=object) for k, v in frame.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare memory of legacy vs. typed result frames')
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    raw = build_raw_frame(args.rows)
+    legacy = raw.infer_objects().replace({None: ''})  # What execute_sql_query used to keep
+    typed = apply_schema_dtypes(raw.infer_objects())
+
+    legacy_mb = legacy.memory_usage(deep=True).sum() / 1e6
+    typed_mb = typed.memory_usage(deep=True).sum() / 1e6
+    print(f"rows={args.rows}")
+    print(f"legacy (object + replace): {legacy_mb:9.1f} MB")
+    print(f"typed loader:              {typed_mb:9.1f} MB")
+    print(f"reduction:                 {100 * (1 - typed_mb / legacy_mb):9.1f} %")
+
+
+if __name__ == '__main__':
+    main()
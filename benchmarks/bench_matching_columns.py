@@ -0,0 +1,87 @@
+# Benchmark: per-value Python loop vs. vectorized matching-column detection
+# Usage: python benchmarks/bench_matching_columns.py --rows 100000 --keywords chennai,python,ready
+
+# Import argparse for the command-line options
+import argparse
+# Import sys/os so the repo root is importable when run from anywhere
+import os
+import sys
+# Import time for wall-clock timings
+import time
+# Import numpy and pandas for building the synthetic result frame
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from matching_columns import find_matching_columns  # noqa: E402
+
+# ___________________________________________ #
+
+# Define builder for a search-result-shaped frame (same columns as the live search)
+def build_result_frame(rows, seed=1):
+    rng = np.random.default_rng(seed)
+    cities = np.array(['Chennai', 'Mumbai', 'Delhi', 'Pune', 'Kolkata', 'Hyderabad', 'Bengaluru', 'Jaipur'])
+    langs = np.array(['python, mysql, pandas, numpy', 'python, mysql, pandas, pytorch', 'python, mysql, pandas, llama, mistral'])
+    statuses = np.array(['Ready', 'Not Ready', 'Placed'])
+    ids = np.char.add('G25AIML_', np.arange(1, rows + 1).astype(str))
+    frame = {
+        'Student_ID': ids,
+        'Name': np.char.add('Student ', np.arange(rows).astype(str)),
+        'Age': rng.integers(22, 61, rows),
+        'Email': np.char.add(np.char.add('student', np.arange(rows).astype(str)), '@gmail.com'),
+        'Phone': rng.integers(7000000000, 9999999999, rows).astype(str),
+        'City': rng.choice(cities, rows),
+        'Graduation_Year': rng.integers(1990, 2026, rows),
+        'Language': rng.choice(langs, rows),
+        'Problems_Solved': rng.integers(250, 1001, rows),
+        'Mini_Projects': rng.integers(6, 11, rows),
+        'Placement_Status': rng.choice(statuses, rows),
+    }
+    for name in ['Communication_Score', 'Teamwork_Score', 'Presentation_Score',
+                 'Leadership_Score', 'Critical_Thinking', 'Interpersonal_Skills', 'Mock_Interview_Score']:
+        frame[name] = rng.integers(40, 101, rows)
+    return pd.DataFrame(frame)
+
+
+# Define the original implementation for comparison
+def loop_matching_columns(result, keywords):
+    matching = set()
+    for keyword in keywords:
+        for col in result.columns:
+            if any(keyword in str(value).lower() for value in result[col].dropna()):
+                matching.add(col.split('.')[-1])
+    return matching
+
+
+# Define helper returning (best seconds, output) over a few repeats
+def best_of(fn, repeats):
+    best, out = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare loop vs. vectorized matching-column detection')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--keywords', default='chennai,python,ready')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    keywords = [k.strip().lower() for k in args.keywords.split(',') if k.strip()]
+    result = build_result_frame(args.rows)
+
+    loop_s, loop_cols = best_of(lambda: loop_matching_columns(result, keywords), args.repeats)
+    vec_s, vec_cols = best_of(lambda: find_matching_columns(result, keywords), args.repeats)
+
+    assert loop_cols == vec_cols, (loop_cols, vec_cols)
+    print(f"rows={args.rows} keywords={keywords}")
+    print(f"loop:       {loop_s * 1000:9.1f} ms")
+    print(f"vectorized: {vec_s * 1000:9.1f} ms")
+    print(f"speedup:    {loop_s / vec_s:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,364 @@
+# Benchmark harness: replays the portal's query paths at several dataset sizes and reports latency, throughput and RSS as JSON
+# Usage: python benchmarks/bench_portal.py --students 1000,100000,1000000 --out bench.json                 (embedded SQLite)
+#        python benchmarks/bench_portal.py --backend mysql --database scratch_db --out bench.json ...      (DROPS and reloads the tables)
+#        python benchmarks/bench_portal.py --students 100000 --compare bench.json                          (exit 1 on p95 regressions)
+
+# Import argparse for the command-line options
+import argparse
+# Import sys/os so the repo root is importable when run from anywhere
+import os
+import sys
+# Import json for the report
+import json
+# Import time for latency measurements
+import time
+# Import platform and subprocess for the report metadata
+import platform
+import subprocess
+# Import resource for peak RSS
+import resource
+# Import threading for the concurrent AppTest sessions
+import threading
+# Import multiprocessing so every dataset size runs in a fresh process (peak RSS per size)
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+# Import numpy for percentiles
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("GUVI_METRICS_PORT", "0")  # The portal under AppTest must not bind the metrics port
+from datagen import generate_sample_data  # noqa: E402
+from insights import INSIGHT_SPECS, default_insights  # noqa: E402
+from schema_catalog import FALLBACK_CATALOG, PROFILE_TABLE  # noqa: E402
+from student_profile import PRESENCE_COLUMNS  # noqa: E402
+from pagination import make_paged_query, count_sql, page_sql, next_cursor  # noqa: E402
+from search_query import parse_search  # noqa: E402
+from search_index import SEARCH_RESULT_LIMIT  # noqa: E402
+from cli_common import add_db_arguments  # noqa: E402
+
+# ___________________________________________ #
+
+# Search-box inputs as HR types them: cities, statuses, skills, typed fields and combinations
+SEARCH_KEYWORD_SETS = [
+    "chennai",
+    "python",
+    "ready",
+    "chennai, python",
+    "placed, pytorch",
+    "mumbai, ready, pandas",
+    "bengaluru, placed, numpy",
+    "llama, mistral",
+    "delhi, not ready",
+    "internship, ready",
+    "mock, hyderabad",
+    "pune, python, ready",
+    "ready, python, mock>=60",
+    "city:chennai, grad:2024..2025",
+    "status:placed|ready, package>=600000",
+]
+
+# Custom View picks: (Students, Placements, Programming, Soft_Skills) columns, plus a sort column
+CUSTOM_VIEW_COMBOS = [
+    (['Name', 'City'], [], [], [], None),
+    (['Name'], ['Placement_Status', 'Mock_Interview_Score'], [], [], 'Mock_Interview_Score'),
+    (['Name', 'Graduation_Year'], ['Placement_Status'], ['Problems_Solved', 'Language'], [], 'Problems_Solved'),
+    (['Name'], ['Placement_Status'], ['Problems_Solved'], ['Avg_Soft_Skills'], 'Avg_Soft_Skills'),
+    (['Name', 'Email', 'City'], ['Company_Name', 'Placement_Package'], [], [], 'Placement_Package'),
+]
+
+# Rows per Custom View page (the portal's default)
+PAGE_SIZE = 10
+
+# ___________________________________________ #
+
+# Define Custom View SQL exactly as the portal builds it
+def custom_view_sql(students, placements, programming, soft_skills, use_profile):
+    picks = [('s', 'Students', students), ('p', 'Placements', placements), ('pr', 'Programming', programming), ('ss', 'Soft_Skills', soft_skills)]
+    selected = ['s.Student_ID'] + [f"{alias}.{col}" for alias, _, cols in picks for col in cols if col != 'Student_ID']
+    tables = [f"{table} {alias}" for alias, table, cols in picks if cols]
+    if use_profile:
+        presence = [f"s.{PRESENCE_COLUMNS[alias]} = 1" for alias, _, cols in picks if cols and alias in PRESENCE_COLUMNS]
+        sql = f"SELECT {', '.join('s.' + col.split('.', 1)[1] for col in selected)} FROM {PROFILE_TABLE} s"
+        return sql + (" WHERE " + " AND ".join(presence) if presence else "")
+    sql = f"SELECT {', '.join(selected)} FROM {tables[0]}"
+    return sql + "".join(f" JOIN {t} ON s.Student_ID = {t.split()[1]}.Student_ID" for t in tables[1:])
+
+
+# Define search SQL for a list of matched IDs (the portal's primary-key lookup after the index)
+def search_sql(where, use_profile):
+    columns_by_alias = FALLBACK_CATALOG.columns_by_alias()
+    if use_profile:
+        cols = ['s.Student_ID'] + [f's.{c}' for cols in columns_by_alias.values() for c in cols if c != 'Student_ID']
+        return f"SELECT {', '.join(cols)} FROM {PROFILE_TABLE} s WHERE {where}"
+    cols = ['s.Student_ID'] + [f'{a}.{c}' for a, cols in columns_by_alias.items() for c in cols if c != 'Student_ID']
+    return f"""SELECT {', '.join(cols)} FROM Students s
+    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+    LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+    LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
+    WHERE {where}"""
+
+
+# Define latency summary
+def summarize(timings_ms, wall_s):
+    timings = np.asarray(timings_ms, dtype=float)
+    if not len(timings):
+        return {'ops': 0}
+    return {
+        'ops': int(len(timings)),
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'p99_ms': round(float(np.percentile(timings, 99)), 3),
+        'max_ms': round(float(timings.max()), 3),
+        'throughput_ops_s': round(len(timings) / wall_s, 2) if wall_s else None,
+    }
+
+
+# Define timed loop over a list of operations: name -> fn()
+def replay(operations, repeat):  # Returns (summary, {name: p50_ms})
+    timings, per_op = [], {}
+    started = time.perf_counter()
+    for name, op in operations:
+        op()  # Warm-up (page cache / buffer pool / index build)
+        op_timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            op()
+            op_timings.append((time.perf_counter() - t0) * 1000)
+        timings += op_timings
+        per_op[name] = round(float(np.percentile(op_timings, 50)), 3)
+    return summarize(timings, time.perf_counter() - started), per_op
+
+# ___________________________________________ #
+
+# Define SQLite backend: the portal's offline engine over N generated students
+def sqlite_backend(students, seed):
+    from offline_engine import OfflineEngine
+    engine = OfflineEngine(*generate_sample_data(students, seed=seed))
+    return {
+        'query': engine.query,
+        'search': engine.search,  # Index lookup + primary-key fetch, as in the offline portal
+        'use_profile': False,
+        'close': lambda: None,
+    }
+
+
+# Define MySQL backend: bulk-load generated data into the given database, then build indexes and the profile
+def mysql_backend(students, seed, db_args):
+    from cli_common import db_config_from_args, connect
+    from bulk_load import bulk_load_generated
+    from migrations import migrate
+    from search_index import InvertedIndex, fetch_index_rows
+    from query_executor import read_frame
+    db_config = db_config_from_args(db_args)
+    conn = connect(db_config, allow_local_infile=True)
+    bulk_load_generated(conn, students, seed=seed)
+    migrate(conn)  # Secondary indexes, Student_Skills and Student_Profile
+    index = InvertedIndex()
+    index.sync(fetch_index_rows(db_config))
+
+    def query(sql, params=None):
+        return read_frame(conn, sql.strip().rstrip(';'), params)
+
+    skills = frozenset(query("SELECT DISTINCT Skill FROM Student_Skills")['Skill'])
+
+    def search(criteria):  # Same plan as the live portal: typed predicates plus index matches
+        plan = parse_search(criteria, FALLBACK_CATALOG, skills)
+        ids = index.search(plan.text) if plan.text else None
+        if ids == []:
+            return None
+        where, params = plan.where(ids, profile=True)
+        sql = search_sql(where, True)
+        if ids is None:
+            sql += f" ORDER BY s.Student_ID LIMIT {SEARCH_RESULT_LIMIT}"
+        return query(sql, params or None)
+    return {'query': query, 'search': search, 'use_profile': True, 'close': conn.close}
+
+
+# Define Custom View operation: column list + COUNT, then two pages through the keyset cursor
+def custom_view_op(query, sql, sort_column):
+    def op():
+        paged = make_paged_query(sql)
+        paged['columns'] = list(query(f"SELECT * FROM ({paged['sql']}) AS q LIMIT 0").columns)
+        count, params = count_sql(paged)
+        query(count, params or None)
+        cursor = {'offset': 0, 'after': None}
+        for _ in range(2):
+            page, params = page_sql(paged, sort_column, True, cursor, PAGE_SIZE)
+            page_df = query(page, params or None)
+            cursor = next_cursor(paged, page_df, sort_column, cursor, True)
+    return op
+
+# ___________________________________________ #
+
+# Define simulated user session through Streamlit's AppTest (offline portal, same dataset size)
+def session_actions(at, user):  # Yields (action name, callable) in the order a user clicks
+    keywords = SEARCH_KEYWORD_SETS[user % len(SEARCH_KEYWORD_SETS)]
+    insight = user % len(INSIGHT_SPECS) + 1
+    combo = CUSTOM_VIEW_COMBOS[user % len(CUSTOM_VIEW_COMBOS)]
+    yield 'search', lambda: (at.text_input(key="search_input").input(keywords), at.button(key="search_button").click().run())
+    yield 'insight', lambda: (at.selectbox(key="insight_select").set_value(insight), at.button(key="run_insight_button").click().run())
+    yield 'insight_next_page', lambda: click_if_present(at, "insights_visible_rows_next_page")
+    yield 'custom_view', lambda: (at.multiselect(key="student_filter").set_value(combo[0]),
+                                  at.multiselect(key="placement_filter").set_value(combo[1]),
+                                  at.button(key="apply_filters").click().run())
+    yield 'custom_view_next_page', lambda: click_if_present(at, "custom_visible_rows_next_page")
+
+
+# Define click on a button that only exists when the result has another page
+def click_if_present(at, key):  # Returns False (not timed) when the button is absent
+    if not any(button.key == key for button in at.button):
+        return False
+    at.button(key=key).click().run()
+
+
+# Define concurrent session workload: N users, each running the action sequence `rounds` times
+def run_sessions(users, rounds, students):
+    from streamlit.testing.v1 import AppTest
+    os.environ["GUVI_SAMPLE_STUDENTS"] = str(students)
+    script = os.path.join(REPO_ROOT, "guvi_placements_portal_UI.py")
+    timings, per_action, failures = [], {}, []
+    lock = threading.Lock()
+
+    def user_thread(user):
+        try:
+            at = AppTest.from_file(script, default_timeout=600)
+            at.run()
+            at.session_state.use_sample_data = True  # Offline portal over the same generated dataset size
+            at.run()
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+        except Exception as e:
+            with lock:
+                failures.append(f"user {user} start: {type(e).__name__}: {e}")
+            return
+        for _ in range(rounds):
+            for name, action in session_actions(at, user):
+                t0 = time.perf_counter()
+                try:
+                    if action() is False:
+                        continue
+                except Exception as e:  # e.g. a button absent because the result had one page
+                    with lock:
+                        failures.append(f"user {user} {name}: {type(e).__name__}: {e}")
+                    continue
+                elapsed = (time.perf_counter() - t0) * 1000
+                with lock:
+                    timings.append(elapsed)
+                    per_action.setdefault(name, []).append(elapsed)
+                    if at.exception:
+                        failures.append(f"user {user} {name}: {at.exception[0].message}")
+
+    warm = AppTest.from_file(script, default_timeout=600)  # Builds the shared sample snapshot and engine once
+    warm.run()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user_thread, args=(u,)) for u in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summary = summarize(timings, time.perf_counter() - started)
+    summary['users'] = users
+    summary['per_action_p50_ms'] = {name: round(float(np.percentile(t, 50)), 3) for name, t in per_action.items()}
+    summary['failures'] = failures[:20]
+    return summary
+
+# ___________________________________________ #
+
+# Define benchmark for one dataset size (runs in its own process)
+def bench_size(students, args):
+    started = time.perf_counter()
+    backend = sqlite_backend(students, args.seed) if args.backend == 'sqlite' else mysql_backend(students, args.seed, args)
+    setup_s = time.perf_counter() - started
+    query, use_profile = backend['query'], backend['use_profile']
+    workloads = {}
+
+    summary, per_op = replay([(f'insight {qid}', lambda sql=sql, params=params: query(sql, params))
+                              for qid, (sql, params) in default_insights(profile=use_profile).items()], args.repeat)
+    workloads['insights'] = {**summary, 'per_query_p50_ms': per_op}
+
+    summary, per_op = replay([(keywords, lambda k=keywords: backend['search'](k)) for keywords in SEARCH_KEYWORD_SETS], args.repeat)
+    workloads['search'] = {**summary, 'per_query_p50_ms': per_op}
+
+    operations = [(f"{'+'.join(s + p + pr + ss)} by {sort}", custom_view_op(query, custom_view_sql(s, p, pr, ss, use_profile), sort))
+                  for s, p, pr, ss, sort in CUSTOM_VIEW_COMBOS]
+    summary, per_op = replay(operations, args.repeat)
+    workloads['custom_view'] = {**summary, 'per_query_p50_ms': per_op}
+    backend['close']()
+
+    if args.users:
+        workloads['sessions'] = run_sessions(args.users, args.rounds, students)
+
+    return {
+        'setup_s': round(setup_s, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),  # Linux reports KiB
+        'workloads': workloads,
+    }
+
+
+# Define comparison against a previous report
+def compare(report, baseline, tolerance):  # Returns lines describing p95 regressions beyond tolerance
+    regressions = []
+    for size, result in report['results'].items():
+        base = baseline.get('results', {}).get(size)
+        if not base:
+            continue
+        for name, workload in result['workloads'].items():
+            before = base['workloads'].get(name, {}).get('p95_ms')
+            after = workload.get('p95_ms')
+            if before and after and after > before * (1 + tolerance):
+                regressions.append(f"students={size} {name}: p95 {before:.1f}ms -> {after:.1f}ms (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+# Define report metadata (what to hold fixed when comparing runs)
+def metadata(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {'commit': commit, 'backend': args.backend, 'seed': args.seed, 'repeat': args.repeat, 'users': args.users,
+            'rounds': args.rounds, 'python': platform.python_version(), 'machine': platform.machine(),
+            'cpus': os.cpu_count(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay the portal query paths and report p50/p95/p99, throughput and peak RSS')
+    parser.add_argument('--students', default='1000,100000,1000000', help='Comma-separated dataset sizes')
+    parser.add_argument('--seed', type=int, default=1, help='Generator seed (same seed -> same dataset)')
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per query')
+    parser.add_argument('--users', type=int, default=4, help='Concurrent AppTest sessions (0 skips the session workload)')
+    parser.add_argument('--rounds', type=int, default=2, help='Action sequences per session')
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--out', help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--compare', help='Previous JSON report; exit 1 if any p95 regressed beyond --tolerance')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95 slowdown for --compare (default: 0.2 = 20%%)')
+    add_db_arguments(parser)  # Only used with --backend mysql
+    args = parser.parse_args()
+
+    report = {'meta': metadata(args), 'results': {}}
+    for students in [int(n) for n in args.students.split(',')]:
+        # A fresh process per size, so peak RSS belongs to that size alone
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            result = pool.submit(bench_size, students, args).result()
+        report['results'][str(students)] = result
+        line = ", ".join(f"{name} p95 {w['p95_ms']:.1f}ms" for name, w in result['workloads'].items() if 'p95_ms' in w)
+        print(f"students={students:,}: setup {result['setup_s']}s, peak RSS {result['peak_rss_mb']} MB; {line}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
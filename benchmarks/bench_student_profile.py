@@ -0,0 +1,128 @@
+# Benchmark: four-table join vs. denormalized Student_Profile for the portal's read paths
+# Usage: python benchmarks/bench_student_profile.py --students 10000,100000,1000000              (embedded SQLite)
+#        python benchmarks/bench_student_profile.py --backend mysql --database scratch_db ...  (DROPS and reloads the tables)
+
+# Import argparse for the command-line options
+import argparse
+# Import sys/os so the repo root is importable when run from anywhere
+import os
+import sys
+# Import time and statistics for latency measurements
+import time
+import statistics
+# Import random for picking search IDs
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datagen import generate_sample_data  # noqa: E402
+from insights import default_insights  # noqa: E402
+from schema_catalog import FALLBACK_CATALOG  # noqa: E402
+from student_profile import profile_select, PROFILE_INDEXES, PROFILE_TABLE  # noqa: E402
+from cli_common import add_db_arguments  # noqa: E402
+
+# ___________________________________________ #
+
+# Students looked up by the search benchmark (the search index returns IDs; the portal fetches their rows)
+SEARCH_IDS = 200
+
+
+# Define the paired read paths: name -> (join SQL, profile SQL, params)
+def read_paths(student_ids):
+    columns_by_alias = FALLBACK_CATALOG.columns_by_alias()
+    join_cols = ['s.Student_ID'] + [f'{a}.{c}' for a, cols in columns_by_alias.items() for c in cols if c != 'Student_ID']
+    profile_cols = ['s.Student_ID'] + [f's.{c}' for cols in columns_by_alias.values() for c in cols if c != 'Student_ID']
+    joins = """FROM Students s
+    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+    LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+    LEFT JOIN Placements p ON s.Student_ID = p.Student_ID"""
+    id_list = ", ".join(["%s"] * len(student_ids))
+    paths = {
+        'search (200 IDs)': (
+            f"SELECT {', '.join(join_cols)} {joins} WHERE s.Student_ID IN ({id_list})",
+            f"SELECT {', '.join(profile_cols)} FROM {PROFILE_TABLE} s WHERE s.Student_ID IN ({id_list})",
+            student_ids),
+        'custom view page': (
+            "SELECT s.Student_ID, s.Name, p.Placement_Status, pr.Problems_Solved, ss.Avg_Soft_Skills FROM Students s "
+            "JOIN Placements p ON s.Student_ID = p.Student_ID JOIN Programming pr ON s.Student_ID = pr.Student_ID "
+            "JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID ORDER BY s.Student_ID LIMIT 10",
+            f"SELECT s.Student_ID, s.Name, s.Placement_Status, s.Problems_Solved, s.Avg_Soft_Skills FROM {PROFILE_TABLE} s "
+            "WHERE s.Has_Placement = 1 AND s.Has_Programming = 1 AND s.Has_Soft_Skills = 1 ORDER BY s.Student_ID LIMIT 10",
+            []),
+    }
+    profile_insights = default_insights(profile=True)
+    for qid, (join_sql, params) in default_insights().items():  # Both variants bind the same parameters in the same order
+        paths[f'insight {qid}'] = (join_sql, profile_insights[qid][0], params)
+    return paths
+
+# ___________________________________________ #
+
+# Define SQLite backend: the offline engine's database plus a Student_Profile built from the same SELECT
+def sqlite_backend(students):
+    from offline_engine import OfflineEngine
+    engine = OfflineEngine(*generate_sample_data(students), build_index=False)
+    conn = engine.conn
+    conn.execute(f"CREATE TABLE {PROFILE_TABLE} AS " + profile_select())
+    conn.execute(f"CREATE UNIQUE INDEX idx_profile_pk ON {PROFILE_TABLE} (Student_ID)")
+    for index, columns, _ in PROFILE_INDEXES:
+        conn.execute(f"CREATE INDEX {index} ON {PROFILE_TABLE} {columns}")
+    conn.execute("ANALYZE")
+
+    def run(sql, params):
+        conn.execute(sql.strip().rstrip(';').replace('%s', '?'), params).fetchall()
+    return run, lambda: None
+
+
+# Define MySQL backend: bulk-load generated data into the given database, then build the profile
+def mysql_backend(students, args):
+    from cli_common import db_config_from_args, connect
+    from bulk_load import bulk_load_generated
+    from migrations import migrate
+    conn = connect(db_config_from_args(args), allow_local_infile=True)
+    bulk_load_generated(conn, students)
+    migrate(conn)  # Secondary indexes, Student_Skills and Student_Profile
+    cursor = conn.cursor()
+
+    def run(sql, params):
+        cursor.execute(sql.strip().rstrip(';'), params)
+        cursor.fetchall()
+    return run, conn.close
+
+
+# Define timing helper: median and p95 in milliseconds
+def measure(run, sql, params, repeat):
+    run(sql, params)  # Warm-up (page cache / buffer pool)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(sql, params)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare join vs. Student_Profile latency per read path')
+    parser.add_argument('--students', default='10000,100000,1000000', help='Comma-separated dataset sizes')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    add_db_arguments(parser)  # Only used with --backend mysql
+    args = parser.parse_args()
+
+    for students in [int(n) for n in args.students.split(',')]:
+        started = time.perf_counter()
+        run, close = sqlite_backend(students) if args.backend == 'sqlite' else mysql_backend(students, args)
+        print(f"\n{args.backend}, students={students:,} (setup {time.perf_counter() - started:.1f}s)")
+        print(f"{'read path':18} {'join p50':>10} {'profile p50':>12} {'join p95':>10} {'profile p95':>12} {'speedup':>8}")
+        rng = random.Random(1)
+        width = max(3, len(str(students)))
+        ids = [f'G25AIML_{i:0{width}d}' for i in rng.sample(range(1, students + 1), min(SEARCH_IDS, students))]
+        for name, (join_sql, profile_sql, params) in read_paths(ids).items():
+            join_p50, join_p95 = measure(run, join_sql, params, args.repeat)
+            profile_p50, profile_p95 = measure(run, profile_sql, params, args.repeat)
+            print(f"{name:18} {join_p50:9.2f}ms {profile_p50:11.2f}ms {join_p95:9.2f}ms {profile_p95:11.2f}ms "
+                  f"{join_p50 / max(profile_p50, 1e-9):7.1f}x")
+        close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+# Bulk loader: full (re)load of the four tables with LOAD DATA LOCAL INFILE, falling back to multi-row INSERTs
+# Usage: python bulk_load.py --students 1000000 [--seed 1] [--chunk-rows 100000]   (generate with datagen.py and load)
+#        python bulk_load.py --from-dir data/                                       (load students.csv, programming.csv, ...)
+
+# Import argparse for the command-line options
+import argparse
+# Import os and tempfile for the staging files
+import os
+import tempfile
+# Import time for the rows/s report
+import time
+# Import pandas for reading CSV chunks on the INSERT fallback
+import pandas as pd
+# Import mysql.connector errors to detect a server without local_infile
+from mysql.connector import Error
+
+# Import shared command-line connection helpers
+from cli_common import add_db_arguments, db_config_from_args, connect
+# Import the generator and its per-table file names
+from datagen import iter_chunks, TABLE_FILES, DEFAULT_CHUNK_ROWS
+# Import the derived-metrics DDL so Avg_Soft_Skills exists before the load
+from derived_metrics import AVG_SOFT_SKILLS_DDL
+# Import the post-load step that builds secondary indexes, Student_Skills and Student_Profile
+from migrations import migrate
+# Import the version counter the portal uses for cache invalidation
+from data_version import bump_data_version
+# Import the profile stamp checked by the portal before reading Student_Profile
+from student_profile import mark_profile_current
+
+# ___________________________________________ #
+
+# Base tables from GuviPlacements_DataGen.ipynb (primary keys up front; secondary indexes are built after the load)
+TABLE_DDL = {
+    'Students': """
+    CREATE TABLE Students (
+        Student_ID VARCHAR(20) PRIMARY KEY,
+        Name VARCHAR(100),
+        Age INT,
+        Gender VARCHAR(10),
+        Email VARCHAR(100),
+        Phone VARCHAR(10),
+        Enrollment_Year VARCHAR(4),
+        Course_Batch VARCHAR(20),
+        City VARCHAR(20),
+        Graduation_Year INT
+    )
+    """,
+    'Programming': """
+    CREATE TABLE Programming (
+        Programming_ID VARCHAR(20) PRIMARY KEY,
+        Student_ID VARCHAR(20),
+        Language TEXT,
+        Problems_Solved INT,
+        Assessments_Completed INT,
+        Mini_Projects INT,
+        Certifications_Earned TEXT,
+        Latest_Project_Score INT,
+        FOREIGN KEY (Student_ID) REFERENCES Students(Student_ID)
+    )
+    """,
+    'Soft_Skills': """
+    CREATE TABLE Soft_Skills (
+        Soft_Skills_ID VARCHAR(20) PRIMARY KEY,
+        Student_ID VARCHAR(20),
+        Communication_Score INT,
+        Teamwork_Score INT,
+        Presentation_Score INT,
+        Leadership_Score INT,
+        Critical_Thinking INT,
+        Interpersonal_Skills INT,
+        FOREIGN KEY (Student_ID) REFERENCES Students(Student_ID)
+    )
+    """,
+    'Placements': """
+    CREATE TABLE Placements (
+        Student_ID VARCHAR(20) PRIMARY KEY,
+        Mock_Interview_Score INT,
+        Internships_Completed INT,
+        Company_Name VARCHAR(50),
+        Placement_Package INT,
+        Interview_Rounds_Cleared INT,
+        Placement_Date DATE,
+        Placement_Status VARCHAR(20),
+        FOREIGN KEY (Student_ID) REFERENCES Students(Student_ID)
+    )
+    """,
+}
+
+# Tables dropped child-first, created parent-first
+LOAD_ORDER = ['Students', 'Programming', 'Soft_Skills', 'Placements']
+# Tag table derived from the base tables (rebuilt by migrate())
+DERIVED_TABLES = ['Student_Skills']
+
+# Rows per INSERT statement on the fallback path
+INSERT_BATCH_ROWS = 1000
+
+# CSV dialect written by datagen.write_dataset / DataFrame.to_csv (header row, "quoted, lists", \N for NULL)
+LOAD_DATA_SQL = """
+LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+CHARACTER SET utf8mb4
+FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+LINES TERMINATED BY '\\n'
+IGNORE 1 LINES
+({columns})
+"""
+
+# ___________________________________________ #
+
+# Define function recreating the base tables (full reload)
+def recreate_tables(cursor):
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in DERIVED_TABLES + LOAD_ORDER[::-1]:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    for table in LOAD_ORDER:
+        cursor.execute(TABLE_DDL[table])
+    cursor.execute(AVG_SOFT_SKILLS_DDL)  # Generated column exists before the load, so no table rebuild afterwards
+
+
+# Define function loading one CSV file with LOAD DATA LOCAL INFILE
+def load_csv_infile(cursor, table, path, columns):  # Returns rows loaded
+    # ESCAPED BY '' keeps backslashes literal, so \N is matched as NULL explicitly via NULLIF
+    targets = ", ".join(f"@{col}" for col in columns)
+    assignments = ", ".join(f"{col} = NULLIF(@{col}, '\\\\N')" for col in columns)
+    sql = LOAD_DATA_SQL.format(table=table, columns=targets) + f"SET {assignments}"
+    cursor.execute(sql, (os.path.abspath(path),))
+    return cursor.rowcount
+
+
+# Define function inserting a DataFrame as multi-row INSERT statements
+def insert_frame(cursor, table, df, batch_rows=INSERT_BATCH_ROWS):  # Returns rows inserted
+    columns = list(df.columns)
+    rows = df.astype(object).where(df.notna(), None).values.tolist()
+    row_placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    for start in range(0, len(rows), batch_rows):
+        batch = rows[start:start + batch_rows]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([row_placeholders] * len(batch))
+        cursor.execute(sql, [value for row in batch for value in row])
+    return len(rows)
+
+
+# Define function loading one table from a CSV file (infile first, INSERT fallback)
+def load_table_file(cursor, table, path, method='auto', chunk_rows=DEFAULT_CHUNK_ROWS):  # Returns (rows, method used)
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    if method in ('auto', 'infile'):
+        try:
+            return load_csv_infile(cursor, table, path, columns), 'infile'
+        except Error as e:  # local_infile disabled on the server or client
+            if method == 'infile':
+                raise
+            print(f"LOAD DATA LOCAL INFILE unavailable for {table} ({e.msg}); using multi-row INSERTs.")
+    rows = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, na_values=['\\N'], keep_default_na=False, dtype=str):
+        rows += insert_frame(cursor, table, chunk)
+    return rows, 'insert'
+
+# ___________________________________________ #
+
+# Define helpers switching the session into bulk-load mode (constraint checks off, explicit commits) and back
+def _begin_bulk(cursor):
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    cursor.execute("SET SESSION unique_checks = 0")
+    cursor.execute("SET SESSION autocommit = 0")
+
+
+def _end_bulk(cursor):
+    cursor.execute("SET SESSION unique_checks = 1")
+    cursor.execute("SET SESSION foreign_key_checks = 1")
+    cursor.execute("SET SESSION autocommit = 1")
+
+
+# Define function loading a directory of per-table CSV files (datagen.py output or exported cohort data)
+def bulk_load_dir(conn, data_dir, method='auto', recreate=True):  # Returns {table: rows}
+    cursor = conn.cursor()
+    if recreate:
+        recreate_tables(cursor)
+    _begin_bulk(cursor)
+    counts = {}
+    try:
+        for table in LOAD_ORDER:
+            path = os.path.join(data_dir, TABLE_FILES[table])
+            started = time.perf_counter()
+            rows, used = load_table_file(cursor, table, path, method)
+            conn.commit()
+            counts[table] = rows
+            _report(table, rows, time.perf_counter() - started, used)
+    finally:
+        _end_bulk(cursor)
+        cursor.close()
+    return counts
+
+
+# Define function generating and loading the dataset chunk by chunk
+def bulk_load_generated(conn, n_students, seed=1, chunk_rows=DEFAULT_CHUNK_ROWS, method='auto'):  # Returns {table: rows}
+    cursor = conn.cursor()
+    recreate_tables(cursor)
+    _begin_bulk(cursor)
+    counts = {table: 0 for table in LOAD_ORDER}
+    elapsed = {table: 0.0 for table in LOAD_ORDER}
+    used = {table: method for table in LOAD_ORDER}
+    try:
+        with tempfile.TemporaryDirectory(prefix='guvi_load_') as staging:
+            for frames in iter_chunks(n_students, seed=seed, chunk_rows=chunk_rows):
+                for table, df in zip(LOAD_ORDER, frames):
+                    started = time.perf_counter()
+                    if used[table] == 'insert':
+                        counts[table] += insert_frame(cursor, table, df)
+                    else:  # Stage the chunk as CSV and LOAD DATA it (falls back to INSERTs once if infile is refused)
+                        path = os.path.join(staging, TABLE_FILES[table])
+                        df.to_csv(path, index=False, na_rep='\\N')
+                        rows, used[table] = load_table_file(cursor, table, path, used[table])
+                        counts[table] += rows
+                    elapsed[table] += time.perf_counter() - started
+                conn.commit()
+    finally:
+        _end_bulk(cursor)
+        cursor.close()
+    for table in LOAD_ORDER:
+        _report(table, counts[table], elapsed[table], used[table])
+    return counts
+
+
+def _report(table, rows, seconds, method):
+    print(f"Loaded {rows:,} rows into {table} in {seconds:.1f}s ({rows / max(seconds, 1e-9):,.0f} rows/s, {method}).")
+
+# ___________________________________________ #
+
+def main():
+    parser = add_db_arguments(argparse.ArgumentParser(description='Bulk-load the portal tables (drops and recreates them)'))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--students', type=int, help='Generate this many students with datagen.py and load them')
+    source.add_argument('--from-dir', help='Load students.csv, programming.csv, soft_skills.csv and placements.csv from this directory')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for --students (default: 1)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Students generated and loaded per chunk')
+    parser.add_argument('--method', choices=['auto', 'infile', 'insert'], default='auto',
+                        help='auto tries LOAD DATA LOCAL INFILE and falls back to multi-row INSERTs')
+    args = parser.parse_args()
+
+    conn = connect(db_config_from_args(args), allow_local_infile=True)
+    try:
+        started = time.perf_counter()
+        if args.from_dir:
+            counts = bulk_load_dir(conn, args.from_dir, method=args.method)
+        else:
+            counts = bulk_load_generated(conn, args.students, seed=args.seed, chunk_rows=args.chunk_rows, method=args.method)
+        loaded = time.perf_counter() - started
+        total = sum(counts.values())
+        print(f"Loaded {total:,} rows in {loaded:.1f}s ({total / max(loaded, 1e-9):,.0f} rows/s).")
+        # Secondary indexes, Student_Skills and Student_Profile are built once, after the data is in
+        started = time.perf_counter()
+        migrate(conn)
+        print(f"Built indexes and derived tables in {time.perf_counter() - started:.1f}s.")
+        bump_data_version(conn)  # Running portals drop cached results and refresh their search index
+        mark_profile_current(conn)  # Student_Profile was rebuilt by migrate(); stamp it with the bumped version
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+# Import os for reading connection settings from the environment
+import os
+# Import getpass for prompting the MySQL password like the data-gen notebook does
+from getpass import getpass
+
+# ___________________________________________ #
+
+# Define function adding the shared MySQL connection options to a command-line parser
+def add_db_arguments(parser):  # --host/--port/--user/--database; password from GUVI_DB_PASSWORD or a prompt
+    parser.add_argument('--host', default=os.environ.get('GUVI_DB_HOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('GUVI_DB_PORT', '3306')))
+    parser.add_argument('--user', default=os.environ.get('GUVI_DB_USER', 'root'))
+    parser.add_argument('--database', default=os.environ.get('GUVI_DB_NAME', 'student_db'))
+    return parser
+
+
+# Define function building the db_config dict used across the portal
+def db_config_from_args(args):  # Same keys as connect_to_mysql's db_config
+    password = os.environ.get('GUVI_DB_PASSWORD')
+    if password is None:
+        password = getpass("Enter your MySQL password: ")
+    return {
+        'host': args.host,
+        'port': args.port,
+        'user': args.user,
+        'password': password,
+        'database': args.database
+    }
+
+
+# Define function opening a plain (non-pooled) connection for one-off scripts
+def connect(db_config, **extra):  # Command-line tools run outside Streamlit, so no shared pool is needed
+    import mysql.connector
+    return mysql.connector.connect(**db_config, **extra)
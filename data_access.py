@@ -0,0 +1,96 @@
+# Data access for live MySQL reads: prepared statements cached per pooled connection (db_pool.py), rows streamed in batches
+# Each batch is typed and split into column arrays right away, so no list of tuples for the whole result is ever held
+
+# Import os for reading data-access settings from the environment
+import os
+# Import pandas for the per-batch column arrays
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Import the prepared-statement cache kept on each pooled connection
+from db_pool import prepared_cursor, forget_statements, statement_cache_stats, STATEMENT_CACHE_SIZE
+# Import compact dtype mapping for result frames
+from typed_frames import apply_schema_dtypes
+# Import the timing spans for the execute/fetch/materialize stages
+from instrumentation import span
+
+# ___________________________________________ #
+
+# Data-access settings (override with GUVI_FETCH_BATCH_ROWS before starting streamlit)
+FETCH_BATCH_ROWS = int(os.environ.get("GUVI_FETCH_BATCH_ROWS", "5000"))  # Rows pulled from the socket per fetchmany()
+
+# ___________________________________________ #
+
+# Define counters for monitoring
+def statement_stats():
+    return {**statement_cache_stats(), 'batch_rows': FETCH_BATCH_ROWS}
+
+
+# Define function padding an IN (...) list so result sets of similar size share one prepared statement
+def in_placeholders(values):  # Returns ('%s, %s, ...', padded values); the length is rounded up to a power of two
+    values = list(values)
+    size = 1
+    while size < len(values):
+        size *= 2
+    values += values[-1:] * (size - len(values))  # Repeating a member doesn't change what IN matches
+    return ", ".join(["%s"] * len(values)), values
+
+# ___________________________________________ #
+
+# Define function reading a query into a typed DataFrame, batch by batch
+def read_batched(conn, sql, params=None, batch_rows=None):
+    batch_rows = batch_rows or FETCH_BATCH_ROWS
+    cached = STATEMENT_CACHE_SIZE > 0
+    if cached:
+        cursor, reused = prepared_cursor(conn, sql)
+        statement = 'reused' if reused else 'prepared'
+    else:  # Plain text protocol, still unbuffered
+        cursor, statement = conn.cursor(buffered=False), 'text'
+    try:
+        with span('execute', statement=statement):
+            cursor.execute(sql, tuple(params or ()))
+        columns = [desc[0] for desc in cursor.description]
+        parts = {col: [] for col in columns}
+        with span('fetch') as info:
+            info['rows'] = 0
+            while True:
+                batch = cursor.fetchmany(batch_rows)
+                if not batch:
+                    break
+                info['rows'] += len(batch)
+                # coerce_float: DECIMAL -> float, as pd.read_sql did; typing the batch keeps only compact arrays around
+                typed = apply_schema_dtypes(pd.DataFrame.from_records(batch, columns=columns, coerce_float=True))
+                del batch
+                for col in columns:
+                    parts[col].append(typed[col].array)
+    except Exception:
+        # A half-read result would block the next statement on this connection: drop the cached cursors
+        if cached:
+            forget_statements(conn)
+        raise
+    finally:
+        if not cached:
+            cursor.close()
+    return assemble(parts, columns)
+
+
+# Define function joining per-batch column arrays into one frame
+def assemble(parts, columns):
+    with span('materialize') as info:
+        data = {col: _concat(parts[col]) for col in columns}
+        df = pd.DataFrame(data, columns=columns)
+        # Batches that were all NULL in a column may have been typed differently; settle it on the whole column
+        df = apply_schema_dtypes(df.infer_objects() if any(dtype == object for dtype in df.dtypes) else df)
+        info['rows'], info['bytes'] = len(df), int(df.memory_usage(deep=True).sum())
+    return df
+
+
+# Define function concatenating one column's batch arrays
+def _concat(arrays):
+    if not arrays:
+        return pd.Series([], dtype=object)
+    if len(arrays) == 1:
+        return pd.Series(arrays[0])
+    if all(isinstance(a, pd.Categorical) for a in arrays):  # Batches each have their own categories (an all-NULL batch has none)
+        return pd.Series(union_categoricals([a.set_categories(a.categories.astype(object)) for a in arrays]))
+    return pd.concat([pd.Series(a) for a in arrays], ignore_index=True)
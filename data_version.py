@@ -0,0 +1,98 @@
+# Import os for reading the probe interval from the environment
+import os
+# Import time for throttling the probe
+import time
+# Import threading to guard the shared probe memo
+import threading
+
+# Import pooled connection helpers and the config key used to share pools
+from db_pool import pooled_connection, config_key, set_session_variable
+
+# ___________________________________________ #
+
+# Tables whose changes invalidate derived state (indexes, cached results)
+DATA_TABLES = ('Students', 'Programming', 'Soft_Skills', 'Placements')
+
+# Explicit counter bumped by writers (incremental_sync.py); probes read it next to the table statistics
+DATA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS Data_Version (
+    Id TINYINT PRIMARY KEY,
+    Version BIGINT NOT NULL,
+    Updated_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+)
+"""
+
+# Minimum seconds between two probes for the same database (0 probes on every call)
+PROBE_INTERVAL_SECONDS = float(os.environ.get("GUVI_VERSION_PROBE_INTERVAL", "1"))
+
+# Last probe result per db_config: key -> (monotonic time, version)
+_last_probe = {}
+_probe_lock = threading.Lock()
+
+# ___________________________________________ #
+
+# Define a cheap probe that changes whenever the student tables change
+def probe_data_version(db_config):  # Return a hashable watermark of the four tables' last-write state
+    with pooled_connection(db_config) as conn:
+        return read_data_version(conn, db_config['database'])
+
+
+# Define the probe itself on an open connection (maintenance scripts stamp derived tables with it)
+def read_data_version(conn, database):
+    placeholders = ", ".join(["%s"] * len(DATA_TABLES))
+    query = f"""
+    SELECT TABLE_NAME, TABLE_ROWS, UPDATE_TIME
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})
+    ORDER BY TABLE_NAME
+    """
+    # MySQL 8 caches table statistics for a day by default; read them fresh for this session
+    try:
+        set_session_variable(conn, 'information_schema_stats_expiry', 0)
+    except Exception:  # Older servers don't have the variable and always report live values
+        pass
+    cursor = conn.cursor()
+    cursor.execute(query, [database] + list(DATA_TABLES))
+    rows = cursor.fetchall()
+    # UPDATE_TIME has one-second resolution; the counter catches syncs landing within the same second
+    try:
+        cursor.execute("SELECT Version FROM Data_Version WHERE Id = 1")
+        counter = cursor.fetchone()
+    except Exception:  # No writer has created the counter yet
+        counter = None
+    cursor.close()
+    # Stringify timestamps so the watermark compares and hashes cleanly
+    return tuple((str(name), rows_estimate, str(updated)) for name, rows_estimate, updated in rows) + (counter[0] if counter else None,)
+
+
+# Define throttled accessor shared by the search index and the query-result cache
+def current_data_version(db_config, max_age=None):  # Reuses a probe younger than max_age seconds
+    max_age = PROBE_INTERVAL_SECONDS if max_age is None else max_age
+    key = config_key(db_config)
+    now = time.monotonic()
+    with _probe_lock:
+        cached = _last_probe.get(key)
+    if cached and now - cached[0] < max_age:
+        return cached[1]
+    version = probe_data_version(db_config)
+    with _probe_lock:
+        _last_probe[key] = (now, version)
+    return version
+
+
+# Define function writers call after committing a data change
+def bump_data_version(conn):  # Returns the new version number
+    cursor = conn.cursor()
+    cursor.execute(DATA_VERSION_DDL)
+    cursor.execute("INSERT INTO Data_Version (Id, Version) VALUES (1, 1) ON DUPLICATE KEY UPDATE Version = Version + 1")
+    conn.commit()
+    cursor.execute("SELECT Version FROM Data_Version WHERE Id = 1")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+# Define function to forget memoized probes (e.g. right after a data load)
+def reset_data_version():
+    with _probe_lock:
+        _last_probe.clear()
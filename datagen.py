@@ -0,0 +1,245 @@
+# Vectorized synthetic data generator for the four portal tables (same distributions as GuviPlacements_DataGen.ipynb)
+# Usage: python datagen.py --students 1000000 --out data/ [--seed 1] [--chunk-rows 100000]
+
+# Import argparse for the command-line options
+import argparse
+# Import os for output paths
+import os
+# Import time for the progress report
+import time
+# Import numpy and pandas for vectorized sampling
+import numpy as np
+import pandas as pd
+
+# Attempt to import Faker (only used to pre-sample name/city/company pools)
+try:
+    from faker import Faker
+    # Set HAS_FAKER to True if import succeeds
+    HAS_FAKER = True
+# Handle ModuleNotFoundError if Faker is not installed
+except ModuleNotFoundError:
+    # Fall back to the built-in pools below
+    HAS_FAKER = False
+
+# ___________________________________________ #
+
+# Built-in value pools (used when Faker is not installed, and by the offline engine's default data)
+FIRST_NAMES = [
+    'Aarav', 'Vivaan', 'Aditya', 'Vihaan', 'Arjun', 'Sai', 'Reyansh', 'Krishna', 'Ishaan', 'Rohan',
+    'Kabir', 'Rahul', 'Karthik', 'Pranav', 'Nikhil', 'Aadhya', 'Diya', 'Saanvi', 'Ananya', 'Pari',
+    'Anika', 'Ira', 'Myra', 'Priya', 'Kavya', 'Meera', 'Sneha', 'Divya', 'Lakshmi', 'Pooja'
+]
+LAST_NAMES = [
+    'Sharma', 'Verma', 'Iyer', 'Reddy', 'Nair', 'Menon', 'Patel', 'Gupta', 'Singh', 'Kumar',
+    'Rao', 'Das', 'Bose', 'Chatterjee', 'Mukherjee', 'Pillai', 'Joshi', 'Kulkarni', 'Desai', 'Shah'
+]
+CITIES = [
+    'Chennai', 'Mumbai', 'Delhi', 'Bengaluru', 'Hyderabad', 'Kolkata', 'Pune', 'Ahmedabad', 'Jaipur',
+    'Lucknow', 'Kochi', 'Coimbatore', 'Madurai', 'Nagpur', 'Indore', 'Bhopal', 'Surat', 'Vadodara',
+    'Visakhapatnam', 'Mysuru'
+]
+COMPANIES = [
+    'Infosys', 'TCS', 'Wipro', 'HCL Technologies', 'Tech Mahindra', 'Zoho', 'Freshworks', 'Accenture',
+    'Cognizant', 'Capgemini', 'Mphasis', 'LTIMindtree', 'Persistent Systems', 'Razorpay', 'Swiggy'
+]
+
+# Value lists from the notebook
+COMMON_LANGUAGES = ['python', 'mysql', 'pandas']
+ADDITIONAL_LANGUAGES = ['numpy', 'pytorch', 'scikit-learn', 'llama', 'mistral']
+CERTIFICATIONS = ['python', 'mysql', 'pandas', 'numpy', 'Pytorch', 'AI', 'ML in AWS']
+MONTH_CODES = ['JNY', 'FY', 'MH', 'AL', 'MY', 'JE', 'JLY', 'AT', 'SR', 'OR', 'NR', 'DR']
+
+# Notebook shares: ages 350/120/20/10 of 500, soft skills 10/10/60/20%, problems solved 450/50
+AGE_BANDS = [(0.70, 22, 30), (0.24, 30, 40), (0.04, 40, 50), (0.02, 50, 60)]
+SOFT_SKILL_BANDS = [(0.10, 91, 100), (0.10, 80, 90), (0.60, 60, 79), (0.20, 40, 59)]
+PROBLEMS_SOLVED_BANDS = [(0.90, 250, 500), (0.10, 501, 1000)]
+SOFT_SKILL_COLUMNS = [
+    'Communication_Score', 'Teamwork_Score', 'Presentation_Score',
+    'Leadership_Score', 'Critical_Thinking', 'Interpersonal_Skills'
+]
+
+# Rows generated (and held in memory) at a time
+DEFAULT_CHUNK_ROWS = 100_000
+# Faker draws per pool; rows sample from the pool instead of calling Faker per row
+FAKER_POOL_SIZE = 5000
+# Longest pool value each column takes (bulk_load.py schema): City VARCHAR(20), Company_Name VARCHAR(50),
+# names VARCHAR(100) but also Email VARCHAR(100) = name without spaces + '@gmail.com'
+POOL_WIDTHS = {'names': 90, 'cities': 20, 'companies': 50}
+
+# Output file per table (in load order: Students first for the foreign keys)
+TABLE_FILES = {
+    'Students': 'students.csv',
+    'Programming': 'programming.csv',
+    'Soft_Skills': 'soft_skills.csv',
+    'Placements': 'placements.csv',
+}
+
+# ___________________________________________ #
+
+# Define function building the name/city/company pools once per run
+def build_pools(seed=1, use_faker=True, pool_size=FAKER_POOL_SIZE):  # {'names': [...], 'cities': [...], 'companies': [...]}
+    if use_faker and HAS_FAKER:
+        fake = Faker('en_IN')
+        fake.seed_instance(seed)
+        pools = {
+            'names': [fake.name() for _ in range(pool_size)],
+            'cities': sorted({fake.city() for _ in range(pool_size // 10)}),
+            'companies': sorted({fake.company() for _ in range(pool_size // 10)}),
+        }
+        # Drop values wider than their column (e.g. 'Raurkela Industrial Township'): LOAD DATA would truncate them
+        # silently and the INSERT fallback fails under strict mode
+        pools = {kind: [v for v in values if len(v) <= POOL_WIDTHS[kind]] for kind, values in pools.items()}
+    else:
+        pools = {
+            'names': [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES],
+            'cities': list(CITIES),
+            'companies': list(COMPANIES),
+        }
+    for kind, values in pools.items():
+        assert values and max(map(len, values)) <= POOL_WIDTHS[kind], f"{kind} pool doesn't fit its column"
+    return pools
+
+
+# Define helper: shuffled array with fixed shares drawn from inclusive integer ranges
+def banded_integers(rng, n, bands):  # bands: [(share, low, high), ...] with inclusive bounds
+    counts = [int(share * n) for share, _, _ in bands]
+    counts[-1] = n - sum(counts[:-1])  # Rounding remainder goes to the last band
+    values = np.concatenate([rng.integers(low, high + 1, count) for count, (_, low, high) in zip(counts, bands)])
+    rng.shuffle(values)
+    return values
+
+
+# Define helper: comma-join a random subset (size low..high) of items for every row, without Python loops over rows
+def random_subsets(rng, n, items, low, high, prefix=None):
+    sizes = rng.integers(low, high + 1, n)
+    ranks = rng.random((n, len(items))).argsort(axis=1).argsort(axis=1)  # Random rank of each item per row
+    masks = (ranks < sizes[:, None]) @ (1 << np.arange(len(items)))  # Bitmask of the chosen items per row
+    # Every possible subset is joined once; rows just index into that table
+    combos = np.array([', '.join(list(prefix or []) + [item for j, item in enumerate(items) if mask >> j & 1])
+                       for mask in range(1 << len(items))], dtype=object)
+    return combos[masks]
+
+# ___________________________________________ #
+
+# Define function generating one chunk of students (IDs start..start+n-1) with all four tables
+def generate_chunk(rng, start, n, pools, id_width=3):  # Returns (df_students, df_programming, df_soft_skills, df_placements)
+    student_ids = pd.Series(np.arange(start, start + n)).map(lambda i: f'G25AIML_{i:0{id_width}d}').to_numpy()
+
+    # Students: names/cities from the pools, ages in the notebook's buckets, "Other" gender capped at 0.6%
+    names = np.asarray(pools['names'], dtype=object)[rng.integers(0, len(pools['names']), n)]
+    ages = banded_integers(rng, n, AGE_BANDS)
+    genders = rng.choice(['Male', 'Female'], n).astype(object)
+    genders[rng.choice(n, size=min(n, max(1, round(0.006 * n))), replace=False)] = 'Other'
+    enrollment = np.where(rng.permutation(n) < int(0.10 * n), '2024', '2025')  # 50 of 500 enrolled in 2024
+    batch_month = rng.integers(1, 13, n)  # Course_Batch = month code + yy + WD/WE, e.g. 'JE25WD'
+    batches = (pd.Series(np.array(MONTH_CODES)[batch_month - 1]) + pd.Series(enrollment).str[-2:]
+               + rng.choice(['WD', 'WE'], n)).to_numpy()
+    df_students = pd.DataFrame({
+        'Student_ID': student_ids,
+        'Name': names,
+        'Age': ages,
+        'Gender': genders,
+        'Email': pd.Series(names).str.lower().str.replace(' ', '', regex=False).to_numpy() + '@gmail.com',
+        'Phone': rng.integers(7000000000, 9999999999, n, endpoint=True).astype(str),
+        'Enrollment_Year': enrollment,
+        'Course_Batch': batches,
+        'City': np.asarray(pools['cities'], dtype=object)[rng.integers(0, len(pools['cities']), n)],
+        'Graduation_Year': 2025 - (ages - rng.integers(21, 26, n)),
+    })
+
+    # Programming: three common languages plus 1-3 more, 1-3 certifications
+    df_programming = pd.DataFrame({
+        'Programming_ID': 'PGM_' + student_ids,
+        'Student_ID': student_ids,
+        'Language': random_subsets(rng, n, ADDITIONAL_LANGUAGES, 1, 3, prefix=COMMON_LANGUAGES),
+        'Problems_Solved': banded_integers(rng, n, PROBLEMS_SOLVED_BANDS),
+        'Assessments_Completed': rng.integers(10, 16, n),
+        'Mini_Projects': rng.integers(6, 11, n),
+        'Certifications_Earned': random_subsets(rng, n, CERTIFICATIONS, 1, 3),
+        'Latest_Project_Score': rng.integers(50, 101, n),
+    })
+
+    # Soft skills: each column drawn independently from the same bands
+    df_soft_skills = pd.DataFrame({'Soft_Skills_ID': 'SS_' + student_ids, 'Student_ID': student_ids})
+    for col in SOFT_SKILL_COLUMNS:
+        df_soft_skills[col] = banded_integers(rng, n, SOFT_SKILL_BANDS)
+
+    # Placements: mock score = int(0.9 * total / 7); the top 40% of the chunk by total are placed
+    total = df_programming['Latest_Project_Score'].to_numpy() + df_soft_skills[SOFT_SKILL_COLUMNS].sum(axis=1).to_numpy()
+    mock = (0.9 * total / 7).astype(int)
+    placed = np.zeros(n, dtype=bool)
+    placed[np.argsort(-total, kind='stable')[:int(n * 0.4)]] = True
+    internships = np.where(rng.random(n) < 0.9, rng.integers(1, 3, n), rng.integers(3, 5, n))
+    rounds = np.where(mock > 60, rng.integers(1, 3, n), rng.integers(0, 2, n))
+    package = rng.integers(400000, 3000000, n, endpoint=True)
+
+    # Placement date: a random day six months after the batch month
+    month = batch_month + 6
+    year = enrollment.astype(int) + (month > 12)
+    month = np.where(month > 12, month - 12, month)
+    first_day = pd.to_datetime(pd.DataFrame({'year': year, 'month': month, 'day': 1}))
+    days_in_month = first_day.dt.days_in_month.to_numpy()
+    dates = (first_day + pd.to_timedelta(np.floor(rng.random(n) * days_in_month), unit='D')).dt.date
+
+    df_placements = pd.DataFrame({
+        'Student_ID': student_ids,
+        'Mock_Interview_Score': mock,
+        'Internships_Completed': internships,
+        'Company_Name': np.where(placed, np.asarray(pools['companies'], dtype=object)[rng.integers(0, len(pools['companies']), n)], None),
+        'Placement_Package': pd.Series(package, dtype='Int64').where(placed),
+        'Interview_Rounds_Cleared': rounds,
+        'Placement_Date': pd.Series(dates).where(placed, None),
+        'Placement_Status': np.where(placed, 'Placed', np.where(mock >= 60, 'Ready', 'Not Ready')),
+    })
+    return df_students, df_programming, df_soft_skills, df_placements
+
+
+# Define generator yielding the dataset chunk by chunk (memory stays at one chunk)
+def iter_chunks(n_students, seed=1, chunk_rows=DEFAULT_CHUNK_ROWS, use_faker=True):
+    pools = build_pools(seed, use_faker=use_faker)
+    id_width = max(3, len(str(n_students)))  # G25AIML_001..500 as in the notebook; wider IDs for bigger runs
+    n_chunks = max(1, -(-n_students // chunk_rows))
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):  # Independent, reproducible stream per chunk
+        start = i * chunk_rows
+        n = min(chunk_rows, n_students - start)
+        if n > 0:
+            yield generate_chunk(np.random.default_rng(child), start + 1, n, pools, id_width)
+
+
+# Define function returning the whole dataset in memory (small runs, offline mode)
+def generate_sample_data(n_students=500, seed=1, use_faker=False):  # Returns (df_students, df_programming, df_soft_skills, df_placements)
+    chunks = list(iter_chunks(n_students, seed=seed, use_faker=use_faker))
+    return tuple(pd.concat(tables, ignore_index=True) if len(tables) > 1 else tables[0] for tables in zip(*chunks))
+
+
+# Define function writing the dataset as one CSV per table, appended chunk by chunk
+def write_dataset(out_dir, n_students, seed=1, chunk_rows=DEFAULT_CHUNK_ROWS, use_faker=True):  # Returns {table: path}
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {table: os.path.join(out_dir, name) for table, name in TABLE_FILES.items()}
+    for i, frames in enumerate(iter_chunks(n_students, seed=seed, chunk_rows=chunk_rows, use_faker=use_faker)):
+        for (table, path), df in zip(paths.items(), frames):
+            # \N marks NULL, as LOAD DATA INFILE expects
+            df.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False, na_rep='\\N')
+    return paths
+
+# ___________________________________________ #
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic placement data as CSV files')
+    parser.add_argument('--students', type=int, default=500, help='Number of students (default: 500)')
+    parser.add_argument('--out', default='data', help='Output directory (default: data/)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Students generated per chunk')
+    parser.add_argument('--no-faker', action='store_true', help='Use the built-in name/city/company pools')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    paths = write_dataset(args.out, args.students, seed=args.seed, chunk_rows=args.chunk_rows, use_faker=not args.no_faker)
+    elapsed = time.perf_counter() - started
+    print(f"Generated {args.students} students in {elapsed:.1f}s ({args.students / max(elapsed, 1e-9):,.0f} students/s).")
+    for table, path in paths.items():
+        print(f"  {table}: {path}")
+
+
+if __name__ == '__main__':
+    main()
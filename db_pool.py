@@ -0,0 +1,188 @@
+# Import os for reading pool settings from the environment
+import os
+# Import time for the back-off between checkout attempts on an exhausted pool
+import time
+# Import hashlib for deriving a short, stable pool name from the connection settings
+import hashlib
+# Import OrderedDict for the per-connection LRU of prepared statements
+from collections import OrderedDict
+# Import contextmanager for the checkout/return helper
+from contextlib import contextmanager
+# Import streamlit library as st for the process-wide resource cache
+import streamlit as st
+
+# Attempt to import mysql.connector pooling support
+try:
+    import mysql.connector
+    from mysql.connector import pooling, Error
+    from mysql.connector.errors import PoolError
+    # Set HAS_MYSQL to True if import succeeds
+    HAS_MYSQL = True
+# Handle ModuleNotFoundError if mysql-connector-python is not installed
+except ModuleNotFoundError:
+    HAS_MYSQL = False
+
+# ___________________________________________ #
+
+# Pool settings (override with GUVI_DB_POOL_SIZE / GUVI_DB_POOL_TIMEOUT / GUVI_STATEMENT_CACHE before starting streamlit)
+DEFAULT_POOL_SIZE = int(os.environ.get("GUVI_DB_POOL_SIZE", "5"))  # Connections kept open per db_config
+DEFAULT_CHECKOUT_TIMEOUT = float(os.environ.get("GUVI_DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a free connection
+STATEMENT_CACHE_SIZE = int(os.environ.get("GUVI_STATEMENT_CACHE", "64"))  # Prepared statements kept open per connection (0 = don't prepare)
+
+
+# Statement cache counters (data_access.statement_stats)
+_counters = {'prepared': 0, 'reused': 0, 'evicted': 0}
+
+# ___________________________________________ #
+
+# Define function to turn a db_config dict into a hashable cache key
+def config_key(db_config):  # Sorted tuple of items so equal configs share one pool
+    return tuple(sorted(db_config.items()))
+
+# ___________________________________________ #
+
+# Define accessor for the statement cache of one physical connection
+def _statements(conn):  # Lives on the driver connection, not the pool wrapper, so it survives checkouts
+    cnx = getattr(conn, '_cnx', None) or conn
+    connection_id = getattr(cnx, 'connection_id', None)
+    cache = getattr(cnx, '_guvi_statements', None)
+    if cache is None or cache[0] != connection_id:  # New, or reconnected by the pool's ping: old handles are gone
+        cache = (connection_id, OrderedDict())
+        cnx._guvi_statements = cache
+    return cache[1]
+
+
+# Define function closing a connection's prepared statements (before a session reset or after a failed read)
+def forget_statements(conn):
+    cnx = getattr(conn, '_cnx', None) or conn
+    cache = getattr(cnx, '_guvi_statements', None)
+    cnx._guvi_statements = None
+    for cursor in (cache[1].values() if cache else ()):
+        try:
+            cursor.close()
+        except Error:  # Connection already broken: the server drops the statements with it
+            pass
+
+
+# Define function returning a prepared cursor for sql, preparing it only on the first use per connection
+def prepared_cursor(conn, sql):  # Returns (cursor, reused); read the result to the end before the connection runs anything else
+    cache = _statements(conn)
+    cursor = cache.get(sql)
+    if cursor is not None:
+        cache.move_to_end(sql)
+        _counters['reused'] += 1
+        return cursor, True
+    # One cursor per statement: a prepared cursor re-prepares whenever it is given different SQL
+    cursor = conn.cursor(prepared=True)
+    cache[sql] = cursor
+    _counters['prepared'] += 1
+    while len(cache) > STATEMENT_CACHE_SIZE:
+        _, evicted = cache.popitem(last=False)
+        _counters['evicted'] += 1
+        try:
+            evicted.close()  # Deallocates the server-side statement
+        except Error:
+            pass
+    return cursor, False
+
+
+# Define function changing a session variable for this checkout; the pool puts it back to DEFAULT on return
+def set_session_variable(conn, name, value):  # Raises Error when the server doesn't have the variable (nothing is recorded then)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SET SESSION {name} = %s", (value,))
+    finally:
+        cursor.close()
+    cnx = getattr(conn, '_cnx', None) or conn
+    changed = getattr(cnx, '_guvi_session_vars', None)
+    if changed is None:
+        changed = cnx._guvi_session_vars = set()
+    changed.add(name)
+
+
+# Define counters for monitoring
+def statement_cache_stats():
+    return {**_counters, 'cache_size': STATEMENT_CACHE_SIZE}
+
+# ___________________________________________ #
+
+# Define pool that keeps prepared statements across checkouts
+if HAS_MYSQL:
+    class StatementCachingPool(pooling.MySQLConnectionPool):
+        # Built with pool_reset_session=False: COM_RESET_CONNECTION would drop every prepared statement (data_access.py),
+        # so a returned connection ends its transaction and restores the session variables it changed here instead
+        def add_connection(self, cnx=None):
+            if cnx is not None:
+                try:
+                    if cnx.unread_result:  # e.g. a read stopped by KILL QUERY
+                        cnx.consume_results()
+                    cnx.rollback()  # No REPEATABLE READ snapshot carries over to the next checkout
+                    # Only what set_session_variable() changed on this connection (e.g. MAX_EXECUTION_TIME is MySQL 5.7.8+,
+                    # information_schema_stats_expiry 8.0.3+), so older servers don't fail every return
+                    changed = getattr(cnx, '_guvi_session_vars', None) or ()
+                    if changed:
+                        cursor = cnx.cursor()
+                        cursor.execute("SET SESSION " + ", ".join(f"{name} = DEFAULT" for name in sorted(changed)))
+                        cursor.close()
+                        cnx._guvi_session_vars = None
+                except Error:  # Broken connection: fall back to a full reset
+                    forget_statements(cnx)
+                    cnx._guvi_session_vars = None
+                    try:
+                        cnx.reset_session()
+                    except Error:
+                        cnx.disconnect()  # The next checkout's ping(reconnect=True) opens a fresh session
+            super().add_connection(cnx)
+
+
+# Define function to create (once per process) the pool for a given db_config
+@st.cache_resource(show_spinner=False)
+def _get_pool(key, pool_size):  # Shared across all Streamlit sessions through the resource cache
+    db_config = dict(key)  # Rebuild connection settings from the cache key
+    # Pool names are limited to 64 chars, so derive a short one from the settings
+    pool_name = "guvi_" + hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    # Clamp the pool size to what mysql-connector supports
+    pool_size = max(1, min(int(pool_size), pooling.CNX_POOL_MAXSIZE))
+    return StatementCachingPool(  # Opens pool_size connections up front; raises Error on bad credentials
+        pool_name=pool_name,
+        pool_size=pool_size,
+        pool_reset_session=False,
+        **db_config
+    )
+
+
+# Define function to check out a healthy connection from the pool
+def get_connection(db_config, pool_size=None, timeout=None):  # Return a pooled connection; close() hands it back
+    pool = _get_pool(config_key(db_config), pool_size or DEFAULT_POOL_SIZE)  # Look up (or build) the shared pool
+    deadline = time.monotonic() + (DEFAULT_CHECKOUT_TIMEOUT if timeout is None else timeout)
+    # mysql-connector raises PoolError instead of blocking when all connections are in use, so retry until the deadline
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:  # Give up once the checkout timeout has passed
+                raise
+            time.sleep(0.05)  # Brief back-off before trying again
+    # Health check: ping the server and transparently reconnect stale connections
+    try:
+        conn.ping(reconnect=True, attempts=2, delay=0)
+    except Error:
+        conn.close()  # Return the broken handle so the pool can recycle it
+        raise
+    return conn
+
+
+# Define context manager to borrow a connection for the duration of a block
+@contextmanager
+def pooled_connection(db_config):  # Usage: with pooled_connection(cfg) as conn: ...
+    conn = get_connection(db_config)
+    try:
+        yield conn
+    finally:
+        conn.close()  # For pooled connections close() returns the handle to the pool
+
+
+# Define function to drop the cached pools (e.g. after a password change)
+def reset_pools():  # Clears every pool held in the resource cache
+    _get_pool.clear()
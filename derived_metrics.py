@@ -0,0 +1,83 @@
+# Derived-metrics layer: indexed Avg_Soft_Skills on Soft_Skills
+# Usage: python derived_metrics.py [--host ... --user ... --database ...]
+
+# Import argparse for the command-line options
+import argparse
+
+# Import shared command-line connection helpers
+from cli_common import add_db_arguments, db_config_from_args, connect
+
+# ___________________________________________ #
+
+# Soft-skill score columns averaged by insights 6, 7 and 10
+SOFT_SKILL_COLUMNS = [
+    'Communication_Score', 'Teamwork_Score', 'Presentation_Score',
+    'Leadership_Score', 'Critical_Thinking', 'Interpersonal_Skills'
+]
+
+# Sum of the six soft-skill scores for one row
+SOFT_SKILLS_SUM = " + ".join(SOFT_SKILL_COLUMNS)
+
+# DECIMAL(7,4) keeps every x/6 value distinct from the next integer, so BETWEEN 40 AND 70 behaves as before
+AVG_SOFT_SKILLS_DDL = f"""
+ALTER TABLE Soft_Skills
+    ADD COLUMN Avg_Soft_Skills DECIMAL(7,4) GENERATED ALWAYS AS (({SOFT_SKILLS_SUM}) / 6.0) STORED
+"""
+
+# Index for filtering/sorting on the average (insights 6 and 7)
+AVG_SOFT_SKILLS_INDEX = ('Soft_Skills', 'idx_soft_skills_avg', '(Avg_Soft_Skills, Student_ID)')
+
+# Summary table from earlier versions (mock-interview composites); nothing reads it, so migrations drop it
+RETIRED_TABLES = ['Student_Metrics']
+
+# ___________________________________________ #
+
+# Define function checking whether a column exists in the current database
+def column_exists(cursor, table, column):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+# Define function checking whether an index exists in the current database
+def index_exists(cursor, table, index):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+# Define function adding the derived-metrics schema (safe to run repeatedly)
+def apply_derived_metrics(conn):
+    cursor = conn.cursor()
+    if not column_exists(cursor, 'Soft_Skills', 'Avg_Soft_Skills'):
+        cursor.execute(AVG_SOFT_SKILLS_DDL)
+        print("Added generated column Soft_Skills.Avg_Soft_Skills.")
+    table, index, columns = AVG_SOFT_SKILLS_INDEX
+    if not index_exists(cursor, table, index):
+        cursor.execute(f"CREATE INDEX {index} ON {table} {columns}")
+        print(f"Created index {index}.")
+    for table in RETIRED_TABLES:  # Left over from earlier versions
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.commit()
+    cursor.close()
+
+# ___________________________________________ #
+
+def main():
+    parser = add_db_arguments(argparse.ArgumentParser(description='Apply the derived-metrics layer'))
+    args = parser.parse_args()
+    conn = connect(db_config_from_args(args))
+    try:
+        apply_derived_metrics(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# Import io for in-memory output buffers
+import io
+# Import os for reading export settings from the environment
+import os
+# Import pandas library for chunk frames and CSV serialization
+import pandas as pd
+# Import streamlit library as st for the export cache
+import streamlit as st
+
+# Import pooled connection helpers and the config key used to share pools
+from db_pool import pooled_connection, config_key
+# Import the data-version probe, so a data load invalidates finished exports
+from data_version import current_data_version
+# Import the timing span for the export stage
+from instrumentation import span
+# Import compact dtype mapping, so every chunk gets the schema's types whatever values it happens to hold
+from typed_frames import apply_schema_dtypes
+
+# Attempt to import pyarrow for Parquet export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    # Set HAS_PYARROW to True if import succeeds
+    HAS_PYARROW = True
+# Handle ModuleNotFoundError if pyarrow is not installed
+except ModuleNotFoundError:
+    HAS_PYARROW = False
+
+# Attempt to import openpyxl for Excel export
+try:
+    from openpyxl import Workbook
+    # Set HAS_OPENPYXL to True if import succeeds
+    HAS_OPENPYXL = True
+# Handle ModuleNotFoundError if openpyxl is not installed
+except ModuleNotFoundError:
+    HAS_OPENPYXL = False
+
+# ___________________________________________ #
+
+# Rows fetched from the server-side cursor per chunk
+EXPORT_CHUNK_ROWS = int(os.environ.get("GUVI_EXPORT_CHUNK_ROWS", "5000"))
+# Number of finished exports kept in the cache
+EXPORT_CACHE_ENTRIES = int(os.environ.get("GUVI_EXPORT_CACHE_ENTRIES", "16"))
+
+# Format label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+# ___________________________________________ #
+
+# Define function listing formats whose libraries are installed
+def available_formats():  # CSV always; Parquet needs pyarrow, Excel needs openpyxl
+    formats = ['CSV']
+    if HAS_PYARROW:
+        formats.append('Parquet')
+    if HAS_OPENPYXL:
+        formats.append('Excel')
+    return formats
+
+
+# Define generator reading a query in chunks from an unbuffered (server-side) cursor
+def iter_query_chunks(db_config, sql, params=None, chunk_rows=EXPORT_CHUNK_ROWS):  # Yields DataFrames of at most chunk_rows rows
+    with pooled_connection(db_config) as conn:
+        cursor = conn.cursor(buffered=False)  # Rows stay on the server until fetched
+        try:
+            cursor.execute(sql, params or ())
+            columns = [desc[0] for desc in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=columns)
+        finally:
+            cursor.close()
+
+
+# Define function iterating an in-memory frame in the same chunk shape
+def iter_frame_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):  # Used for offline data and search results
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# Define function writing chunks to the requested format
+def write_chunks(chunks, fmt):  # Returns the encoded file as bytes; only one chunk is materialized at a time
+    with span('export', format=fmt) as info:
+        data = _encode_chunks(chunks, fmt)
+        info['bytes'] = len(data)
+    return data
+
+
+# Define the per-format encoders behind write_chunks
+def _encode_chunks(chunks, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'CSV':
+        header = True
+        for chunk in chunks:
+            buffer.write(chunk.to_csv(index=False, header=header).encode('utf-8'))
+            header = False
+    elif fmt == 'Parquet':
+        writer = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(apply_schema_dtypes(chunk), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(buffer, _parquet_schema(table.schema))
+            table = table.cast(writer.schema)  # Every row group on one schema
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    elif fmt == 'Excel':
+        workbook = Workbook(write_only=True)  # Streams rows to the sheet instead of building cell objects
+        sheet = workbook.create_sheet("Results")
+        header = True
+        for chunk in chunks:
+            if header:
+                sheet.append([str(col) for col in chunk.columns])
+                header = False
+            for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+                sheet.append(list(row))
+        workbook.save(buffer)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return buffer.getvalue()
+
+# Define the Parquet file schema from the first chunk, without types that only hold for that chunk
+def _parquet_schema(schema):  # An all-NULL column infers as null and a category as dictionary<int8>, neither fits later chunks
+    fields = []
+    for field in schema:
+        dtype = field.type
+        if pa.types.is_dictionary(dtype):  # Plain values: Parquet dictionary-encodes them anyway
+            dtype = dtype.value_type
+        if pa.types.is_null(dtype):  # Column not in SCHEMA_DTYPES and NULL so far: later values are kept as text
+            dtype = pa.large_string()
+        fields.append(pa.field(field.name, dtype))
+    return pa.schema(fields)
+
+# ___________________________________________ #
+
+# Define cached export of a query (key: connection, SQL incl. ORDER BY, params, format, data version)
+@st.cache_data(max_entries=EXPORT_CACHE_ENTRIES, show_spinner=False)
+def _export_query_cached(key, sql, params, fmt, version):  # version: only part of the key, like the page memo's
+    return write_chunks(iter_query_chunks(dict(key), sql, list(params)), fmt)
+
+
+# Define function exporting a sorted query result
+def export_query(db_config, sql, params, fmt):  # Built once per (query fingerprint, sort order, format, data version), then served from cache
+    version = current_data_version(db_config)  # After a load the download is rebuilt, matching the rows on screen
+    return _export_query_cached(config_key(db_config), sql, tuple(params or ()), fmt, version)
+
+
+# Define cached export of an in-memory frame (Streamlit hashes the frame contents for the key)
+@st.cache_data(max_entries=EXPORT_CACHE_ENTRIES, show_spinner=False)
+def export_frame(df, fmt):  # Used when the rows are already in memory (search results, offline data)
+    return write_chunks(iter_frame_chunks(df), fmt)
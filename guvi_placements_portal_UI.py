@@ -8,6 +8,10 @@ import random
 import numpy as np
 # Import plotly.express as px for creating interactive visualizations
 import plotly.express as px
+# Import sqlite3 for the offline engine's error type
+import sqlite3
+# Import os for reading portal settings from the environment
+import os
 
 
 # Attempt to import mysql.connector and Error for database operations
@@ -23,6 +27,45 @@ except ModuleNotFoundError:
     # Set HAS_MYSQL to False
     HAS_MYSQL = False
 
+# Import pooled connection helpers shared by every session
+from db_pool import get_connection
+# Import the cached schema catalog (column names, types, aliases)
+from schema_catalog import get_schema_catalog, PROFILE_TABLE, FALLBACK_CATALOG
+# Import the inner-join markers of the denormalized Student_Profile
+from student_profile import PRESENCE_COLUMNS, profile_is_current
+# Import the in-process inverted index behind the search box
+from search_index import get_search_index, SEARCH_RESULT_LIMIT
+# Import skill-tag lookups used for skill keywords in the search box
+from skill_tags import known_skills
+# Import the search-box query language (field:value, mock>=80, grad:2024..2025, exact statuses, free text)
+from search_query import parse_search, display_columns, order_by_rank
+# Import the budgeted per-session store for result frames (evicted frames are re-fetched by query)
+from result_store import get_result_store, result_source, track_session
+# Import server-side (keyset) pagination helpers
+from pagination import make_paged_query, count_sql, page_sql, sorted_sql, next_cursor
+# Import lazy, cached CSV/Parquet/Excel export helpers
+from export import EXPORT_FORMATS, available_formats, export_query, export_frame
+# Import the shared query-result cache (invalidated by the data-version probe)
+from query_cache import cached_query, query_cache_stats
+# Import the windowed table renderer and its per-session page memo
+from table_render import render_table, frame_window, memoized_window, render_cache_bytes
+# Import the background query executor (jobs, cancellation, per-session limits)
+from query_executor import get_query_executor, read_frame, QueryJobError, QueryCancelledError, QUERY_PROGRESS_DELAY
+# Import prepared-statement counters for the diagnostics
+from data_access import statement_stats
+# Import stage spans, the slow-query list and the local /metrics endpoint
+from instrumentation import span, slowest_queries, register_collector, start_metrics_server, ADMIN_PANEL
+# Import the EXPLAIN helper shared with the index audit
+from migrations import explain_query
+# Import the script-run context for this session's ID
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+# Import the data-version probe that keys memoized pages
+from data_version import current_data_version
+# Import the declarative insight specs and their SQL builder
+from insights import INSIGHT_SPECS, PARAM_TYPES, insight_params, build_insight, insight_order
+# Import the embedded offline engine (sample data in in-memory SQLite) used when MySQL is unreachable
+from offline_engine import generate_sample_data, engine_for
+
 
 # Define function to connect to MySQL database
 def connect_to_mysql(password):  # Define helper to open a MySQL connection and set session flags on success
@@ -38,7 +81,7 @@ def connect_to_mysql(password):  # Define helper to open a MySQL connection and
     }
 
     try:
-        conn = mysql.connector.connect(**db_config)  # Create a new MySQL connection with provided settings
+        conn = get_connection(db_config)  # Check out a connection from the shared pool (built on first login)
         if conn.is_connected():  # Verify the connection is active
             st.session_state.db_connected = True  # Mark DB connection as established in session state
             st.session_state.db_config = db_config  # Cache DB config for reuse across queries
@@ -50,30 +93,6 @@ def connect_to_mysql(password):  # Define helper to open a MySQL connection and
         st.session_state.db_connected = False  # Initialize db_connected as False
         return None
 
-    # Try to connect
-    try:
-        # Establish connection with db_config
-        conn = mysql.connector.connect(**db_config)  # Create a new MySQL connection with provided settings
-        # Check if connected
-        if conn.is_connected():  # Verify the connection is active
-            # Set session state db_connected to True
-            st.session_state.db_connected = True  # Mark DB connection as established in session state
-            # Store db_config in session state
-            st.session_state.db_config = db_config  # Cache DB config for reuse across queries
-            # Display success message
-            st.success("Login successful!")  # Notify user of successful login
-            st.markdown('<hr style="border: .8px solid black; margin-top: 1rem; margin-bottom: 1rem;">', unsafe_allow_html=True)  # Insert a thin horizontal rule for visual separation
-            # Return the connection
-            return conn
-    # Handle Error exception
-    except Error as e:  # Gracefully handle database connector errors
-        # Display error message
-        st.error(f"Connection failed: {e}")  # Show DB failure message to the user
-        # Set db_connected to False
-        st.session_state.db_connected = False  # Initialize db_connected as False
-        # Return None
-        return None
-
 # ___________________________________________ #
 
 # Set Streamlit page configuration for title, icon, and layout
@@ -263,67 +282,184 @@ if 'search_visible_rows' not in st.session_state:  # Ensure pagination size key
 # Initialize session state for selected_query if not present
 if 'selected_query' not in st.session_state:  # Ensure selected_query key exists
     st.session_state.selected_query = None
-# Initialize session state for current_result if not present
-if 'current_result' not in st.session_state:  # Ensure current_result DataFrame exists
-    st.session_state.current_result = pd.DataFrame()
-# Initialize session state for current_insight if not present
-if 'current_insight' not in st.session_state:  # Ensure current_insight DataFrame exists
-    st.session_state.current_insight = pd.DataFrame()
-# Initialize session state for search_result if not present
-if 'search_result' not in st.session_state:  # Ensure search_result DataFrame exists
-    st.session_state.search_result = pd.DataFrame()
+# Initialize session state for the paged custom view / insight queries if not present
+if 'custom_query' not in st.session_state:  # Paged query spec for the custom view (server-side pagination)
+    st.session_state.custom_query = None
+if 'current_insight_query' not in st.session_state:  # Paged query spec for the current insight
+    st.session_state.current_insight_query = None
+# Initialize session state for use_sample_data if not present
+if 'use_sample_data' not in st.session_state:  # True when the session fell back to offline sample data
+    st.session_state.use_sample_data = False
 # Initialize session state for custom_columns if not present
 if 'custom_columns' not in st.session_state:  # Ensure per-section selected columns cache exists
     st.session_state.custom_columns = {'students': [], 'placements': [], 'programming': [], 'soft_skills': []}
 
+# Serve /metrics on 127.0.0.1 (once per process) with the cache and executor counters as gauges
+register_collector('query_cache', query_cache_stats)
+register_collector('query_executor', lambda: get_query_executor().stats())
+register_collector('statements', statement_stats)
+register_collector('result_store', lambda: get_result_store().stats())
+start_metrics_server()
+
 # ___________________________________________ #
 # Define function to execute SQL query
-def execute_sql_query(query, params=None):  # Execute a SQL query and return results as a DataFrame
+def execute_sql_query(query, params=None, cached=False):  # Execute a SQL query and return results as a DataFrame
+    # Offline sessions run the same SQL against the embedded sample database
+    if not st.session_state.db_connected and st.session_state.use_sample_data:
+        try:
+            return get_offline_engine().query(query, params)
+        except sqlite3.Error as e:  # Same reporting as MySQL errors
+            st.error(f"Query failed: {e}")
+            return pd.DataFrame()
     # Check if connected and config exists
     if not st.session_state.db_connected or not st.session_state.db_config:  # Guard: return empty results if not authenticated to DB
         # Return empty DataFrame if not
         return pd.DataFrame()
+    db_config = st.session_state.db_config
     # Try to execute
     try:
-        # Connect using config
-        conn = mysql.connector.connect(**st.session_state.db_config)  # Create a new MySQL connection with provided settings
-        # Read query into DataFrame with parameters
-        df = pd.read_sql(query, conn, params=params)  # Run the SQL against MySQL and load the result into a DataFrame
-        # Close connection
-        conn.close()  # Close the temporary connection handle
-        # Replace None with empty string
-        return df.replace({None: ''})  # Normalize None values to empty strings for cleaner display
+        # Serve repeatable queries (canned insights) from the shared result cache
+        if cached:
+            return cached_query(db_config, query, params, lambda: _run_sql(db_config, query, params))
+        return _run_sql(db_config, query, params)
     # Handle Error
-    except Error as e:  # Gracefully handle database connector errors
+    except QueryCancelledError as e:  # Stopped from the Cancel button
+        st.warning(str(e))
+        return pd.DataFrame()
+    except (Error, QueryJobError) as e:  # Gracefully handle database connector errors and timeouts
         # Display error
         st.error(f"Query failed: {e}")
         # Return empty DataFrame
         return pd.DataFrame()
+
+
+# Define function running several independent queries at once (e.g. a paged query's column list and row count)
+def execute_sql_queries(queries, cached=False):  # queries: [(sql, params), ...]; returns one DataFrame per query
+    if not st.session_state.db_connected or cached:  # Offline engine is single-connection; cached queries go one by one through the cache
+        return [execute_sql_query(sql, params, cached=cached) for sql, params in queries]
+    try:
+        return get_query_executor().run_parallel(session_owner(), st.session_state.db_config, queries)
+    except (Error, QueryJobError) as e:
+        st.error(f"Query failed: {e}")
+        return [pd.DataFrame() for _ in queries]
+
+
+# Define function returning the ID that scopes this session's query jobs
+def session_owner():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else 'local'
+
+
+# Define function that runs one query as a background job on a pooled connection
+def _run_sql(db_config, query, params=None, run=read_frame):  # Raises on DB errors so failures are never cached
+    executor = get_query_executor()
+    job_id = executor.submit(session_owner(), db_config, query, params, run=run)
+    # Fast queries return before anything is drawn; slower ones show progress and a Cancel button
+    job = executor.wait(job_id, QUERY_PROGRESS_DELAY)
+    if job is None:
+        progress = st.empty()
+        try:
+            with progress.container():
+                elapsed = st.empty()
+                st.button("Cancel query", key=f"cancel_{job_id}", on_click=executor.cancel, args=(job_id,))
+            while job is None:
+                elapsed.caption(f"Query running… {executor.poll(job_id).elapsed():.1f}s")  # Also where Streamlit notices a new click
+                job = executor.wait(job_id, 0.25)
+        finally:
+            progress.empty()
+            executor.cancel(job_id)  # No-op when finished; a rerun that interrupted this wait stops the query in MySQL too
+    # Compact dtypes were applied by the job; NULLs stay NA (display formatting happens on the rendered page only)
+    return executor.take_result(job_id)
 # ___________________________________________ #
 
 # Define function to get columns from table
 def get_table_columns(table_name):  # Return the list of columns for a given table
-    # If connected, query columns
-    if st.session_state.db_connected:  # Use live MySQL search when connected
-        query = f"SHOW COLUMNS FROM {table_name}"  # Use MySQL metadata query to fetch column names
-        columns_df = execute_sql_query(query)
-        # Return list of Field names
-        return [row['Field'] for _, row in columns_df.iterrows()]
-    # Return empty list if not connected
-    return []
+    # Read from the schema catalog (live and cached when connected, static fallback otherwise)
+    return current_schema_catalog().columns(table_name)
 # ___________________________________________ #
 
-# Define utility function to get DataFrame from session state
-def _get_state_df(key: str) -> pd.DataFrame:  # Utility: fetch a DataFrame from session safely
-    # Get value from session state or empty DataFrame
-    val = st.session_state.get(key, pd.DataFrame())
-    # Return if DataFrame, else empty
-    return val if isinstance(val, pd.DataFrame) else pd.DataFrame()  # If stored value isn't a DataFrame, fall back to an empty one
+# Define function to get the schema catalog for this session
+def current_schema_catalog():  # Loaded once per db_config from information_schema, then served from cache
+    if st.session_state.db_connected and st.session_state.db_config:
+        try:
+            return get_schema_catalog(st.session_state.db_config)
+        except Error as e:  # Fall back to the known schema if information_schema can't be read
+            st.error(f"Schema lookup failed: {e}")
+    return get_schema_catalog()
+
 
+# Define function deciding whether reads can use the pre-joined Student_Profile
+def use_student_profile(catalog):  # Only while it was built from the data the base tables hold now; otherwise the joins
+    if not (st.session_state.db_connected and catalog.has_table(PROFILE_TABLE)):
+        return False
+    try:
+        return profile_is_current(st.session_state.db_config)
+    except Error:  # Version probe failed: the joins are always correct
+        return False
 # ___________________________________________ #
 
+# Define function listing the skill tags bare search terms are routed to
+def search_skills(db_config):  # Empty before migrations.py has created Student_Skills (every term is then free text)
+    try:
+        return known_skills(db_config)
+    except Error:
+        return frozenset()
+# ___________________________________________ #
+
+# Define function to get the offline sample tables
+@st.cache_resource(show_spinner=False)
+def get_sample_snapshot():  # Generated once per process and shared by every offline session
+    return generate_sample_data(int(os.environ.get("GUVI_SAMPLE_STUDENTS", "500")))  # Larger snapshots for load tests
+
+
+# Define function to get the offline query engine over the sample tables
+def get_offline_engine():  # Built once per snapshot; runs search, Custom View and the insight SQL locally
+    return engine_for(*get_sample_snapshot())
+# ___________________________________________ #
+
+# Define utility function to get a result frame from the session's result store
+def _get_state_df(key: str) -> pd.DataFrame:  # Utility: fetch a stored frame (re-fetched if it was evicted) or an empty one
+    df = get_result_store().get(session_owner(), key, refetch=_refetch_result)
+    return df if df is not None else pd.DataFrame()
+
+
+# Define utility function to keep a result frame in the session's result store
+def _set_state_df(key, df, source=None):  # source: result_source(...) so the frame can be rebuilt after eviction
+    if df is None or df.empty:
+        get_result_store().discard(session_owner(), key)
+    else:
+        get_result_store().put(session_owner(), key, df, source)
+
+
+# Define function rebuilding an evicted frame from its stored query
+def _refetch_result(source):  # Same SQL and params, then the same ranking and column slice
+    if source is None:
+        return None
+    with span('refetch', fingerprint=source['fingerprint']):
+        df = execute_sql_query(source['sql'], source['params'] or None)
+    if df.empty:
+        return None
+    df = order_by_rank(df, source['ids'])
+    return df[[col for col in source['columns'] if col in df.columns]] if source['columns'] else df
+
+
+# Release this session's stored frames when its session state is dropped
+track_session(session_owner())
+
+# ___________________________________________ #
+
+# Define callback growing a section's visible rows
+def _show_more(visible_rows_key):
+    st.session_state[visible_rows_key] += 10  # Increment the visible row count by 10
+
 # Define function to display DataFrame in MySQL style
-def display_mysql_table(df, visible_rows_key, section_title):  # Render a DataFrame styled like a MySQL Workbench table
+# Each section is a fragment: its sort/paging widgets rerun only that section, not the other tables
+@st.fragment
+def display_mysql_table(df, visible_rows_key, section_title, paged_query=None):  # Render a DataFrame styled like a MySQL Workbench table
+    # Server-side sorting and paging when a paged query is available (live MySQL or the offline engine)
+    if paged_query is not None and (st.session_state.db_connected or st.session_state.use_sample_data):
+        display_paged_table(paged_query, visible_rows_key, section_title)
+        return
     # Check if DataFrame is empty
     if df.empty:  # Early exit when there's nothing to show
         # Display warning
@@ -352,35 +488,211 @@ def display_mysql_table(df, visible_rows_key, section_title):  # Render a DataFr
             key=f"{visible_rows_key}_sort_dir"
         )
 
-    # Apply sort if column selected
-    if sort_column and sort_column != "":
-        df = df.sort_values(by=sort_column, ascending=(sort_direction == "Ascending"))  # Apply sorting to the DataFrame
+    sort_column = sort_column or None
+    ascending = sort_direction == "Ascending"
 
-    # Get visible portion of DataFrame
-    visible_df = df.head(st.session_state[visible_rows_key])  # Paginate by showing only the first N rows
+    # Sorted visible window, memoized per (result, sort, rows): revisiting a sort does not re-sort the frame
+    visible_df = frame_window(df, sort_column, ascending, st.session_state[visible_rows_key])  # Paginate by showing only the first N rows
 
-    # Convert to HTML with class
-    html_table = visible_df.to_html(index=False, classes="mysql-table", escape=False)  # Convert visible rows to HTML table with MySQL-like CSS classes
-    # Display in container
-    st.markdown(f'<div class="mysql-table-container">{html_table}</div>', unsafe_allow_html=True)
+    # Send only the visible window to the browser
+    render_table(visible_df, visible_rows_key)
 
     # If more rows, show button
     if len(df) > st.session_state[visible_rows_key]:
-        if st.button("Show More", key=f"{visible_rows_key}_show_more"):  # Button to increase page size
-            # Increment visible rows
-            st.session_state[visible_rows_key] += 10  # Increment the visible row count by 10
-            # Rerun app
-            st.rerun()  # Trigger a rerun so the UI reflects the new page size
-
-    # Generate CSV
-    csv = df.to_csv(index=False)  # Create a CSV download of the (sorted) result
-    # Display download button
-    st.download_button(  # Provide a button to download the CSV
-        label="📥 Download Results as CSV",
-        data=csv,
-        file_name=f"guvi_placements_{section_title.lower().replace(' ', '_')}.csv",
-        mime="text/csv"
-    )
+        # Button to increase page size; the callback runs before the section's fragment rerun, so no extra rerun is needed
+        st.button("Show More", key=f"{visible_rows_key}_show_more", on_click=_show_more, args=(visible_rows_key,))
+
+    # Export the (sorted) result only when the download is clicked
+    render_download(visible_rows_key, section_title,
+                    lambda fmt: export_frame(df.sort_values(by=sort_column, ascending=ascending) if sort_column else df, fmt))
+
+# ___________________________________________ #
+
+# Define function to display a server-side paginated result in MySQL style
+def display_paged_table(paged, visible_rows_key, section_title):  # Sort and page in MySQL; only the visible page is kept in session
+    # Page size follows the section's visible-rows setting
+    page_size = st.session_state[visible_rows_key]
+    # Per-section paging state: page cursors for the current sort plus the visible page itself
+    state_key = f"{visible_rows_key}_paging"
+    paging = st.session_state.get(state_key)
+    if not paging or paging['fingerprint'] != paged['fingerprint']:  # New query: start again from page one
+        paging = {'fingerprint': paged['fingerprint'], 'sort': None, 'cursors': [{'offset': 0, 'after': None}]}
+        st.session_state[state_key] = paging
+
+    # Fetch column names (LIMIT 0) and the total row count once per query
+    if paged['columns'] is None or paged['total'] is None:  # Both lookups run in parallel on live MySQL
+        sql, params = count_sql(paged)
+        header, counted = execute_sql_queries([(f"SELECT * FROM ({paged['sql']}) AS q LIMIT 0", paged['params'] or None),
+                                               (sql, params or None)], cached=paged['cached'])
+        paged['columns'] = list(header.columns)
+        paged['total'] = int(counted.iloc[0, 0]) if not counted.empty else 0
+    total = paged['total']
+
+    # Check if result is empty
+    if total == 0:  # Early exit when there's nothing to show
+        st.warning(f"No results found for {section_title}.")
+        return
+
+    # Display sort header
+    st.markdown(f"**Sort {section_title}**")  # Add a small sort header above the table
+
+    # Create columns for sort controls (equal widths for balance)
+    sort_col, sort_dir = st.columns([3, 1])  # Layout: place sort column and direction controls side by side
+
+    with sort_col:
+        sort_column = st.selectbox(
+            "Sort By",
+            [""] + paged['columns'],
+            key=f"{visible_rows_key}_sort_col"
+        )
+
+    with sort_dir:
+        sort_direction = st.radio(
+            "Direction",
+            ["Ascending", "Descending"],
+            index=0 if st.session_state.get(f"{visible_rows_key}_sort_dir", "Ascending") == "Ascending" else 1,
+            key=f"{visible_rows_key}_sort_dir"
+        )
+    sort_column = sort_column or None
+    descending = sort_direction == "Descending"
+
+    # A new sort order or page size restarts paging from the first page
+    sort_signature = (sort_column, descending, page_size)
+    if paging['sort'] != sort_signature:
+        paging.update({'sort': sort_signature, 'cursors': [{'offset': 0, 'after': None}]})
+
+    # Fetch only the visible page (ORDER BY + keyset/LIMIT pushed to MySQL), memoized per (query, sort, page, data version)
+    cursor = paging['cursors'][-1]
+    sql, params = page_sql(paged, sort_column, descending, cursor, page_size)
+    try:  # A data load changes the version, so memoized pages of the old data are not served
+        version = current_data_version(st.session_state.db_config) if st.session_state.db_connected else None
+    except Error:  # Probe failed: the page query below reports the error
+        version = object()  # Unique key, never a memo hit
+    page_key = ('page', paged['fingerprint'], sort_signature, cursor['offset'], cursor['after'], version)
+    visible_df = memoized_window(page_key, lambda: execute_sql_query(sql, params or None, cached=paged['cached']))
+
+    # Send only the visible page to the browser
+    render_table(visible_df, visible_rows_key)
+
+    # Page position and navigation
+    first_row = cursor['offset'] + 1
+    last_row = cursor['offset'] + len(visible_df)
+    st.caption(f"Rows {first_row}–{last_row} of {total}")
+    prev_col, next_col, _ = st.columns([1, 1, 6])
+    with prev_col:
+        if len(paging['cursors']) > 1:  # Step back to the previous page's cursor (served from the page memo)
+            st.button("Previous", key=f"{visible_rows_key}_prev_page", on_click=paging['cursors'].pop)
+    with next_col:
+        if last_row < total:  # Continue after this page's last row
+            st.button("Next", key=f"{visible_rows_key}_next_page",
+                      on_click=paging['cursors'].append, args=(next_cursor(paged, visible_df, sort_column, cursor, descending),))
+
+    # Export is streamed from the full sorted query only when the button is clicked
+    export_sql, export_params = sorted_sql(paged, sort_column, descending)
+    if not st.session_state.db_connected:  # Offline: export the sorted result from the embedded engine
+        engine = get_offline_engine()
+        render_download(visible_rows_key, section_title, lambda fmt: export_frame(engine.query(export_sql, export_params), fmt))
+        return
+    db_config = st.session_state.db_config  # Captured for the download thread (no session state there)
+    render_download(visible_rows_key, section_title, lambda fmt: export_query(db_config, export_sql, export_params, fmt))
+
+# ___________________________________________ #
+
+# Define function showing the slowest recent queries, their stage timings and EXPLAIN plans
+def display_admin_panel():
+    with st.expander("Diagnostics: slowest recent queries"):
+        backend = 'mysql' if st.session_state.db_connected else 'sqlite'
+        records = slowest_queries(20, backend=backend)
+        stats_col, cache_col = st.columns(2)
+        with stats_col:
+            st.caption("Query executor")
+            st.json(get_query_executor().stats(), expanded=False)
+            st.caption("Prepared statements")
+            st.json(statement_stats(), expanded=False)
+        with cache_col:
+            st.caption("Query-result cache")
+            st.json(query_cache_stats(), expanded=False)
+            st.caption("Result store (all sessions)")
+            st.json(get_result_store().stats(), expanded=False)
+        # This session's stored frames plus the rendered pages it keeps
+        usage = get_result_store().session_usage(session_owner())
+        usage.append({'name': 'rendered pages', 'bytes': render_cache_bytes(), 'evicted': False, 'idle_s': None, 'fingerprint': None})
+        st.caption(f"This session: {sum(row['bytes'] for row in usage) / 1024 / 1024:.1f} MB "
+                   f"of {get_result_store().session_budget / 1024 / 1024:.1f} MB (GUVI_SESSION_MEMORY_MB)")
+        st.dataframe(pd.DataFrame(usage), hide_index=True, width="stretch")
+        if not records:
+            st.caption("No queries recorded yet.")
+            return
+        st.dataframe(pd.DataFrame([{
+            'Fingerprint': r['fingerprint'], 'ms': round(r['ms'], 1), 'Status': r['status'],
+            'Rows': r['rows'], 'Bytes': r['bytes'],
+            **{f'{stage} ms': round(ms, 1) for stage, ms in r['stages_ms'].items()},
+            'SQL': r['sql'][:200],
+        } for r in records]), hide_index=True, width="stretch")
+        chosen = st.selectbox("Query", range(len(records)), key="admin_explain_query",
+                              format_func=lambda i: f"{records[i]['fingerprint']} ({records[i]['ms']:.0f} ms)")
+        if st.button("EXPLAIN", key="admin_explain_button"):
+            record = records[chosen]
+            st.code(record['sql'], language="sql")
+            if backend == 'sqlite':  # Offline engine: SQLite's own plan
+                st.dataframe(get_offline_engine().query("EXPLAIN QUERY PLAN " + record['sql'], record['params'] or None), hide_index=True)
+                return
+            try:
+                plan = _run_sql(st.session_state.db_config, record['sql'], record['params'] or None, run=_explain_plan)
+            except (Error, QueryJobError) as e:
+                st.error(f"EXPLAIN failed: {e}")
+                return
+            st.dataframe(plan, hide_index=True, width="stretch")
+            for warning in plan.attrs.get('warnings', []):
+                st.warning(warning)
+
+
+# Define job body running EXPLAIN (same flags as migrations.py explain-audit)
+def _explain_plan(conn, sql, params):
+    cursor = conn.cursor()
+    try:
+        plan, warnings = explain_query(cursor, sql, params)
+    finally:
+        cursor.close()
+    df = pd.DataFrame(plan)
+    df.attrs['warnings'] = warnings
+    return df
+
+# ___________________________________________ #
+
+# Define function rendering the parameter inputs of one insight
+def insight_param_inputs(qid):  # Returns {name: raw value}; build_insight() checks and converts the types
+    values = {}
+    defaults = insight_params(qid)
+    columns = st.columns(min(4, len(defaults)))
+    for i, (name, default) in enumerate(defaults.items()):
+        kind, label = PARAM_TYPES[name]
+        key = f"insight_{qid}_{name}"  # Per insight, so switching insights restores each one's own defaults
+        with columns[i % len(columns)]:
+            if kind == 'int':
+                values[name] = st.number_input(label, min_value=0, value=int(default), step=1, key=key)
+            elif kind == 'float':
+                values[name] = st.number_input(label, min_value=0.0, max_value=100.0, value=float(default), step=5.0, key=key)
+            else:  # Lists are typed as comma-separated text
+                values[name] = st.text_input(label, value=", ".join(str(v) for v in default), key=key)
+    return values
+
+# ___________________________________________ #
+
+# Define function to render the export format picker and lazy download button
+def render_download(visible_rows_key, section_title, build):  # build(fmt) -> bytes, called only when the button is clicked
+    fmt_col, button_col = st.columns([1, 3])  # Layout: format picker next to the download button
+    with fmt_col:
+        fmt = st.selectbox("Export format", available_formats(), key=f"{visible_rows_key}_export_fmt", label_visibility="collapsed")
+    extension, mime = EXPORT_FORMATS[fmt]
+    with button_col:
+        st.download_button(  # Provide a button to download the results
+            label=f"📥 Download Results as {fmt}",
+            data=lambda: build(fmt),  # Deferred: nothing is serialized on ordinary reruns
+            file_name=f"guvi_placements_{section_title.lower().replace(' ', '_')}.{extension}",
+            mime=mime,
+            key=f"{visible_rows_key}_download"
+        )
 
 # ___________________________________________ #
 
@@ -397,39 +709,29 @@ def main():  # Entry point for assembling the app UI and behavior
                 # Attempt connection
                 conn = connect_to_mysql(password)  # Try to connect using the provided password
                 if conn:
-                    # Close connection
-                    conn.close()  # Close the temporary connection handle
-                    # Load DataFrames from tables
-                    st.session_state.df_students = execute_sql_query("SELECT * FROM Students")  # Load Students table into session after login
-                    st.session_state.df_programming = execute_sql_query("SELECT * FROM Programming")  # Load Programming table into session
-                    st.session_state.df_soft_skills = execute_sql_query("SELECT * FROM Soft_Skills")  # Load Soft_Skills table into session
-                    st.session_state.df_placements = execute_sql_query("SELECT * FROM Placements")  # Load Placements table into session
+                    # Return connection to the pool
+                    conn.close()  # Hand the login connection back to the shared pool
+                    # Table data is no longer copied into the session; queries fetch what they need on demand
+                    st.session_state.use_sample_data = False
                 else:
                     # Warning for fallback
                     st.warning("Using sample data due to connection failure.")  # Inform the user that fallback sample data will be used
-                    # Generate sample data
-                    st.session_state.df_students, st.session_state.df_programming, \
-                    st.session_state.df_soft_skills, st.session_state.df_placements = generate_sample_data()  # Populate sample DataFrames to keep the app usable offline
+                    # Switch this session to the shared, process-wide sample tables
+                    st.session_state.use_sample_data = True
 
-    # ___________________________________________ #
-    # Get DataFrames from session state
-    df_students = st.session_state.get('df_students', pd.DataFrame())  # Fetch Students data (session or default empty)
-    df_programming = st.session_state.get('df_programming', pd.DataFrame())  # Fetch Programming data (session or default empty)
-    df_soft_skills = st.session_state.get('df_soft_skills', pd.DataFrame())  # Fetch Soft_Skills data (session or default empty)
-    df_placements = st.session_state.get('df_placements', pd.DataFrame())  # Fetch Placements data (session or default empty)
    # ___________________________________________ #
 
     # Keyword Search Section
     st.markdown('<div class="section-header">Search</div>', unsafe_allow_html=True)  # Section: keyword search across joined tables
     search_criteria = st.text_input(  # Textbox to enter comma-separated keywords; Enter key triggers search
         "", 
-        placeholder="Enter keywords (e.g., Chennai, placed, python)", 
+        placeholder="Enter keywords (e.g., Chennai, ready, python, mock>=80, grad:2024..2025)", 
         key="search_input", 
         label_visibility="collapsed",
         on_change=lambda: st.session_state.update({"search_trigger": True})  # 👈 enables Enter key
     )
     # Ensure dataframes are available
-    if 'df_students' not in st.session_state or st.session_state.df_students.empty:  # If not logged in yet, show a friendly callout instead of search UI
+    if not (st.session_state.db_connected or st.session_state.use_sample_data):  # If not logged in yet, show a friendly callout instead of search UI
         st.markdown(
             """
             <div style='background-color: #c6d9ed; padding: .4rem; border-radius: 8px; border: 1px solid #6c89a0;'>
@@ -451,124 +753,86 @@ def main():  # Entry point for assembling the app UI and behavior
                             st.warning("Please enter valid search keywords.")  # Display a warning if no valid keywords
                         else:
                             # Define all columns from all tables with correct aliases
-                            all_columns = {  # Lookup all column names for each table alias
-                                's': get_table_columns('Students'),
-                                'pr': get_table_columns('Programming'),
-                                'ss': get_table_columns('Soft_Skills'),
-                                'p': get_table_columns('Placements')
-                            }
-                            flat_columns = [col for sublist in all_columns.values() for col in sublist]  # Flatten the list of all columns across tables  # Flatten list of all column names for iteration
-
-                            # Default columns to always include in specified order
-                            default_cols = ['s.Name', 's.Student_ID', 's.Course_Batch', 'p.Placement_Status']  # Columns that always appear first in search results
+                            catalog = current_schema_catalog()  # One cached catalog instead of four SHOW COLUMNS round-trips
+                            all_columns = catalog.columns_by_alias()  # Lookup all column names for each table alias
+
                             # Select all columns initially for full search, prioritizing s.Student_ID
                             all_select_cols = ['s.Student_ID'] + [f'{table}.{col}' for table, cols in all_columns.items() for col in cols if col != 'Student_ID']  # Build the full SELECT column list (Student_ID first)
 
-                            # Base query with all columns and named placeholders
-                            base_query = """
-                            SELECT {select_cols}
-                            FROM Students s
-                            LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
-                            LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
-                            LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
-                            WHERE {where_clause}
-                            """
-
-                            conditions = []  # Accumulate WHERE clause parts here
-                            params = []
-                            # Separate column name keywords from value-based keywords
-                            col_name_keywords = [k for k in keywords if k in flat_columns or any(k in col.lower() for col in flat_columns)]  # Separate keywords that look like column names
-                            value_keywords = [k for k in keywords if k not in col_name_keywords]  # Remaining keywords treated as search terms for values
-
-                            if value_keywords:  # When value terms are present, search across all columns
-                                # Build AND condition for value-based keywords
-                                for keyword in value_keywords:
-                                    keyword_condition = " OR ".join(  # Build OR across all columns for one keyword
-                                        f"LOWER({table}.{col}) LIKE %s"
-                                        for table, cols in all_columns.items()
-                                        for col in cols
-                                    )
-                                    conditions.append(f"({keyword_condition})")  # Add per-keyword OR group to WHERE
-                                    params.extend([f"%{keyword}%"] * len(flat_columns))  # Supply parameterized LIKE patterns for safety
-                                where_clause = " AND ".join(conditions) if conditions else "1=1"  # Combine per-keyword groups with AND
-                            else:  # If no value keywords, match all rows
-                                where_clause = "1=1"  # No value-based conditions, match all rows
-
-                            final_query = base_query.format(select_cols=', '.join(all_select_cols), where_clause=where_clause)  # Render the final SQL with columns and WHERE
-
-                            # Debug: Print the final query to verify
-                            # st.write("Debug Query:", final_query, params)
+                            # Base query with all columns; the WHERE clause comes from the parsed search
+                            profile = use_student_profile(catalog)
+                            if profile:  # Pre-joined wide table: single-table primary-key lookups
+                                all_select_cols = ['s.Student_ID'] + [f's.{col}' for cols in all_columns.values() for col in cols if col != 'Student_ID']
+                                base_query = """
+                                SELECT {select_cols}
+                                FROM Student_Profile s
+                                WHERE {where_clause}
+                                """
+                            else:
+                                base_query = """
+                                SELECT {select_cols}
+                                FROM Students s
+                                LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+                                LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+                                LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
+                                WHERE {where_clause}
+                                """
 
                             try:
+                                # Typed predicates for fields and statuses; free text goes to the index (text columns only)
+                                plan = parse_search(search_criteria, catalog, search_skills(st.session_state.db_config))
+                                ranked_ids = None  # Student_IDs matching every free-text term, best match first
+                                if plan.text:
+                                    ranked_ids = get_search_index(st.session_state.db_config).search(plan.text)
+                                    if len(ranked_ids) >= SEARCH_RESULT_LIMIT:
+                                        st.info(f"Showing the top {SEARCH_RESULT_LIMIT} matches. Add keywords to narrow the search.")
+                                where_clause, params = plan.where(ranked_ids, profile=profile)  # Sargable predicates + primary-key lookup of the matches
+
+                                final_query = base_query.format(select_cols=', '.join(all_select_cols), where_clause=where_clause)  # Render the final SQL with columns and WHERE
+                                if ranked_ids is None:  # Filters (or column names) only: bounded like the index path
+                                    final_query += f"ORDER BY s.Student_ID LIMIT {SEARCH_RESULT_LIMIT}"
+
                                 result = execute_sql_query(final_query, params) if params else execute_sql_query(final_query)  # Execute parameterized search query
+                                result = order_by_rank(result, ranked_ids)  # Restore the index ranking (IN (...) returns rows in key order)
                                 if not result.empty:  # Handle non-empty results
-                                    # Identify columns containing each keyword in the full result set with partial matching
-                                    matching_cols = set(col_name_keywords)  # Start with column name keywords  # Start with any columns named directly by the user
-                                    for keyword in value_keywords:
-                                        for col in result.columns:
-                                            # Robust check for partial keyword presence in column values
-                                            if any(keyword in str(value).lower() for value in result[col].dropna()):
-                                                matching_cols.add(col.split('.')[-1])  # Add column name without alias
-                                    # Special handling for common partial matches
-                                    if any(k in ('internship', 'internships') for k in keywords):
-                                        matching_cols.add('Internships_Completed')  # Special-case common synonyms to expected columns
-                                    if 'certification' in ' '.join(keywords):
-                                        matching_cols.add('Certifications_Earned')  # Include certification-related columns when asked
-                                    if 'mock' in ' '.join(keywords):
-                                        matching_cols.add('Mock_Interview_Score')  # Ensure interview-related columns are present
-                                    if 'interview' in ' '.join(keywords):
-                                        matching_cols.add('Mock_Interview_Score')  # Ensure interview-related columns are present
-                                    # Combine default and matching columns, enforcing specified order and validating against result columns
-                                    final_cols = ['Name', 'Student_ID', 'Course_Batch', 'Placement_Status']  # Compose final visible columns (defaults first)
-                                    matching_cols = matching_cols.intersection(set(result.columns))  # Only keep columns that exist  # Keep only columns that truly exist in result
-                                    final_cols.extend(list(matching_cols - {'Name', 'Student_ID', 'Course_Batch', 'Placement_Status'}))
-                                    st.session_state.search_result = result[final_cols]  # Store slimmed result in session for display
-                                    if st.session_state.search_result.empty:
-                                        st.write("No results for your search criteria. Try a different search?")
-                                    else:
-                                        st.session_state.search_visible_rows = 10  # Reset pagination for the search results
+                                    # Defaults first, then the fields searched on and the text columns the free text matched
+                                    with span('matching', rows=len(result)):
+                                        final_cols = display_columns(plan, result, catalog)
+                                    # Store the slimmed result under the session's memory budget; the query rebuilds it if evicted
+                                    _set_state_df('search_result', result[final_cols], result_source(final_query, params, final_cols, ranked_ids))
+                                    st.session_state.search_visible_rows = 10  # Reset pagination for the search results
                                 else:
                                     st.write("No results for your search criteria. Try a different search?")
+                            except ValueError as e:  # Malformed term, e.g. "mock>=abc"
+                                st.warning(str(e))
+                                _set_state_df('search_result', None)
                             except Exception as e:
                                 st.error(f"Search failed: {str(e)}")  # Display error for debugging  # Show any search error and clear results
-                                st.session_state.search_result = pd.DataFrame()
+                                _set_state_df('search_result', None)
                     else:  # If offline, run the same search logic on sample DataFrames
                         # Fallback to sample data
-                        df_students = st.session_state.df_students
-                        df_programming = st.session_state.df_programming
-                        df_soft_skills = st.session_state.df_soft_skills
-                        df_placements = st.session_state.df_placements
-                        result = search_sample_data(search_criteria, df_students, df_programming, df_soft_skills, df_placements)  # Use a helper to search across sample data tables
-                        if not result.empty:  # Handle non-empty results
-                            default_cols = ['Name', 'Student_ID', 'Course_Batch', 'Placement_Status']
-                            # Include columns where any keyword is found in the full sample data
-                            matching_cols = set()
-                            for keyword in keywords:
-                                for col in result.columns:
-                                    if col not in default_cols and any(keyword in str(value).lower() for value in result[col].dropna()):
-                                        matching_cols.add(col)
-                            # Special handling for common partial matches
-                            if any(k in ('internship', 'internships') for k in keywords):
-                                matching_cols.add('Internships_Completed')  # Special-case common synonyms to expected columns
-                            if 'certification' in ' '.join(keywords):
-                                matching_cols.add('Certifications_Earned')  # Include certification-related columns when asked
-                            if 'mock' in ' '.join(keywords):
-                                matching_cols.add('Mock_Interview_Score')  # Ensure interview-related columns are present
-                            if 'interview' in ' '.join(keywords):
-                                matching_cols.add('Mock_Interview_Score')  # Ensure interview-related columns are present
-                            result = result[default_cols + list(matching_cols - set(default_cols))]
-                            st.session_state.search_result = result
-                            if st.session_state.search_result.empty:
-                                st.write("No results for your search criteria. Try a different search?")
-                            else:
-                                st.session_state.search_visible_rows = 10  # Reset pagination for the search results
-                        else:
+                        engine = get_offline_engine()  # Shared read-only snapshot, not per session
+                        result = None
+                        try:
+                            plan = parse_search(search_criteria, FALLBACK_CATALOG, engine.known_skills())
+                            sql, params, ranked_ids = engine.search_query(search_criteria)  # Same predicates and index lookup as the live search
+                            result = order_by_rank(engine.query(sql, params or None), ranked_ids) if sql else pd.DataFrame()
+                        except ValueError as e:  # Malformed term, e.g. "mock>=abc"
+                            st.warning(str(e))
+                            _set_state_df('search_result', None)
+                        if result is not None and not result.empty:  # Handle non-empty results
+                            with span('matching', rows=len(result)):
+                                final_cols = display_columns(plan, result, FALLBACK_CATALOG)
+                            _set_state_df('search_result', result[final_cols], result_source(sql, params, final_cols, ranked_ids))
+                            st.session_state.search_visible_rows = 10  # Reset pagination for the search results
+                        elif result is not None:
                             st.write("No results for your search criteria. Try a different search?")
 
             st.session_state.search_trigger = False
 
-    if 'search_result' in st.session_state and not st.session_state.search_result.empty:
-        display_mysql_table(st.session_state.search_result, 'search_visible_rows', 'Search Results')  # Render the search results with MySQL-themed table
+    search_result = _get_state_df('search_result')  # Re-fetched by its query if the memory budget evicted it
+    if not search_result.empty:
+        display_mysql_table(search_result, 'search_visible_rows', 'Search Results')  # Render the search results with MySQL-themed table
 
     # Separator to ensure other sections appear
     st.markdown('<div class="section-separator"></div>', unsafe_allow_html=True)  # Horizontal separator to visually split sections
@@ -578,26 +842,12 @@ def main():  # Entry point for assembling the app UI and behavior
     # Display custom view header
     st.markdown('<div class="section-header">Custom View</div>', unsafe_allow_html=True)  # Section: choose arbitrary columns to view
 
-    # Get columns for students
-    students_cols = get_table_columns('Students') if st.session_state.db_connected else [  # Fallback column list for Students when not connected
-        "Student_ID", "Name", "Age", "Gender", "Email", "Phone", "Enrollment_Year", 
-        "Course_Batch", "City", "Graduation_Year"
-    ]
-    # Get columns for placements
-    placements_cols = get_table_columns('Placements') if st.session_state.db_connected else [  # Fallback column list for Placements when not connected
-        "Student_ID", "Mock_Interview_Score", "Internships_Completed", "Company_Name", 
-        "Placement_Package", "Interview_Rounds_Cleared", "Placement_Date", "Placement_Status"
-    ]
-    # Get columns for programming
-    programming_cols = get_table_columns('Programming') if st.session_state.db_connected else [  # Fallback column list for Programming when not connected
-        "Programming_ID", "Student_ID", "Language", "Problems_Solved", "Assessments_Completed", 
-        "Mini_Projects", "Certifications_Earned", "Latest_Project_Score"
-    ]
-    # Get columns for soft_skills
-    soft_skills_cols = get_table_columns('Soft_Skills') if st.session_state.db_connected else [  # Fallback column list for Soft_Skills when not connected
-        "Soft_Skills_ID", "Student_ID", "Communication_Score", "Teamwork_Score", 
-        "Presentation_Score", "Leadership_Score", "Critical_Thinking", "Interpersonal_Skills"
-    ]
+    # Get columns for each table from the schema catalog (static CREATE TABLE schema when not connected)
+    catalog = current_schema_catalog()
+    students_cols = catalog.columns('Students')
+    placements_cols = catalog.columns('Placements')
+    programming_cols = catalog.columns('Programming')
+    soft_skills_cols = catalog.columns('Soft_Skills')
 
     # Create four columns for filters
     filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)  # Layout: 4 equal-width columns for filter pickers
@@ -666,27 +916,32 @@ def main():  # Entry point for assembling the app UI and behavior
             if "s.Student_ID" not in selected_columns:  # Ensure primary key is present for joining/results
                 selected_columns.insert(0, "s.Student_ID")
 
-            # Build base query
-            query = f"SELECT {', '.join(selected_columns)} FROM {tables[0]}"  # Start SELECT with the base table
-            # Add joins if multiple tables
-            if len(tables) > 1:  # Append JOINs when more than one table is selected
-                query += " " + " ".join([f"JOIN {t} ON s.Student_ID = {t.split()[1]}.Student_ID" for t in tables[1:]])  # Join each extra table on Student_ID
-
-            # Execute query
-            result = execute_sql_query(query)  # Run the dynamically constructed query
-            # If not empty, store in session
-            if not result.empty:  # Handle non-empty results
-                st.session_state.custom_result = result  # Cache result for rendering and pagination
+            if use_student_profile(catalog):  # Read the pre-joined wide table; Has_* flags keep the inner-join semantics
+                profile_columns = [f"s.{col.split('.', 1)[1]}" for col in selected_columns]
+                presence = [f"s.{PRESENCE_COLUMNS[t.split()[1]]} = 1" for t in tables if t.split()[1] in PRESENCE_COLUMNS]
+                query = f"SELECT {', '.join(profile_columns)} FROM {PROFILE_TABLE} s"
+                if presence:
+                    query += " WHERE " + " AND ".join(presence)
+            else:
+                # Build base query
+                query = f"SELECT {', '.join(selected_columns)} FROM {tables[0]}"  # Start SELECT with the base table
+                # Add joins if multiple tables
+                if len(tables) > 1:  # Append JOINs when more than one table is selected
+                    query += " " + " ".join([f"JOIN {t} ON s.Student_ID = {t.split()[1]}.Student_ID" for t in tables[1:]])  # Join each extra table on Student_ID
+
+            # Keep only the query in session; pages are sorted and fetched by MySQL (or the offline engine) on demand
+            if st.session_state.db_connected or st.session_state.use_sample_data:
+                st.session_state.custom_query = make_paged_query(query)
                 st.session_state.custom_visible_rows = 10  # Reset pagination for custom view
 
     # If custom_result not empty, display
-    if not _get_state_df('custom_result').empty:  # Render custom view if there is data
+    if st.session_state.custom_query is not None or not _get_state_df('custom_result').empty:  # Render custom view if there is data
         # Separator
         st.markdown("---")
         # Subheader
         st.subheader("📈 Custom View Results")  # Label the results section with an icon
         # Display table
-        display_mysql_table(st.session_state.custom_result, 'custom_visible_rows', 'Custom View')  # Render custom result set with consistent styling
+        display_mysql_table(_get_state_df('custom_result'), 'custom_visible_rows', 'Custom View', paged_query=st.session_state.custom_query)  # Render custom result set with consistent styling
 
     # Display separator
     st.markdown('<div class="section-separator"></div>', unsafe_allow_html=True)  # Horizontal separator to visually split sections
@@ -697,44 +952,31 @@ def main():  # Entry point for assembling the app UI and behavior
     st.markdown('<div class="section-header">Actionable Insights</div>', unsafe_allow_html=True)  # Section: prebuilt SQL insights over the data
 
     # Define insight options list
-    insight_options = [  # Menu choices for insights (display text)
-        {"id": 1, "logic": "List 'Ready' students with mock interview scores and internships."},
-        {"id": 2, "logic": "Show 'Ready' students with all skills, scores, and academic details."},
-        {"id": 3, "logic": "Rank 'Ready' students by mock interview scores with full profiles."},
-        {"id": 4, "logic": "Find 'Ready' students skilled in Python, PyTorch, Mistral, or Llama for AI roles."},
-        {"id": 5, "logic": "List 'Ready' students with strong coding skills (mini projects > 5) for coding tests."},
-        {"id": 6, "logic": "Identify 'Ready' students with high soft skills for techno-functional roles."},
-        {"id": 7, "logic": "Find 'Ready' students with low soft skills (40-70) but high technical scores."},
-        {"id": 8, "logic": "Count 'Ready' students by city to target local companies."},
-        {"id": 9, "logic": "List 2024-2025 graduates who are 'Ready,' ranked by mock interview scores."},
-        {"id": 10, "logic": "Analyze success factors (scores, certifications, internships) for placed students."}
-    ]
-
-    # If connected
-    if st.session_state.get('db_connected', False):  # Show insights only after successful login
-        # Create opts list (not used)
-        opts = [f"{o['id']}. {o['logic']}" for o in insight_options]
-        # Selectbox for insight
-        choice = st.selectbox("Select an insight", options=[o['id'] for o in insight_options],  # Dropdown to pick which insight to run
-                            format_func=lambda i: f"{i}. {insight_options[i-1]['logic']}",
+    # If connected (or running on the offline sample database)
+    if st.session_state.get('db_connected', False) or st.session_state.get('use_sample_data', False):  # Show insights once logged in or offline
+        # Selectbox for insight (titles come from the declarative specs in insights.py)
+        choice = st.selectbox("Select an insight", options=list(INSIGHT_SPECS),  # Dropdown to pick which insight to run
+                            format_func=lambda i: f"{i}. {INSIGHT_SPECS[i]['title']}",
                             key="insight_select")
+        # Typed parameters of the chosen insight (thresholds, years, cities, skills, top-K)
+        param_values = insight_param_inputs(choice)
         # Button to run insight
         if st.button("Run Insight", key="run_insight_button"):
-            # Get SQL from dict
-            sql = sql_queries.get(choice, "")  # Map choice to its underlying SQL
-            if sql:
+            try:
+                # Parameterized SQL with filters and LIMIT pushed down (single-table variant when Student_Profile exists)
+                catalog = current_schema_catalog()
+                sql, params = build_insight(choice, param_values, profile=use_student_profile(catalog),
+                                            # Tables reloaded by the notebook lack the generated average until derived_metrics.py runs
+                                            derived=catalog.column_type('Soft_Skills', 'Avg_Soft_Skills') is not None)
+            except ValueError as e:  # Input that doesn't fit a parameter's type
+                st.warning(str(e))
+            else:
                 # Spinner
                 with st.spinner("Running insight..."):
-                    # Execute
-                    res = execute_sql_query(sql)  # Execute the selected insight query
-                    # If not empty, store
-                    if not res.empty:
-                        st.session_state.current_insight = res  # Persist insight results for rendering
-                        st.session_state.insights_visible_rows = 10
-                    else:
-                        # Empty and warning
-                        st.session_state.current_insight = pd.DataFrame()
-                        st.warning("No rows returned for this insight.")  # Inform user when insight returns nothing
+                    # Keep only the query in session; the table fetches the visible page and total count
+                    st.session_state.current_insight_query = make_paged_query(sql, params, cached=True, order=insight_order(choice))  # Pages/counts served from the shared result cache
+                    _set_state_df('current_insight', None)
+                    st.session_state.insights_visible_rows = 10
     else:  # When logged out, show an info card instead
         # Info if not connected
         st.markdown(
@@ -748,8 +990,12 @@ def main():  # Entry point for assembling the app UI and behavior
 
 
     # If current_insight not empty, display
-    if not _get_state_df('current_insight').empty:  # Render insight results if available
-        display_mysql_table(st.session_state.current_insight, 'insights_visible_rows', 'Insights')  # Render insights table with pagination and download
+    if st.session_state.current_insight_query is not None or not _get_state_df('current_insight').empty:  # Render insight results if available
+        display_mysql_table(_get_state_df('current_insight'), 'insights_visible_rows', 'Insights', paged_query=st.session_state.current_insight_query)  # Render insights table with pagination and download
+
+    # Query diagnostics for admins (GUVI_ADMIN_PANEL=1)
+    if ADMIN_PANEL and (st.session_state.db_connected or st.session_state.use_sample_data):
+        display_admin_panel()
 
 # ___________________________________________ #
 
@@ -768,109 +1014,6 @@ insight_options = [  # Re-declare insight options (duplicated)
 ]
 # ___________________________________________ #
 
-# Define dict of SQL queries for insights
-sql_queries = {
-    1: """
-    SELECT s.Student_ID, s.Name, s.Email, p.Mock_Interview_Score, p.Internships_Completed, p.Placement_Status
-    FROM Students s
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready';
-    """,
-    2: """
-    SELECT s.Student_ID, s.Name, s.Graduation_Year, s.City, pr.Language, pr.Problems_Solved,
-           pr.Assessments_Completed, pr.Mini_Projects, pr.Certifications_Earned, pr.Latest_Project_Score,
-           ss.Communication_Score, ss.Teamwork_Score, ss.Presentation_Score, ss.Leadership_Score,
-           ss.Critical_Thinking, ss.Interpersonal_Skills, p.Mock_Interview_Score
-    FROM Students s
-    JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready';
-    """,
-    3: """
-    SELECT s.Student_ID, s.Name, p.Mock_Interview_Score, p.Placement_Status,
-           COALESCE(pr.Problems_Solved,0) AS Problems_Solved, COALESCE(pr.Latest_Project_Score,0) AS Latest_Project_Score
-    FROM Students s
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    WHERE p.Placement_Status = 'Ready'
-    ORDER BY p.Mock_Interview_Score DESC;
-    """,
-    4: """
-    SELECT s.Student_ID, s.Name, s.City, s.Graduation_Year, pr.Language, p.Placement_Status
-    FROM Students s
-    JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready' AND
-          (pr.Language LIKE '%Python%' OR pr.Language LIKE '%PyTorch%' OR pr.Language LIKE '%Llama%');
-    """,
-    5: """
-    SELECT s.Student_ID, s.Name, pr.Problems_Solved, pr.Mini_Projects, p.Placement_Status
-    FROM Students s
-    JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready' AND pr.Mini_Projects > 5
-    ORDER BY pr.Problems_Solved DESC;
-    """,
-    6: """
-    SELECT s.Student_ID, s.Name,
-           (ss.Communication_Score + ss.Teamwork_Score + ss.Presentation_Score +
-            ss.Leadership_Score + ss.Critical_Thinking + ss.Interpersonal_Skills)/6.0 AS Avg_Soft_Skills,
-           p.Placement_Status
-    FROM Students s
-    JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready'
-    ORDER BY Avg_Soft_Skills DESC;
-    """,
-    7: """
-    SELECT s.Student_ID, s.Name,
-           (ss.Communication_Score + ss.Teamwork_Score + ss.Presentation_Score +
-            ss.Leadership_Score + ss.Critical_Thinking + ss.Interpersonal_Skills)/6.0 AS Avg_Soft_Skills,
-           COALESCE(pr.Problems_Solved,0) AS Problems_Solved, COALESCE(pr.Assessments_Completed,0) AS Assessments_Completed,
-           p.Placement_Status
-    FROM Students s
-    JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
-    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready' AND
-          (ss.Communication_Score + ss.Teamwork_Score + ss.Presentation_Score +
-           ss.Leadership_Score + ss.Critical_Thinking + ss.Interpersonal_Skills)/6.0 BETWEEN 40 AND 70
-    ORDER BY Problems_Solved DESC, Assessments_Completed DESC;
-    """,
-    8: """
-    SELECT s.City, COUNT(*) AS Ready_Students_Count
-    FROM Students s
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status = 'Ready'
-    GROUP BY s.City
-    ORDER BY Ready_Students_Count DESC
-    LIMIT 1;
-    """,
-    9: """
-    SELECT s.Name, s.Student_ID, s.City AS Location, s.Graduation_Year, p.Placement_Status,
-           p.Mock_Interview_Score
-    FROM Students s
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    WHERE s.Graduation_Year IN (2024, 2025) AND p.Placement_Status = 'Ready'
-    ORDER BY p.Mock_Interview_Score DESC;
-    """,
-    10: """
-    SELECT s.Student_ID, s.Name,
-           (ss.Communication_Score + ss.Teamwork_Score + ss.Presentation_Score +
-            ss.Leadership_Score + ss.Critical_Thinking + ss.Interpersonal_Skills)/6.0 AS Avg_Soft_Skills,
-           pr.Certifications_Earned, COALESCE(p.Internships_Completed,0) AS Internships_Completed,
-           COALESCE(p.Mock_Interview_Score,0) AS Mock_Interview_Score,
-           COALESCE(pr.Latest_Project_Score,0) AS Latest_Project_Score, p.Placement_Status
-    FROM Students s
-    JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
-    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
-    JOIN Placements p ON s.Student_ID = p.Student_ID
-    WHERE p.Placement_Status IN ('Ready','Placed');
-    """
-}
-
 # Call main function to run the app
 main()  # Run the app
 
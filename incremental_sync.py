@@ -0,0 +1,165 @@
+# Incremental sync: upsert only new or changed students from an incoming batch, without dropping the tables
+# Usage: python incremental_sync.py --from-dir data/            (CSV files as written by datagen.py)
+#        python incremental_sync.py --students 600 --seed 2      (generated batch, e.g. to test a refresh)
+
+# Import argparse for the command-line options
+import argparse
+# Import os for the input paths
+import os
+# Import time for the progress report
+import time
+# Import hashlib for per-row content hashes
+import hashlib
+# Import datetime to normalize dates before hashing
+import datetime
+# Import pandas for reading the batch in chunks
+import pandas as pd
+
+# Import shared command-line connection helpers
+from cli_common import add_db_arguments, db_config_from_args, connect
+# Import the generator and its per-table file names
+from datagen import iter_chunks, TABLE_FILES, DEFAULT_CHUNK_ROWS
+# Import incremental refreshes of the derived tables
+from skill_tags import sync_student_skills
+from student_profile import refresh_student_profile, mark_profile_current
+# Import the version counter the portal uses for cache invalidation
+from data_version import bump_data_version
+
+# ___________________________________________ #
+
+# Parent table first so foreign keys hold inside every transaction
+SYNC_ORDER = ['Students', 'Programming', 'Soft_Skills', 'Placements']
+# Columns computed by MySQL (never written, never hashed)
+GENERATED_COLUMNS = {'Avg_Soft_Skills'}
+
+# Students compared and upserted per transaction
+SYNC_BATCH_ROWS = 1000
+
+# ___________________________________________ #
+
+# Define value normalization shared by incoming rows and stored rows
+def _normalize(value):  # CSV strings, numpy scalars and MySQL values hash alike ("58" == 58, "2025-07-14" == date)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return '\\N'
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+
+# Define per-row content hash
+def row_hash(values):
+    return hashlib.blake2b('\x1f'.join(_normalize(v) for v in values).encode('utf-8'), digest_size=16).digest()
+
+
+# Define function hashing the stored rows for a set of students
+def stored_hashes(cursor, table, columns, student_ids):  # {Student_ID: hash}
+    placeholders = ", ".join(["%s"] * len(student_ids))
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE Student_ID IN ({placeholders})", list(student_ids))
+    key = columns.index('Student_ID')
+    return {row[key]: row_hash(row) for row in cursor.fetchall()}
+
+
+# Define function building one multi-row upsert
+def upsert_sql(table, columns, n_rows):
+    row_placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    updates = ", ".join(f"{col} = VALUES({col})" for col in columns)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([row_placeholders] * n_rows)
+            + f" ON DUPLICATE KEY UPDATE {updates}")
+
+# ___________________________________________ #
+
+# Define function syncing one chunk of one table (one transaction)
+def sync_chunk(conn, table, df):  # Returns the Student_IDs whose rows were inserted or changed
+    columns = [col for col in df.columns if col not in GENERATED_COLUMNS]
+    rows = df[columns].astype(object).where(df[columns].notna(), None).values.tolist()
+    key = columns.index('Student_ID')
+    cursor = conn.cursor()
+    try:
+        current = stored_hashes(cursor, table, columns, [row[key] for row in rows])
+        changed = [row for row in rows if current.get(row[key]) != row_hash(row)]
+        if changed:
+            cursor.execute(upsert_sql(table, columns, len(changed)), [value for row in changed for value in row])
+        conn.commit()  # Readers keep seeing the previous rows until this point (InnoDB MVCC)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return {row[key] for row in changed}
+
+
+# Define function syncing a batch given as {table: iterable of DataFrames}
+def sync_tables(conn, table_chunks, batch_rows=SYNC_BATCH_ROWS):  # Returns {table: changed rows}, set of changed Student_IDs
+    changed_ids = set()
+    counts = {}
+    conn.autocommit = False
+    for table in SYNC_ORDER:
+        started = time.perf_counter()
+        seen = changed = 0
+        for df in table_chunks[table]:
+            for start in range(0, len(df), batch_rows):
+                ids = sync_chunk(conn, table, df.iloc[start:start + batch_rows])
+                seen += min(batch_rows, len(df) - start)
+                changed += len(ids)
+                changed_ids |= ids
+        counts[table] = changed
+        print(f"{table}: {seen:,} rows compared, {changed:,} inserted or updated ({time.perf_counter() - started:.1f}s).")
+    conn.autocommit = True
+    return counts, changed_ids
+
+
+# Define function finishing a sync: derived tables and profile rows for the changed students, then the version bump
+def finish_sync(conn, changed_ids):  # Returns the new data version (or None when nothing changed)
+    if not changed_ids:
+        print("No changes; data version left as is.")
+        return None
+    sync_student_skills(conn, changed_ids)
+    refresh_student_profile(conn, changed_ids)
+    version = bump_data_version(conn)
+    mark_profile_current(conn)  # After the bump, so the stamp matches what portals probe
+    print(f"Data version is now {version}.")
+    return version
+
+
+# Define function reading the per-table CSV files of a batch in chunks
+def csv_table_chunks(data_dir, chunk_rows=DEFAULT_CHUNK_ROWS):  # {table: iterator of string-typed DataFrames}
+    return {
+        table: pd.read_csv(os.path.join(data_dir, TABLE_FILES[table]), chunksize=chunk_rows,
+                           na_values=['\\N'], keep_default_na=False, dtype=str)
+        for table in SYNC_ORDER
+    }
+
+
+# Define function splitting generated chunks into per-table lists
+def generated_table_chunks(n_students, seed=1, chunk_rows=DEFAULT_CHUNK_ROWS):  # {table: [DataFrame, ...]}
+    tables = {table: [] for table in SYNC_ORDER}
+    for frames in iter_chunks(n_students, seed=seed, chunk_rows=chunk_rows):
+        for table, df in zip(SYNC_ORDER, frames):
+            tables[table].append(df)
+    return tables
+
+# ___________________________________________ #
+
+def main():
+    parser = add_db_arguments(argparse.ArgumentParser(description='Upsert new or changed students without reloading the tables'))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--from-dir', help='Directory with students.csv, programming.csv, soft_skills.csv and placements.csv')
+    source.add_argument('--students', type=int, help='Generate this many students with datagen.py and sync them')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for --students (default: 1)')
+    parser.add_argument('--batch-rows', type=int, default=SYNC_BATCH_ROWS, help='Students compared and upserted per transaction')
+    args = parser.parse_args()
+
+    table_chunks = (csv_table_chunks(args.from_dir) if args.from_dir
+                    else generated_table_chunks(args.students, seed=args.seed))
+    conn = connect(db_config_from_args(args))
+    try:
+        started = time.perf_counter()
+        _, changed_ids = sync_tables(conn, table_chunks, batch_rows=args.batch_rows)
+        finish_sync(conn, changed_ids)
+        print(f"Synced {len(changed_ids):,} students in {time.perf_counter() - started:.1f}s.")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+# Canned insight queries shown in the "Actionable Insights" section of the portal
+# Kept outside the Streamlit script so migrations.py and benchmarks can import them
+# Each insight is a declarative spec; build_insight() turns it into parameterized SQL (filters and LIMIT run in MySQL)
+
+# Import re for mapping join aliases onto the Student_Profile alias
+import re
+
+# Import the inner-join markers of the denormalized Student_Profile
+from student_profile import PRESENCE_COLUMNS
+# Import the soft-skill score columns behind the generated Avg_Soft_Skills
+from derived_metrics import SOFT_SKILL_COLUMNS
+
+# ___________________________________________ #
+
+# Typed insight parameters: name -> (type, label); list values become IN (...) placeholders
+PARAM_TYPES = {
+    'statuses': ('str_list', "Placement status"),
+    'years': ('int_list', "Graduation years"),
+    'cities': ('str_list', "Cities (blank = all)"),
+    'skills': ('str_list', "Skills"),
+    'min_projects': ('int', "More than N mini projects"),
+    'min_soft': ('float', "Average soft skills from"),
+    'max_soft': ('float', "Average soft skills to"),
+    'top_k': ('int', "Top K rows (0 = all)"),
+}
+
+# Parameters every insight accepts (empty/0 = not applied)
+COMMON_PARAMS = {'cities': [], 'top_k': 0}
+
+# Joined tables: alias -> table (every insight starts from Students s)
+JOIN_TABLES = {'pr': 'Programming', 'ss': 'Soft_Skills', 'p': 'Placements'}
+
+# Filters: (column, op, param name); op is 'in', '>', '>=', '<=', 'between' (param is a (low, high) pair) or 'skills'
+# Optional filters are skipped when their parameter is empty; 'cities' is added to every insight
+# 4 matches skills through Student_Skills (skill_tags.py); 6, 7 and 10 read the indexed Soft_Skills.Avg_Soft_Skills (derived_metrics.py)
+INSIGHT_SPECS = {
+    1: {
+        'title': "List 'Ready' students with mock interview scores and internships.",
+        'columns': ['s.Student_ID', 's.Name', 's.Email', 'p.Mock_Interview_Score', 'p.Internships_Completed', 'p.Placement_Status'],
+        'joins': {'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses')],
+        'params': {'statuses': ['Ready']},
+    },
+    2: {
+        'title': "Show 'Ready' students with all skills, scores, and academic details.",
+        'columns': ['s.Student_ID', 's.Name', 's.Graduation_Year', 's.City', 'pr.Language', 'pr.Problems_Solved',
+                    'pr.Assessments_Completed', 'pr.Mini_Projects', 'pr.Certifications_Earned', 'pr.Latest_Project_Score',
+                    'ss.Communication_Score', 'ss.Teamwork_Score', 'ss.Presentation_Score', 'ss.Leadership_Score',
+                    'ss.Critical_Thinking', 'ss.Interpersonal_Skills', 'p.Mock_Interview_Score'],
+        'joins': {'pr': 'inner', 'ss': 'inner', 'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses')],
+        'params': {'statuses': ['Ready']},
+    },
+    3: {
+        'title': "Rank 'Ready' students by mock interview scores with full profiles.",
+        'columns': ['s.Student_ID', 's.Name', 'p.Mock_Interview_Score', 'p.Placement_Status',
+                    'COALESCE(pr.Problems_Solved,0) AS Problems_Solved', 'COALESCE(pr.Latest_Project_Score,0) AS Latest_Project_Score'],
+        'joins': {'p': 'inner', 'pr': 'left'},
+        'filters': [('p.Placement_Status', 'in', 'statuses')],
+        'params': {'statuses': ['Ready']},
+        'order_by': ['p.Mock_Interview_Score DESC'],
+    },
+    4: {
+        'title': "Find 'Ready' students skilled in Python, PyTorch, Mistral, or Llama for AI roles.",
+        'columns': ['s.Student_ID', 's.Name', 's.City', 's.Graduation_Year', 'pr.Language', 'p.Placement_Status'],
+        'joins': {'pr': 'inner', 'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses'), ('language', 'skills', 'skills')],
+        'params': {'statuses': ['Ready'], 'skills': ['python', 'pytorch', 'llama']},
+    },
+    5: {
+        'title': "List 'Ready' students with strong coding skills (mini projects > 5) for coding tests.",
+        'columns': ['s.Student_ID', 's.Name', 'pr.Problems_Solved', 'pr.Mini_Projects', 'p.Placement_Status'],
+        'joins': {'pr': 'inner', 'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses'), ('pr.Mini_Projects', '>', 'min_projects')],
+        'params': {'statuses': ['Ready'], 'min_projects': 5},
+        'order_by': ['pr.Problems_Solved DESC'],
+    },
+    6: {
+        'title': "Identify 'Ready' students with high soft skills for techno-functional roles.",
+        'columns': ['s.Student_ID', 's.Name', 'ss.Avg_Soft_Skills', 'p.Placement_Status'],
+        'joins': {'ss': 'inner', 'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses')],
+        'params': {'statuses': ['Ready']},
+        'order_by': ['ss.Avg_Soft_Skills DESC'],
+    },
+    7: {
+        'title': "Find 'Ready' students with low soft skills (40-70) but high technical scores.",
+        'columns': ['s.Student_ID', 's.Name', 'ss.Avg_Soft_Skills',
+                    'COALESCE(pr.Problems_Solved,0) AS Problems_Solved', 'COALESCE(pr.Assessments_Completed,0) AS Assessments_Completed',
+                    'p.Placement_Status'],
+        'joins': {'ss': 'inner', 'pr': 'left', 'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses'), ('ss.Avg_Soft_Skills', 'between', ('min_soft', 'max_soft'))],
+        'params': {'statuses': ['Ready'], 'min_soft': 40, 'max_soft': 70},
+        'order_by': ['Problems_Solved DESC', 'Assessments_Completed DESC'],
+    },
+    8: {
+        'title': "Count 'Ready' students by city to target local companies.",
+        'columns': ['s.City', 'COUNT(*) AS Ready_Students_Count'],
+        'joins': {'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses')],
+        'params': {'statuses': ['Ready'], 'top_k': 1},
+        'group_by': ['s.City'],
+        'order_by': ['Ready_Students_Count DESC'],
+    },
+    9: {
+        'title': "List 2024-2025 graduates who are 'Ready,' ranked by mock interview scores.",
+        'columns': ['s.Name', 's.Student_ID', 's.City AS Location', 's.Graduation_Year', 'p.Placement_Status', 'p.Mock_Interview_Score'],
+        'joins': {'p': 'inner', 'pr': 'inner'},
+        'filters': [('s.Graduation_Year', 'in', 'years'), ('p.Placement_Status', 'in', 'statuses')],
+        'params': {'years': [2024, 2025], 'statuses': ['Ready']},
+        'order_by': ['p.Mock_Interview_Score DESC'],
+    },
+    10: {
+        'title': "Analyze success factors (scores, certifications, internships) for placed students.",
+        'columns': ['s.Student_ID', 's.Name', 'ss.Avg_Soft_Skills',
+                    'pr.Certifications_Earned', 'COALESCE(p.Internships_Completed,0) AS Internships_Completed',
+                    'COALESCE(p.Mock_Interview_Score,0) AS Mock_Interview_Score',
+                    'COALESCE(pr.Latest_Project_Score,0) AS Latest_Project_Score', 'p.Placement_Status'],
+        'joins': {'ss': 'inner', 'pr': 'left', 'p': 'inner'},
+        'filters': [('p.Placement_Status', 'in', 'statuses')],
+        'params': {'statuses': ['Ready', 'Placed']},
+    },
+}
+
+# The generated column insights 6, 7 and 10 read, and the same average computed inline when it is missing
+# (e.g. the notebook recreated the tables and derived_metrics.py hasn't been run again)
+AVG_SOFT_SKILLS_COLUMN = 'ss.Avg_Soft_Skills'
+AVG_SOFT_SKILLS_INLINE = "((" + " + ".join(f"ss.{col}" for col in SOFT_SKILL_COLUMNS) + ") / 6.0)"
+
+# ___________________________________________ #
+
+# Define function listing an insight's parameters with their defaults
+def insight_params(qid):  # {name: default}, spec parameters first, then the common ones
+    return {**INSIGHT_SPECS[qid]['params'], **{k: v for k, v in COMMON_PARAMS.items() if k not in INSIGHT_SPECS[qid]['params']}}
+
+
+# Define function coercing user input to the declared parameter types
+def coerce_param(name, value):  # Raises ValueError for input that doesn't fit the type
+    kind, label = PARAM_TYPES[name]
+    if kind in ('str_list', 'int_list'):
+        if isinstance(value, str):
+            value = [v for v in (part.strip() for part in value.split(',')) if v]
+        try:
+            return [int(v) for v in value] if kind == 'int_list' else [str(v) for v in value]
+        except (TypeError, ValueError):
+            raise ValueError(f"{label}: expected a comma-separated list of whole numbers")
+    try:
+        return int(value) if kind == 'int' else float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label}: expected a number")
+
+
+# Define function mapping join aliases onto the profile alias
+def _to_profile(expr):  # 's.Name' -> 'sp.Name', 'COALESCE(pr.X,0) AS X' -> 'COALESCE(sp.X,0) AS X'
+    return re.sub(r'\b(?:s|pr|ss|p)\.', 'sp.', expr)
+
+
+# Define function replacing the generated average with its inline expression
+def _inline_avg(expr):  # 'ss.Avg_Soft_Skills DESC' -> '((ss.Communication_Score + ...) / 6.0) DESC'
+    return expr.replace(AVG_SOFT_SKILLS_COLUMN, AVG_SOFT_SKILLS_INLINE)
+
+
+# Define function mapping one select-list entry without the generated average
+def _inline_avg_select(expr):  # Keeps the result column name: '(...) / 6.0) AS Avg_Soft_Skills'
+    return f"{AVG_SOFT_SKILLS_INLINE} AS Avg_Soft_Skills" if expr == AVG_SOFT_SKILLS_COLUMN else _inline_avg(expr)
+
+
+# Define function building one insight's SQL
+def build_insight(qid, values=None, profile=False, derived=True):  # Returns (sql, params); profile=True reads Student_Profile (student_profile.py)
+    # derived=False: Soft_Skills has no Avg_Soft_Skills column yet, so compute it from the six scores
+    spec = INSIGHT_SPECS[qid]
+    resolved = insight_params(qid)
+    for name, value in (values or {}).items():
+        if name in resolved:
+            resolved[name] = coerce_param(name, value)
+    col = _to_profile if profile else (lambda expr: expr) if derived else _inline_avg
+    student = 'sp.Student_ID' if profile else 's.Student_ID'
+
+    where, params = [], []
+    for column, op, param in spec['filters'] + [('s.City', 'in', 'cities')]:
+        if op == 'between':
+            low, high = resolved[param[0]], resolved[param[1]]
+            where.append(f"{col(column)} BETWEEN %s AND %s")
+            params += [low, high]
+            continue
+        value = resolved[param]
+        if value is None or value == []:  # Optional filter left empty
+            continue
+        if op in ('in', 'skills'):
+            placeholders = ", ".join(["%s"] * len(value))
+            if op == 'in':
+                where.append(f"{col(column)} IN ({placeholders})")
+            else:  # Skill tags: column holds the Student_Skills kind
+                where.append(f"EXISTS (SELECT 1 FROM Student_Skills k WHERE k.Student_ID = {student} "
+                             f"AND k.Kind = '{column}' AND k.Skill IN ({placeholders}))")
+                value = [v.lower() for v in value]
+            params += list(value)
+        else:
+            where.append(f"{col(column)} {op} %s")
+            params.append(value)
+
+    if profile:  # Has_* flags stand in for the inner joins
+        where += [f"sp.{PRESENCE_COLUMNS[alias]} = 1" for alias, kind in spec['joins'].items() if kind == 'inner']
+        sql = f"SELECT {', '.join(col(c) for c in spec['columns'])}\nFROM Student_Profile sp"
+    else:
+        select = (lambda expr: expr) if derived else _inline_avg_select
+        sql = f"SELECT {', '.join(select(c) for c in spec['columns'])}\nFROM Students s"
+        for alias, kind in spec['joins'].items():
+            sql += f"\n{'LEFT JOIN' if kind == 'left' else 'JOIN'} {JOIN_TABLES[alias]} {alias} ON s.Student_ID = {alias}.Student_ID"
+    if where:
+        sql += "\nWHERE " + " AND ".join(where)
+    if spec.get('group_by'):
+        sql += "\nGROUP BY " + ", ".join(col(c) for c in spec['group_by'])
+    if spec.get('order_by'):
+        sql += "\nORDER BY " + ", ".join(col(c) for c in spec['order_by'])
+    if resolved['top_k']:
+        sql += "\nLIMIT %s"
+        params.append(resolved['top_k'])
+    return sql, params
+
+
+# Define function listing an insight's sort as result columns
+def insight_order(qid):  # [(column, descending)] for the paged table: 'p.Mock_Interview_Score DESC' -> ('Mock_Interview_Score', True)
+    order = []
+    for expr in INSIGHT_SPECS[qid].get('order_by', []):
+        column, _, direction = expr.partition(' ')
+        order.append((column.split('.')[-1], direction.strip().upper() == 'DESC'))
+    return order
+
+
+# Define function building every insight with its default parameters
+def default_insights(profile=False, derived=True):  # {qid: (sql, params)}, e.g. for the EXPLAIN audit and benchmarks
+    return {qid: build_insight(qid, profile=profile, derived=derived) for qid in INSIGHT_SPECS}
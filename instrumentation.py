@@ -0,0 +1,208 @@
+# Timing spans for the portal's hot paths, exposed as Prometheus metrics, a JSON-lines log and a slow-query list
+# Stages: connect, execute, fetch, materialize (per query) and matching, render, export (per script run)
+
+# Import os for reading instrumentation settings from the environment
+import os
+# Import time for span timings and wall-clock timestamps
+import time
+# Import json for the structured log
+import json
+# Import hashlib for query fingerprints
+import hashlib
+# Import logging for the structured log
+import logging
+# Import threading for the metric lock and the per-thread query trace
+import threading
+# Import deque/defaultdict for the recent-query buffer and the metric tables
+from collections import deque, defaultdict
+# Import contextmanager for span() and query_trace()
+from contextlib import contextmanager
+# Import the HTTP server for the local /metrics endpoint
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# Import streamlit library as st for starting the endpoint once per process
+import streamlit as st
+
+# Import the SQL normalization shared with the result cache
+from query_cache import normalize_sql
+
+# ___________________________________________ #
+
+# Instrumentation settings (override with GUVI_METRICS_PORT / GUVI_METRICS_LOG before starting streamlit)
+METRICS_PORT = int(os.environ.get("GUVI_METRICS_PORT", "9464"))  # 127.0.0.1 only; 0 turns the endpoint off
+METRICS_LOG = os.environ.get("GUVI_METRICS_LOG")  # JSON-lines file; unset means no log
+ADMIN_PANEL = os.environ.get("GUVI_ADMIN_PANEL") == "1"  # Slow-query list with EXPLAIN in the portal
+
+# Recent queries kept for the admin panel
+QUERY_HISTORY = 500
+
+# Histogram buckets for span durations (seconds)
+SPAN_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Structured log: one JSON object per span and per query
+logger = logging.getLogger("guvi.metrics")
+logger.propagate = False
+if METRICS_LOG and not logger.handlers:
+    _handler = logging.FileHandler(METRICS_LOG)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# ___________________________________________ #
+
+# Define in-process metric registry (shared by script threads, query workers and the HTTP endpoint)
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = defaultdict(lambda: [0] * len(SPAN_BUCKETS))  # stage -> cumulative bucket counts
+        self.seconds = defaultdict(float)  # stage -> total seconds
+        self.spans = defaultdict(int)  # stage -> span count
+        self.rows = defaultdict(int)  # stage -> rows handled
+        self.bytes = defaultdict(int)  # stage -> bytes produced
+        self.queries = defaultdict(int)  # (backend, status) -> queries
+        self.recent = deque(maxlen=QUERY_HISTORY)  # Query records, newest last
+        self.collectors = {}  # name -> fn() returning {metric: number}, e.g. query_cache_stats
+
+    def observe(self, stage, seconds, rows=None, nbytes=None):
+        with self.lock:
+            counts = self.buckets[stage]
+            for i, bound in enumerate(SPAN_BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+            self.seconds[stage] += seconds
+            self.spans[stage] += 1
+            if rows is not None:
+                self.rows[stage] += rows
+            if nbytes is not None:
+                self.bytes[stage] += nbytes
+
+    def add_query(self, record):
+        with self.lock:
+            self.recent.append(record)
+            self.queries[(record['backend'], record['status'])] += 1
+
+    def exposition(self):  # Prometheus text format 0.0.4
+        with self.lock:
+            lines = ["# HELP guvi_stage_seconds Time spent per portal stage.", "# TYPE guvi_stage_seconds histogram"]
+            for stage, counts in sorted(self.buckets.items()):
+                for bound, count in zip(SPAN_BUCKETS, counts):
+                    lines.append(f'guvi_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'guvi_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {self.spans[stage]}')
+                lines.append(f'guvi_stage_seconds_sum{{stage="{stage}"}} {self.seconds[stage]:.6f}')
+                lines.append(f'guvi_stage_seconds_count{{stage="{stage}"}} {self.spans[stage]}')
+            lines += ["# HELP guvi_stage_rows_total Rows handled per stage.", "# TYPE guvi_stage_rows_total counter"]
+            lines += [f'guvi_stage_rows_total{{stage="{stage}"}} {n}' for stage, n in sorted(self.rows.items())]
+            lines += ["# HELP guvi_stage_bytes_total Bytes produced per stage.", "# TYPE guvi_stage_bytes_total counter"]
+            lines += [f'guvi_stage_bytes_total{{stage="{stage}"}} {n}' for stage, n in sorted(self.bytes.items())]
+            lines += ["# HELP guvi_queries_total Queries by backend and outcome.", "# TYPE guvi_queries_total counter"]
+            lines += [f'guvi_queries_total{{backend="{backend}",status="{status}"}} {n}'
+                      for (backend, status), n in sorted(self.queries.items())]
+            collectors = list(self.collectors.items())
+        for name, collect in collectors:  # Gauges from other modules (cache and executor counters)
+            try:
+                values = collect()
+            except Exception:  # A failing collector must not break the scrape
+                continue
+            for key, value in sorted(values.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"guvi_{name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+_local = threading.local()  # .trace: the query record being built on this thread
+
+# ___________________________________________ #
+
+# Define structured-log writer
+def log_event(event, **fields):
+    if logger.handlers:
+        logger.info(json.dumps({'ts': round(time.time(), 3), 'event': event, **fields}, default=str))
+
+
+# Define timing span: `with span('render', section=...) as info: ... info['rows'] = n`
+@contextmanager
+def span(stage, **fields):  # Inside query_trace() the duration is also added to that query's stage breakdown
+    info = dict(fields)
+    started = time.perf_counter()
+    try:
+        yield info
+    finally:
+        seconds = time.perf_counter() - started
+        metrics.observe(stage, seconds, info.get('rows'), info.get('bytes'))
+        trace = getattr(_local, 'trace', None)
+        if trace is not None:
+            trace['stages_ms'][stage] = trace['stages_ms'].get(stage, 0.0) + seconds * 1000
+            for key in ('rows', 'bytes'):
+                if key in info:
+                    trace[key] = info[key]
+        else:
+            log_event('span', stage=stage, ms=round(seconds * 1000, 3), **info)
+
+
+# Define function fingerprinting a query (same normalization as the result cache)
+def query_fingerprint(sql):
+    return hashlib.sha1(normalize_sql(sql).encode('utf-8')).hexdigest()[:12]
+
+
+# Define per-query trace: spans inside it are collected into one record for the slow-query list
+@contextmanager
+def query_trace(sql, params=None, backend='mysql', **fields):
+    trace = {'fingerprint': query_fingerprint(sql), 'sql': normalize_sql(sql), 'params': list(params or ()),
+             'backend': backend, 'ts': time.time(), 'stages_ms': {}, 'rows': None, 'bytes': None, **fields}
+    previous, _local.trace = getattr(_local, 'trace', None), trace
+    started = time.perf_counter()
+    status = 'error'
+    try:
+        yield trace
+        status = 'ok'
+    finally:
+        _local.trace = previous
+        trace['ms'] = (time.perf_counter() - started) * 1000
+        trace['status'] = trace.get('status', status)
+        metrics.add_query(trace)
+        log_event('query', **{k: v for k, v in trace.items() if k != 'params'})
+
+
+# Define function listing the slowest recent queries
+def slowest_queries(n=20, backend=None):
+    with metrics.lock:
+        recent = [r for r in metrics.recent if backend is None or r['backend'] == backend]
+    return sorted(recent, key=lambda r: r['ms'], reverse=True)[:n]
+
+
+# Define function registering a gauge collector for the /metrics endpoint
+def register_collector(name, collect):  # collect() -> {metric: number}; re-registering replaces it
+    with metrics.lock:
+        metrics.collectors[name] = collect
+
+# ___________________________________________ #
+
+# Define handler serving /metrics
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.exposition().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # Scrapes are not worth a stderr line each
+        pass
+
+
+# Define function starting the local endpoint (once per process)
+@st.cache_resource(show_spinner=False)
+def start_metrics_server(port=METRICS_PORT):  # Returns the server, or None when disabled or the port is taken
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+    except OSError as e:  # e.g. a second portal process on the same host
+        log_event('metrics_server_failed', port=port, error=str(e))
+        return None
+    threading.Thread(target=server.serve_forever, name="guvi-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,26 @@
+# Import re for building one combined keyword pattern
+import re
+# Import pandas library for vectorized string operations
+import pandas as pd
+
+# ___________________________________________ #
+
+# Define function to find result columns whose values contain any of the keywords
+def find_matching_columns(result, keywords, exclude=()):  # Vectorized replacement for the per-cell any(... str(value).lower()) loops
+    keywords = [k for k in keywords if k]
+    if result.empty or not keywords:
+        return set()
+    # One alternation over all keywords, so every column is scanned once instead of once per keyword
+    pattern = "|".join(re.escape(k.lower()) for k in keywords)
+    matching = set()
+    for col, series in result.items():
+        if col in exclude:
+            continue
+        # Distinct non-null values only: repeated cities/statuses/scores are checked once
+        values = pd.Series(series.dropna().unique())
+        if values.empty:
+            continue
+        lowered = values.astype(str).str.lower()  # Lower-cased string view built once per column
+        if lowered.str.contains(pattern, regex=True).any():
+            matching.add(col.split('.')[-1])  # Column name without alias
+    return matching
@@ -0,0 +1,156 @@
+# Secondary indexes for the portal's access patterns, plus an EXPLAIN audit of the canned queries
+# Usage: python migrations.py migrate [--dry-run]
+#        python migrations.py explain-audit [--strict]
+
+# Import argparse for the command-line options
+import argparse
+# Import sys for the audit's exit status
+import sys
+
+# Import shared command-line connection helpers
+from cli_common import add_db_arguments, db_config_from_args, connect
+# Import the derived-metrics layer (insights 6, 7 and 10 depend on Avg_Soft_Skills)
+from derived_metrics import apply_derived_metrics, index_exists, column_exists
+# Import the skill-tag table (insight 4 and skill keywords in search depend on it)
+from skill_tags import sync_student_skills
+# Import the denormalized profile table read by search, Custom View and the insights
+from student_profile import apply_student_profile, PROFILE_TABLE
+# Import the canned insight SQL to audit
+from insights import default_insights
+# Import the search-box parser and the static catalog its fields resolve against (typed searches are audited too)
+from search_query import parse_search
+from schema_catalog import FALLBACK_CATALOG
+
+# ___________________________________________ #
+
+# (table, index name, columns, access pattern it serves)
+SECONDARY_INDEXES = [
+    ('Placements', 'idx_placements_status_mock', '(Placement_Status, Mock_Interview_Score, Internships_Completed)',
+     "Every insight filters on Placement_Status; 1/3/9 also read or sort by Mock_Interview_Score (covering for 1)"),
+    ('Students', 'idx_students_grad_year_city', '(Graduation_Year, City)',
+     "Insight 9 filters Graduation_Year IN (...)"),
+    ('Students', 'idx_students_city', '(City)',
+     "Insight 8 groups Ready students by City"),
+    ('Programming', 'idx_programming_student_scores',
+     '(Student_ID, Mini_Projects, Problems_Solved, Assessments_Completed, Latest_Project_Score)',
+     "Covering lookup by Student_ID for insights 3, 5 and 7 and the search/Custom View joins"),
+    ('Programming', 'idx_programming_mini_projects', '(Mini_Projects, Problems_Solved)',
+     "Insight 5 filters Mini_Projects > N and sorts by Problems_Solved"),
+    ('Soft_Skills', 'idx_soft_skills_student_avg', '(Student_ID, Avg_Soft_Skills)',
+     "Covering lookup by Student_ID for insight 10 and the search/Custom View joins"),
+]
+
+# Typed search-box inputs whose predicates must use an index (search_query.py)
+AUDIT_SEARCHES = ["ready, mock>=80", "city:chennai, grad:2024..2025", "status:placed, package>=600000"]
+
+# Representative non-insight queries from the search box and Custom View
+AUDIT_QUERIES = {
+    'search (matched IDs)': """
+    SELECT s.*, pr.*, ss.*, p.*
+    FROM Students s
+    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+    LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+    LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
+    WHERE s.Student_ID IN ('G25AIML_001', 'G25AIML_002', 'G25AIML_003')
+    """,
+    'custom view (first page)': """
+    SELECT s.Student_ID, s.Name, p.Placement_Status, pr.Problems_Solved, ss.Avg_Soft_Skills
+    FROM Students s
+    JOIN Placements p ON s.Student_ID = p.Student_ID
+    JOIN Programming pr ON s.Student_ID = pr.Student_ID
+    JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+    ORDER BY s.Student_ID
+    LIMIT 10
+    """,
+}
+
+# ___________________________________________ #
+
+# Define function creating any missing secondary indexes
+def migrate(conn, dry_run=False):  # Safe to run repeatedly; returns the DDL it ran (or would run)
+    if not dry_run:
+        apply_derived_metrics(conn)
+        sync_student_skills(conn)
+        apply_student_profile(conn)
+    cursor = conn.cursor()
+    statements = []
+    for table, index, columns, purpose in SECONDARY_INDEXES:
+        if index_exists(cursor, table, index):
+            continue
+        ddl = f"CREATE INDEX {index} ON {table} {columns}"
+        statements.append(ddl)
+        print(f"{'Would run' if dry_run else 'Running'}: {ddl}  -- {purpose}")
+        if not dry_run:
+            cursor.execute(ddl)
+    cursor.close()
+    if not statements:
+        print("All secondary indexes already present.")
+    return statements
+
+
+# Define function running EXPLAIN on one query and flagging scans
+def explain_query(cursor, sql, params=None):  # Returns (plan rows as dicts, list of warnings)
+    cursor.execute("EXPLAIN " + sql.strip().rstrip(';'), params or ())
+    columns = [desc[0] for desc in cursor.description]
+    plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    warnings = []
+    for step in plan:
+        table = step.get('table')
+        extra = str(step.get('Extra') or '')
+        if step.get('type') == 'ALL':
+            warnings.append(f"full scan of {table} (~{step.get('rows')} rows)")
+        if 'Using filesort' in extra:
+            warnings.append(f"filesort on {table}")
+        if 'Using temporary' in extra:
+            warnings.append(f"temporary table for {table}")
+    return plan, warnings
+
+
+# Define function auditing all canned and representative queries
+def explain_audit(conn):  # Prints one line per query; returns {query name: warnings}
+    cursor = conn.cursor()
+    queries = {f"insight {qid}": query for qid, query in default_insights().items()}
+    queries.update({name: (sql, None) for name, sql in AUDIT_QUERIES.items()})
+    for criteria in AUDIT_SEARCHES:
+        where, params = parse_search(criteria, FALLBACK_CATALOG).where()
+        queries[f"search '{criteria}'"] = (f"SELECT s.Student_ID FROM Students s JOIN Placements p ON s.Student_ID = p.Student_ID WHERE {where}", params)
+    if column_exists(cursor, PROFILE_TABLE, 'Student_ID'):  # The portal reads these instead once the profile exists
+        queries.update({f"profile insight {qid}": query for qid, query in default_insights(profile=True).items()})
+    findings = {}
+    for name, (sql, params) in queries.items():
+        plan, warnings = explain_query(cursor, sql, params)
+        findings[name] = warnings
+        steps = ", ".join(f"{step.get('table')}:{step.get('type')}/{step.get('key') or '-'}" for step in plan)
+        status = "FLAG" if warnings else "ok"
+        print(f"[{status:4}] {name:28} {steps}")
+        for warning in warnings:
+            print(f"         - {warning}")
+    cursor.close()
+    return findings
+
+# ___________________________________________ #
+
+def main():
+    parser = argparse.ArgumentParser(description='Portal index migrations and EXPLAIN audit')
+    add_db_arguments(parser)
+    sub = parser.add_subparsers(dest='command', required=True)
+    migrate_cmd = sub.add_parser('migrate', help='Create missing secondary indexes')
+    migrate_cmd.add_argument('--dry-run', action='store_true', help='Print the DDL without running it')
+    audit_cmd = sub.add_parser('explain-audit', help='EXPLAIN each canned query and flag full scans/filesorts')
+    audit_cmd.add_argument('--strict', action='store_true', help='Exit with status 1 if anything is flagged')
+    args = parser.parse_args()
+
+    conn = connect(db_config_from_args(args))
+    try:
+        if args.command == 'migrate':
+            migrate(conn, dry_run=args.dry_run)
+        else:
+            findings = explain_audit(conn)
+            if args.strict and any(findings.values()):
+                sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+# Embedded offline engine: synthetic sample data in an in-memory SQLite database
+# Runs the portal's search and the canned insight SQL without a MySQL server (demos, UI load tests)
+
+# Import sqlite3 for the embedded database (standard library, no extra dependency)
+import sqlite3
+# Import threading to serialize access to the shared connection
+import threading
+# Import datetime to store placement dates as ISO text
+import datetime
+# Import pandas for result frames
+import pandas as pd
+
+# Import the sample-data generator (re-exported for the portal)
+from datagen import generate_sample_data
+# Import the inverted index shared with the live search
+from search_index import InvertedIndex, SEARCH_RESULT_LIMIT, index_columns
+# Import the search-box query language
+from search_query import parse_search, order_by_rank
+# Import the static schema catalog (same columns the live catalog reports)
+from schema_catalog import FALLBACK_CATALOG
+# Import the skill-tag parser so insight 4 sees the same Student_Skills rows as MySQL
+from skill_tags import skill_rows
+# Import the typed tuple-to-DataFrame step shared with live queries, and per-query traces
+from query_executor import materialize
+from instrumentation import query_trace, span
+
+# ___________________________________________ #
+
+# SQLite DDL mirroring the MySQL tables; NOCASE text matches MySQL's case-insensitive default collation
+SQLITE_DDL = """
+CREATE TABLE Students (
+    Student_ID TEXT COLLATE NOCASE PRIMARY KEY, Name TEXT COLLATE NOCASE, Age INTEGER,
+    Gender TEXT COLLATE NOCASE, Email TEXT COLLATE NOCASE, Phone TEXT COLLATE NOCASE,
+    Enrollment_Year TEXT COLLATE NOCASE, Course_Batch TEXT COLLATE NOCASE, City TEXT COLLATE NOCASE,
+    Graduation_Year INTEGER
+);
+CREATE TABLE Programming (
+    Programming_ID TEXT COLLATE NOCASE PRIMARY KEY, Student_ID TEXT COLLATE NOCASE, Language TEXT COLLATE NOCASE,
+    Problems_Solved INTEGER, Assessments_Completed INTEGER, Mini_Projects INTEGER,
+    Certifications_Earned TEXT COLLATE NOCASE, Latest_Project_Score INTEGER
+);
+CREATE TABLE Soft_Skills (
+    Soft_Skills_ID TEXT COLLATE NOCASE PRIMARY KEY, Student_ID TEXT COLLATE NOCASE,
+    Communication_Score INTEGER, Teamwork_Score INTEGER, Presentation_Score INTEGER,
+    Leadership_Score INTEGER, Critical_Thinking INTEGER, Interpersonal_Skills INTEGER,
+    Avg_Soft_Skills REAL GENERATED ALWAYS AS ((Communication_Score + Teamwork_Score + Presentation_Score +
+        Leadership_Score + Critical_Thinking + Interpersonal_Skills) / 6.0) STORED
+);
+CREATE TABLE Placements (
+    Student_ID TEXT COLLATE NOCASE PRIMARY KEY, Mock_Interview_Score INTEGER, Internships_Completed INTEGER,
+    Company_Name TEXT COLLATE NOCASE, Placement_Package INTEGER, Interview_Rounds_Cleared INTEGER,
+    Placement_Date TEXT, Placement_Status TEXT COLLATE NOCASE
+);
+CREATE TABLE Student_Skills (
+    Student_ID TEXT COLLATE NOCASE NOT NULL, Skill TEXT COLLATE NOCASE NOT NULL, Kind TEXT COLLATE NOCASE NOT NULL,
+    PRIMARY KEY (Skill, Kind, Student_ID)
+);
+CREATE INDEX idx_programming_student ON Programming (Student_ID);
+CREATE INDEX idx_soft_skills_student ON Soft_Skills (Student_ID);
+CREATE INDEX idx_placements_status_mock ON Placements (Placement_Status, Mock_Interview_Score);
+CREATE INDEX idx_soft_skills_avg ON Soft_Skills (Avg_Soft_Skills);
+CREATE INDEX idx_student_skills_student ON Student_Skills (Student_ID, Kind, Skill);
+"""
+
+# ___________________________________________ #
+
+# Define the engine: one in-memory SQLite database plus an inverted index over the same rows
+class OfflineEngine:
+
+    def __init__(self, df_students, df_programming, df_soft_skills, df_placements, build_index=True):
+        self.frames = (df_students, df_programming, df_soft_skills, df_placements)
+        self.lock = threading.Lock()  # Download buttons run on another thread
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.executescript(SQLITE_DDL)
+        for table, df in zip(('Students', 'Programming', 'Soft_Skills', 'Placements'), self.frames):
+            self._insert(table, df)
+        self._insert_rows('Student_Skills', ['Student_ID', 'Skill', 'Kind'],
+                          skill_rows(df_programming[['Student_ID', 'Language', 'Certifications_Earned']].itertuples(index=False, name=None)))
+        self.conn.commit()
+        self.index = InvertedIndex()
+        self._skills = None
+        if build_index:  # Benchmarks that only run SQL skip the search index
+            self.index.sync(self._joined_rows())
+
+    def _insert(self, table, df):
+        clean = df.astype(object).where(df.notna(), None)
+        for col in clean.columns:  # SQLite stores dates as ISO text, like MySQL renders them
+            first = clean[col].dropna().head(1)
+            if len(first) and isinstance(first.iloc[0], datetime.date):
+                clean[col] = clean[col].map(lambda d: d.isoformat() if d is not None else None)
+        self._insert_rows(table, list(clean.columns), clean.itertuples(index=False, name=None))
+
+    def _insert_rows(self, table, columns, rows):
+        placeholders = ", ".join(["?"] * len(columns))
+        self.conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                              [tuple(v.item() if hasattr(v, 'item') else v for v in row) for row in rows])
+
+    def _select_all_sql(self, select_cols=None):  # Same SELECT list and joins as the live search
+        select_cols = select_cols or ['s.Student_ID'] + [
+            f'{alias}.{col}' for alias, cols in FALLBACK_CATALOG.columns_by_alias().items() for col in cols if col != 'Student_ID'
+        ]
+        return f"""
+        SELECT {', '.join(select_cols)}
+        FROM Students s
+        LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+        LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+        LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
+        """
+
+    def _joined_rows(self):  # {Student_ID: text columns} for the inverted index, as fetch_index_rows() reads them
+        with self.lock:
+            return {row[0]: row for row in self.conn.execute(self._select_all_sql(index_columns(FALLBACK_CATALOG)))}
+
+    def query(self, sql, params=None):  # Run MySQL-dialect SQL from the portal; returns a typed DataFrame
+        sql = sql.strip().rstrip(';')
+        if params:
+            sql = sql.replace('%s', '?')  # MySQL connector placeholders -> SQLite placeholders
+        with query_trace(sql, params, backend='sqlite'):
+            with self.lock:
+                with span('execute'):
+                    cursor = self.conn.execute(sql, list(params or []))
+                columns = [desc[0] for desc in cursor.description]
+                with span('fetch') as info:
+                    rows = cursor.fetchall()
+                    info['rows'] = len(rows)
+            return materialize(rows, columns)
+
+    def known_skills(self):  # Lower-cased skills in Student_Skills (search routes these terms to the skill tags)
+        if self._skills is None:
+            with self.lock:
+                self._skills = frozenset(row[0] for row in self.conn.execute("SELECT DISTINCT Skill FROM Student_Skills"))
+        return self._skills
+
+    def search_query(self, search_criteria):  # (sql, params, ranked ids) as the live search builds them; sql is None when nothing can match
+        plan = parse_search(search_criteria, FALLBACK_CATALOG, self.known_skills())  # Raises ValueError for malformed terms
+        ids = self.index.search(plan.text, limit=SEARCH_RESULT_LIMIT) if plan.text else None
+        if ids == []:
+            return None, [], ids
+        where, params = plan.where(ids)
+        sql = self._select_all_sql() + f" WHERE {where}"
+        if ids is None:  # Filters (or column names) only: bounded like the index path
+            sql += f" ORDER BY s.Student_ID LIMIT {SEARCH_RESULT_LIMIT}"
+        return sql, params, ids
+
+    def search(self, search_criteria):  # Same semantics as the live search: typed predicates plus ranked free-text matches
+        sql, params, ids = self.search_query(search_criteria)
+        if sql is None:
+            return pd.DataFrame()
+        return order_by_rank(self.query(sql, params or None), ids)
+
+# ___________________________________________ #
+
+# Engines keyed by the identity of the frames they were built from (the frames are kept alive with them)
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+# Define function returning the engine for a set of sample frames
+def engine_for(df_students, df_programming, df_soft_skills, df_placements):
+    key = (id(df_students), id(df_programming), id(df_soft_skills), id(df_placements))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = OfflineEngine(df_students, df_programming, df_soft_skills, df_placements)
+            _engines[key] = engine
+    return engine
+
+
+# Define the offline search used by the portal when MySQL isn't available
+def search_sample_data(search_criteria, df_students, df_programming, df_soft_skills, df_placements):
+    return engine_for(df_students, df_programming, df_soft_skills, df_placements).search(search_criteria)
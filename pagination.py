@@ -0,0 +1,105 @@
+# Import hashlib for fingerprinting paged queries
+import hashlib
+# Import pandas library for NA checks on cursor values
+import pandas as pd
+
+# ___________________________________________ #
+
+# Tie-break column that makes (sort key, Student_ID) unique for keyset pagination
+TIE_BREAK_COLUMN = 'Student_ID'
+
+# ___________________________________________ #
+
+# Define function to wrap a result query so it can be counted, sorted and paged server-side
+def make_paged_query(sql, params=None, cached=False, order=None):  # Returns the spec stored in session state instead of the full result
+    # order: the base query's own sort as [(result column, descending)]; the derived table's ORDER BY isn't kept by the outer query
+    base = sql.strip().rstrip(';').strip()  # Canned insights end with ';', which can't sit inside a derived table
+    params = list(params or [])
+    fingerprint = hashlib.sha1(repr((base, params)).encode()).hexdigest()
+    return {'sql': base, 'params': params, 'fingerprint': fingerprint, 'columns': None, 'total': None, 'cached': cached,
+            'order': [(column, bool(desc)) for column, desc in (order or [])]}
+
+
+# Define function to quote a result column name for use in ORDER BY / WHERE
+def quote_column(name):  # Backtick-quote, doubling any embedded backticks
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+# Define function building the COUNT(*) for a paged query
+def count_sql(paged):  # Returns (sql, params)
+    return f"SELECT COUNT(*) AS n FROM ({paged['sql']}) AS q", list(paged['params'])
+
+
+# Define function listing the sort keys for a sort choice
+def sort_keys(paged, sort_column, descending):  # [(column, descending)]: the chosen column, else the query's own order, then Student_ID
+    if sort_column:
+        keys = [(sort_column, descending)]
+    else:  # No column picked: keep the ranking the query was written with (e.g. insights ordered by score)
+        keys = [(column, desc) for column, desc in paged.get('order') or [] if column in (paged.get('columns') or [column])]
+        descending = False if keys else descending  # Ties in the ranking: lowest Student_ID first
+    if has_tie_break(paged) and TIE_BREAK_COLUMN not in [column for column, _ in keys]:
+        keys.append((TIE_BREAK_COLUMN, descending))
+    return keys
+
+
+# Define function building the ORDER BY clause for a sort choice
+def order_by(paged, sort_column, descending):  # Sorted on the chosen column (or the query's order), then Student_ID when present
+    keys = [f"q.{quote_column(column)} {'DESC' if desc else 'ASC'}" for column, desc in sort_keys(paged, sort_column, descending)]
+    return f"ORDER BY {', '.join(keys)}" if keys else ""
+
+
+# Define function building the full sorted query (used for exports)
+def sorted_sql(paged, sort_column, descending):  # Returns (sql, params)
+    return f"SELECT * FROM ({paged['sql']}) AS q {order_by(paged, sort_column, descending)}", list(paged['params'])
+
+
+# Define function telling whether keyset pagination is possible for this result
+def has_tie_break(paged):  # Needs a Student_ID column to make the ordering total
+    return TIE_BREAK_COLUMN in (paged.get('columns') or [])
+
+
+# Define function building the SQL for one page
+def page_sql(paged, sort_column, descending, cursor, page_size):  # Returns (sql, params)
+    params = list(paged['params'])
+    where = ""
+    offset = 0
+    after = cursor.get('after') if cursor else None
+    keys = sort_keys(paged, sort_column, descending)
+    if after is not None and len(after) == len(keys):  # Keyset: continue strictly after the last row of the previous page
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..., with < for descending keys
+        terms = []
+        for i, (column, desc) in enumerate(keys):
+            key = f"q.{quote_column(column)}"
+            term = [f"q.{quote_column(prev)} = %s" for prev, _ in keys[:i]]
+            params += list(after[:i])
+            # MySQL sorts NULLs last in DESC order, so they still lie ahead of a non-NULL key
+            term.append(f"({key} < %s OR {key} IS NULL)" if desc and column != TIE_BREAK_COLUMN else f"{key} {'<' if desc else '>'} %s")
+            params.append(after[i])
+            terms.append(" AND ".join(term))
+        where = "WHERE " + " OR ".join(f"({term})" for term in terms)
+    elif cursor:  # No usable key (first page, NULL sort value, or no Student_ID column): fall back to OFFSET
+        offset = int(cursor.get('offset', 0))
+    sql = f"SELECT * FROM ({paged['sql']}) AS q {where} {order_by(paged, sort_column, descending)} LIMIT {int(page_size)}"
+    if offset:
+        sql += f" OFFSET {offset}"
+    return sql, params
+
+
+# Define function converting numpy/pandas scalars to values the MySQL driver accepts
+def _to_param(value):
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if hasattr(value, 'item') else value
+
+
+# Define function computing the cursor for the page after page_df
+def next_cursor(paged, page_df, sort_column, cursor, descending=False):  # {'offset': rows before next page, 'after': key values or None}
+    offset = int(cursor.get('offset', 0)) + len(page_df)
+    after = None
+    if has_tie_break(paged) and not page_df.empty:
+        last = page_df.iloc[-1]
+        values = tuple(last[column] for column, _ in sort_keys(paged, sort_column, descending))
+        # NULL keys can't be compared, so those pages continue by OFFSET instead
+        if not any(v is None or (not isinstance(v, str) and pd.isna(v)) or v == '' for v in values):
+            after = tuple(_to_param(v) for v in values)
+    return {'offset': offset, 'after': after}
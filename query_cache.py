@@ -0,0 +1,127 @@
+# Import os for reading cache limits from the environment
+import os
+# Import re for normalizing SQL text
+import re
+# Import threading to guard the shared cache across sessions
+import threading
+# Import OrderedDict for LRU ordering
+from collections import OrderedDict
+# Import streamlit library as st for the process-wide resource cache
+import streamlit as st
+
+# Import the config key used to share pools/caches per database
+from db_pool import config_key
+# Import the throttled data-version probe used for invalidation
+from data_version import current_data_version
+
+# ___________________________________________ #
+
+# Cache limits (override before starting streamlit)
+QUERY_CACHE_MAX_ENTRIES = int(os.environ.get("GUVI_QUERY_CACHE_ENTRIES", "256"))
+QUERY_CACHE_MAX_BYTES = int(os.environ.get("GUVI_QUERY_CACHE_MB", "256")) * 1024 * 1024
+
+# ___________________________________________ #
+
+# Define function to normalize SQL so formatting differences share one entry
+def normalize_sql(sql):  # Collapse whitespace and drop the trailing ';'
+    return re.sub(r"\s+", " ", sql).strip().rstrip(';').strip()
+
+
+# Define the shared LRU result cache, bounded by entry count and total bytes
+class QueryResultCache:
+
+    def __init__(self, max_entries=QUERY_CACHE_MAX_ENTRIES, max_bytes=QUERY_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (DataFrame, size in bytes); oldest first
+        self.versions = {}  # db key -> data version the cached entries belong to
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def _drop(self, key):
+        _, size = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def check_version(self, db_key, version):  # Drop this database's entries when its data version moved
+        with self.lock:
+            if self.versions.get(db_key) == version:
+                return
+            for key in [k for k in self.entries if k[0] == db_key]:
+                self._drop(key)
+            self.versions[db_key] = version
+            self.invalidations += 1
+
+    def get(self, key):  # Cached DataFrame or None; refreshes LRU position on hit
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df, version=None):  # Store a result, evicting least recently used entries past the limits
+        # version: data version seen before the query ran; a load landing meanwhile makes the result unsafe to keep
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return  # Larger than the whole budget: don't cache
+        with self.lock:
+            if version is not None and self.versions.get(key[0]) != version:
+                return  # Another session already saw the new version: this may be the pre-load result
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (df, size)
+            self.total_bytes += size
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.versions.clear()
+            self.total_bytes = 0
+
+    def stats(self):  # Counters for monitoring
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+# ___________________________________________ #
+
+# Define accessor for the single process-wide cache
+@st.cache_resource(show_spinner=False)
+def get_query_cache():  # Shared by every Streamlit session
+    return QueryResultCache()
+
+
+# Define read-through helper: return a cached result or run the query and cache it
+def cached_query(db_config, sql, params, run):  # run() executes the query and returns a DataFrame
+    cache = get_query_cache()
+    db_key = config_key(db_config)
+    version = current_data_version(db_config)
+    cache.check_version(db_key, version)  # New batch loaded -> old results dropped
+    key = (db_key, normalize_sql(sql), tuple(params or ()))
+    df = cache.get(key)
+    if df is None:
+        df = run()
+        cache.put(key, df, version)  # Skipped if the version moved while run() was reading
+    return df
+
+
+# Define function exposing cache counters for monitoring
+def query_cache_stats():
+    return get_query_cache().stats()
@@ -0,0 +1,298 @@
+# Background query executor: portal queries run as jobs on a shared thread pool instead of inside the script run
+# Jobs have IDs, can be polled and cancelled (KILL QUERY), and are bounded per session and by a timeout
+
+# Import os for reading executor settings from the environment
+import os
+# Import time for job timings and deadlines
+import time
+# Import uuid for job IDs
+import uuid
+# Import threading for the job-table lock and completion events
+import threading
+# Import deque/defaultdict/OrderedDict for per-session queues and the job table
+from collections import deque, defaultdict, OrderedDict
+# Import ThreadPoolExecutor for the shared workers
+from concurrent.futures import ThreadPoolExecutor
+# Import streamlit library as st for the process-wide resource cache
+import streamlit as st
+# Import pandas for reading results
+import pandas as pd
+
+# Import pooled connections and the pool size the workers are matched to
+from db_pool import get_connection, set_session_variable, DEFAULT_POOL_SIZE
+# Import compact dtype mapping for result frames
+from typed_frames import apply_schema_dtypes
+# Import batched reads through the per-connection prepared-statement cache
+from data_access import read_batched
+# Import per-query traces and stage spans
+from instrumentation import query_trace, span
+
+# Attempt to import mysql.connector for the KILL QUERY side channel
+try:
+    import mysql.connector
+    from mysql.connector import Error
+    # Set HAS_MYSQL to True if import succeeds
+    HAS_MYSQL = True
+# Handle ModuleNotFoundError if mysql-connector-python is not installed
+except ModuleNotFoundError:
+    HAS_MYSQL = False
+    Error = Exception
+
+# ___________________________________________ #
+
+# Executor settings (override with GUVI_QUERY_WORKERS / GUVI_QUERY_JOBS_PER_USER / GUVI_QUERY_TIMEOUT)
+QUERY_WORKERS = int(os.environ.get("GUVI_QUERY_WORKERS", str(DEFAULT_POOL_SIZE)))  # One pooled connection per running job
+QUERY_JOBS_PER_USER = int(os.environ.get("GUVI_QUERY_JOBS_PER_USER", "3"))  # Running jobs per session; the rest wait in its queue
+QUERY_TIMEOUT = float(os.environ.get("GUVI_QUERY_TIMEOUT", "60"))  # Seconds before a job is killed
+QUERY_PROGRESS_DELAY = 0.5  # Seconds a query may take before the portal draws its progress line and Cancel button
+
+# Finished jobs kept for polling and the admin view
+JOB_HISTORY = 200
+
+# Seconds a finished job waits for an in-flight KILL QUERY before its connection goes back to the pool
+KILL_WAIT_SECONDS = 15
+
+# MySQL error raised when a statement exceeds MAX_EXECUTION_TIME
+ER_QUERY_TIMEOUT = 3024
+
+# ___________________________________________ #
+
+# Define base error for jobs that did not produce a result
+class QueryJobError(Exception):
+    pass
+
+
+# Define error for jobs stopped by the user (or by an interrupted script run)
+class QueryCancelledError(QueryJobError):
+    pass
+
+
+# Define error for jobs that ran past their timeout
+class QueryTimeoutError(QueryJobError):
+    pass
+
+
+# Define one submitted query
+class QueryJob:
+    def __init__(self, owner, sql, params, timeout):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.owner = owner  # Streamlit session ID
+        self.sql = sql
+        self.params = params
+        self.timeout = timeout
+        self.status = 'queued'  # queued -> running -> done | failed | cancelled | timed_out
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.connection_id = None  # MySQL thread ID while running (target of KILL QUERY)
+        self.kill_done = None  # Event set once the KILL QUERY sent by cancel() has returned
+        self.db_config = None
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def elapsed(self):  # Seconds since submission (or total, once finished)
+        return (self.finished or time.monotonic()) - self.submitted
+
+    def overdue(self):
+        return self.started is not None and time.monotonic() - self.started > self.timeout
+
+# ___________________________________________ #
+
+# Define default job body: read the query into a typed DataFrame, one span per stage
+def read_frame(conn, sql, params):  # Prepared once per pooled connection, fetched in FETCH_BATCH_ROWS batches (data_access.py)
+    return read_batched(conn, sql, params)
+
+
+# Define tuple-to-DataFrame step shared with the offline engine
+def materialize(rows, columns):
+    with span('materialize') as info:
+        df = apply_schema_dtypes(pd.DataFrame.from_records(rows, columns=columns, coerce_float=True))  # coerce_float: DECIMAL -> float, as pd.read_sql did
+        info['rows'], info['bytes'] = len(df), int(df.memory_usage(deep=True).sum())
+    return df
+
+
+# Define KILL QUERY on a separate, unpooled connection (the pool may be fully checked out by the jobs)
+def kill_query(db_config, connection_id):
+    if not HAS_MYSQL:
+        return
+    try:
+        conn = mysql.connector.connect(**db_config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"KILL QUERY {int(connection_id)}")
+            cursor.close()
+        finally:
+            conn.close()
+    except Error:  # Statement already finished, or no PROCESS privilege: the timeout still bounds it
+        pass
+
+
+# Define the executor shared by every session
+class QueryExecutor:
+    def __init__(self, max_workers=QUERY_WORKERS, per_user=QUERY_JOBS_PER_USER, timeout=QUERY_TIMEOUT):
+        self.per_user = max(1, per_user)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="guvi-query")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # job_id -> QueryJob, oldest first
+        self._pending = defaultdict(deque)  # owner -> jobs waiting for a free per-session slot
+        self._running = defaultdict(int)  # owner -> jobs handed to the pool
+
+    # Submit a query; returns the job ID immediately
+    def submit(self, owner, db_config, sql, params=None, timeout=None, run=read_frame):  # run(conn, sql, params) -> DataFrame
+        job = QueryJob(owner, sql, params, timeout or self.timeout)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._pending[owner].append((job, db_config, run))
+            self._dispatch(owner)
+            self._prune()
+        return job.job_id
+
+    def _dispatch(self, owner):  # Lock held: hand queued jobs to the pool while the session is under its limit
+        queue = self._pending[owner]
+        while queue and self._running[owner] < self.per_user:
+            job, db_config, run = queue.popleft()
+            self._running[owner] += 1
+            self._pool.submit(self._run_job, job, db_config, run)
+
+    def _prune(self):  # Lock held: forget the oldest finished jobs past the history limit
+        finished = [job_id for job_id, job in self._jobs.items() if job.done.is_set()]
+        for job_id in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self._jobs[job_id]
+
+    def _run_job(self, job, db_config, run):
+        try:
+            with query_trace(job.sql, job.params, job_id=job.job_id, queued_ms=(time.monotonic() - job.submitted) * 1000) as trace:
+                with span('connect'):
+                    conn = get_connection(db_config)
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT CONNECTION_ID()")
+                    connection_id = cursor.fetchone()[0]
+                    cursor.close()
+                    try:  # Server-side bound for SELECTs (MySQL 5.7.8+); reset to the default when the connection is returned (db_pool.py)
+                        set_session_variable(conn, 'MAX_EXECUTION_TIME', int(job.timeout * 1000))
+                    except Error:
+                        pass
+                    with self._lock:
+                        if job.status != 'queued':  # Cancelled before it started
+                            trace['status'] = job.status
+                            return
+                        job.status, job.started = 'running', time.monotonic()
+                        job.connection_id, job.db_config = connection_id, db_config
+                    try:
+                        result = run(conn, job.sql, job.params)
+                    except Exception:
+                        trace['status'] = job.status if job.status != 'running' else 'error'  # cancelled / timed_out
+                        raise
+                finally:
+                    with self._lock:  # From here on cancel() sends no KILL QUERY to this connection
+                        job.connection_id, kill_done = None, job.kill_done
+                    if kill_done is not None:  # A kill already in flight must land before another session gets the connection
+                        kill_done.wait(KILL_WAIT_SECONDS)
+                    conn.close()  # Back to the pool
+            with self._lock:
+                if job.status == 'running':
+                    job.status, job.result = 'done', result
+        except Exception as e:
+            with self._lock:
+                job.error = e
+                if getattr(e, 'errno', None) == ER_QUERY_TIMEOUT:
+                    job.status = 'timed_out'
+                elif job.status in ('queued', 'running'):
+                    job.status = 'failed'
+        finally:
+            with self._lock:
+                job.connection_id = None
+                job.finished = time.monotonic()
+                job.done.set()
+                self._running[job.owner] -= 1
+                self._dispatch(job.owner)
+
+    # Cancel a job: drop it from the queue, or KILL QUERY its running statement
+    def cancel(self, job_id, status='cancelled'):  # Returns True when the job was still active
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done.is_set() or job.status not in ('queued', 'running'):
+                return False
+            if job.status == 'queued':
+                queue = self._pending[job.owner]
+                for entry in list(queue):
+                    if entry[0] is job:  # Not handed to the pool yet: finish it here
+                        queue.remove(entry)
+                        job.finished = time.monotonic()
+                        job.done.set()
+                        break
+            job.status = status
+            connection_id, db_config = job.connection_id, job.db_config
+            if connection_id is not None:  # Still on its connection: _run_job holds the connection until the kill returns
+                job.kill_done = threading.Event()
+        if connection_id is not None:
+            try:
+                kill_query(db_config, connection_id)
+            finally:
+                job.kill_done.set()
+        return True
+
+    # Poll a job, enforcing its timeout
+    def poll(self, job_id):  # QueryJob or None for unknown (pruned) IDs
+        job = self._jobs.get(job_id)
+        if job is not None and not job.done.is_set() and job.overdue():
+            self.cancel(job_id, status='timed_out')
+        return job
+
+    # Wait up to `timeout` seconds for a job; returns the job once finished, else None
+    def wait(self, job_id, timeout=None):
+        job = self.poll(job_id)
+        if job is None:
+            raise QueryJobError(f"Unknown query job {job_id}")
+        if job.done.wait(timeout):
+            return job
+        self.poll(job_id)
+        return job if job.done.is_set() else None
+
+    # Return a finished job's result (releasing it) or raise what stopped it
+    def take_result(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            result, job.result = job.result, None
+        if job.status == 'done':
+            return result
+        if job.status == 'cancelled':
+            raise QueryCancelledError("Query cancelled.")
+        if job.status == 'timed_out':
+            raise QueryTimeoutError(f"Query stopped after {job.timeout:.0f}s (GUVI_QUERY_TIMEOUT).")
+        raise job.error
+
+    # Run several independent queries in parallel; results come back in order
+    def run_parallel(self, owner, db_config, queries, timeout=None):  # queries: [(sql, params), ...]
+        job_ids = [self.submit(owner, db_config, sql, params, timeout) for sql, params in queries]
+        try:
+            for job_id in job_ids:
+                while self.wait(job_id, 0.25) is None:
+                    pass
+            return [self.take_result(job_id) for job_id in job_ids]
+        finally:
+            for job_id in job_ids:  # No-op for finished jobs; stops siblings when one failed or the caller was interrupted
+                self.cancel(job_id)
+
+    # Jobs still queued or running (all sessions, or one)
+    def active_jobs(self, owner=None):
+        with self._lock:
+            return [job for job in self._jobs.values()
+                    if not job.done.is_set() and (owner is None or job.owner == owner)]
+
+    # Counters for monitoring
+    def stats(self):
+        with self._lock:
+            counts = defaultdict(int)
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {'workers': self._pool._max_workers, 'per_user': self.per_user, 'timeout_s': self.timeout, **counts}
+
+
+# Define accessor for the single process-wide executor
+@st.cache_resource(show_spinner=False)
+def get_query_executor():  # Shared by every Streamlit session
+    return QueryExecutor()
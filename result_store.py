@@ -0,0 +1,156 @@
+# Session result store: the DataFrames a session keeps between reruns (search results and the like), with memory budgets
+# Frames are held per session and process-wide in LRU order; past a budget the least recently used ones are dropped
+# An evicted frame keeps its query (SQL, params, fingerprint) and is re-fetched the next time it is read
+
+# Import os for reading the budgets from the environment
+import os
+# Import time for last-use timestamps
+import time
+# Import weakref so a session's frames are released when its session state goes away
+import weakref
+# Import threading to guard the store across sessions
+import threading
+# Import itertools for the result generation counter
+import itertools
+# Import OrderedDict for LRU ordering
+from collections import OrderedDict
+# Import streamlit library as st for the process-wide resource cache and session state
+import streamlit as st
+
+# Import the query fingerprint shared with the slow-query list
+from instrumentation import query_fingerprint, log_event
+
+# ___________________________________________ #
+
+# Budgets (override with GUVI_SESSION_MEMORY_MB / GUVI_RESULT_MEMORY_MB before starting streamlit)
+SESSION_BUDGET_BYTES = int(float(os.environ.get("GUVI_SESSION_MEMORY_MB", "64")) * 1024 * 1024)  # Per session
+GLOBAL_BUDGET_BYTES = int(float(os.environ.get("GUVI_RESULT_MEMORY_MB", "512")) * 1024 * 1024)  # All sessions together
+
+# ___________________________________________ #
+
+# Define the query a stored frame can be rebuilt from
+def result_source(sql, params=None, columns=None, ids=None):  # columns: slice of the result to keep; ids: rank order by Student_ID
+    return {'sql': sql, 'params': list(params or ()), 'fingerprint': query_fingerprint(sql),
+            'columns': list(columns) if columns is not None else None, 'ids': list(ids) if ids else None}
+
+
+# Define the shared store
+class ResultStore:
+
+    def __init__(self, session_budget=SESSION_BUDGET_BYTES, global_budget=GLOBAL_BUDGET_BYTES):
+        self.session_budget = session_budget
+        self.global_budget = global_budget
+        self.entries = OrderedDict()  # (owner, name) -> {'frame', 'bytes', 'source', 'used', 'frame_generation'}; least recently used first
+        self.session_bytes = {}  # owner -> bytes held
+        self.total_bytes = 0
+        self.evictions = 0
+        self.refetches = 0
+        self.generations = itertools.count(1)  # Stamped on each stored frame (df.attrs) so rendered windows key on it, not id()
+        self.lock = threading.Lock()
+
+    def _release(self, key, forget=False):  # Lock held: drop a frame (and the whole entry when it can't be re-fetched)
+        entry = self.entries[key]
+        self.total_bytes -= entry['bytes']
+        self.session_bytes[key[0]] = self.session_bytes.get(key[0], 0) - entry['bytes']
+        entry['frame'], entry['bytes'] = None, 0
+        if forget or entry['source'] is None:
+            del self.entries[key]
+
+    def _evict(self, key):  # Lock held
+        self._release(key)
+        self.evictions += 1
+        log_event('result_evicted', session=key[0], name=key[1])
+
+    def put(self, owner, name, df, source=None, generation=None):  # Store (or replace) a session's frame, then enforce both budgets
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        key = (owner, name)
+        with self.lock:
+            # A re-fetched frame keeps its generation (same rows); anything else is a new result
+            df.attrs['result_generation'] = generation or next(self.generations)
+            if key in self.entries:
+                self._release(key, forget=True)
+            self.entries[key] = {'frame': df, 'bytes': size, 'source': source, 'used': time.time(),
+                                 'frame_generation': df.attrs['result_generation']}
+            self.session_bytes[owner] = self.session_bytes.get(owner, 0) + size
+            self.total_bytes += size
+            # The frame just stored is never evicted here, so the page can still render it
+            for candidate in [k for k, e in self.entries.items() if k[0] == owner and k != key and e['frame'] is not None]:
+                if self.session_bytes[owner] <= self.session_budget:
+                    break
+                self._evict(candidate)
+            for candidate in [k for k, e in self.entries.items() if k != key and e['frame'] is not None]:
+                if self.total_bytes <= self.global_budget:
+                    break
+                self._evict(candidate)
+
+    def get(self, owner, name, refetch=None):  # Frame or None; evicted frames are rebuilt with refetch(source)
+        key = (owner, name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            entry['used'] = time.time()
+            if entry['frame'] is not None or refetch is None:
+                return entry['frame']
+            source, generation = entry['source'], entry['frame_generation']
+        df = refetch(source)  # Outside the lock: this runs a query
+        if df is None:
+            return None
+        with self.lock:
+            self.refetches += 1
+        self.put(owner, name, df, source, generation)
+        return df
+
+    def discard(self, owner, name):
+        with self.lock:
+            if (owner, name) in self.entries:
+                self._release((owner, name), forget=True)
+
+    def drop_session(self, owner):  # Called when a session's state is garbage collected
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == owner]:
+                self._release(key, forget=True)
+            self.session_bytes.pop(owner, None)
+
+    def session_usage(self, owner):  # One row per stored frame, for the admin view
+        with self.lock:
+            return [{'name': name, 'bytes': e['bytes'], 'evicted': e['frame'] is None,
+                     'idle_s': round(time.time() - e['used']), 'fingerprint': (e['source'] or {}).get('fingerprint')}
+                    for (o, name), e in self.entries.items() if o == owner]
+
+    def stats(self):  # Counters for monitoring
+        with self.lock:
+            return {
+                'sessions': sum(1 for n in self.session_bytes.values() if n > 0),
+                'frames': sum(1 for e in self.entries.values() if e['frame'] is not None),
+                'evicted_frames': sum(1 for e in self.entries.values() if e['frame'] is None),
+                'total_bytes': self.total_bytes,
+                'max_session_bytes': max(self.session_bytes.values(), default=0),
+                'session_budget_bytes': self.session_budget,
+                'global_budget_bytes': self.global_budget,
+                'evictions': self.evictions,
+                'refetches': self.refetches,
+            }
+
+
+# Define accessor for the single process-wide store
+@st.cache_resource(show_spinner=False)
+def get_result_store():  # Shared by every Streamlit session
+    return ResultStore()
+
+# ___________________________________________ #
+
+# Define marker object whose collection releases a session's frames
+class _SessionToken:
+    pass
+
+
+# Define function tying the current session's frames to the lifetime of its session state
+def track_session(owner):  # Call once per script run; cheap after the first
+    if st.session_state.get('_result_store_owner') == owner:
+        return
+    token = _SessionToken()
+    weakref.finalize(token, get_result_store().drop_session, owner)
+    st.session_state['_result_store_token'] = token
+    st.session_state['_result_store_owner'] = owner
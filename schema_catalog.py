@@ -0,0 +1,123 @@
+# Import os for reading the cache TTL from the environment
+import os
+# Import streamlit library as st for the shared resource cache
+import streamlit as st
+
+# Import pooled connection helpers and the config key used to share pools
+from db_pool import pooled_connection, config_key
+
+# ___________________________________________ #
+
+# How long a loaded catalog is trusted before information_schema is read again (seconds)
+SCHEMA_TTL_SECONDS = int(os.environ.get("GUVI_SCHEMA_TTL", "600"))
+
+# Table name -> alias used by every joined query in the portal
+TABLE_ALIASES = {
+    'Students': 's',
+    'Programming': 'pr',
+    'Soft_Skills': 'ss',
+    'Placements': 'p'
+}
+
+# Denormalized wide table (student_profile.py); read paths switch to it when it exists
+PROFILE_TABLE = 'Student_Profile'
+
+# Known schema from the CREATE TABLE statements in GuviPlacements_DataGen.ipynb plus derived_metrics.py (used when offline)
+FALLBACK_COLUMNS = {
+    'Students': [
+        ("Student_ID", "varchar"), ("Name", "varchar"), ("Age", "int"), ("Gender", "varchar"),
+        ("Email", "varchar"), ("Phone", "varchar"), ("Enrollment_Year", "varchar"),
+        ("Course_Batch", "varchar"), ("City", "varchar"), ("Graduation_Year", "int")
+    ],
+    'Programming': [
+        ("Programming_ID", "varchar"), ("Student_ID", "varchar"), ("Language", "text"),
+        ("Problems_Solved", "int"), ("Assessments_Completed", "int"), ("Mini_Projects", "int"),
+        ("Certifications_Earned", "text"), ("Latest_Project_Score", "int")
+    ],
+    'Soft_Skills': [
+        ("Soft_Skills_ID", "varchar"), ("Student_ID", "varchar"), ("Communication_Score", "int"),
+        ("Teamwork_Score", "int"), ("Presentation_Score", "int"), ("Leadership_Score", "int"),
+        ("Critical_Thinking", "int"), ("Interpersonal_Skills", "int"), ("Avg_Soft_Skills", "decimal")
+    ],
+    'Placements': [
+        ("Student_ID", "varchar"), ("Mock_Interview_Score", "int"), ("Internships_Completed", "int"),
+        ("Company_Name", "varchar"), ("Placement_Package", "int"), ("Interview_Rounds_Cleared", "int"),
+        ("Placement_Date", "date"), ("Placement_Status", "varchar")
+    ]
+}
+
+# MySQL DATA_TYPE values treated as text for search and display purposes
+TEXT_TYPES = {'char', 'varchar', 'text', 'tinytext', 'mediumtext', 'longtext', 'enum', 'set'}
+
+# ___________________________________________ #
+
+# Define the catalog object: column names, types and aliases for the four portal tables
+class SchemaCatalog:  # Read-only view over {table: [(column, data_type), ...]}
+
+    def __init__(self, tables):
+        self.tables = {name: list(cols) for name, cols in tables.items()}  # Keep columns in ordinal order
+
+    def columns(self, table):  # Column names of one table (empty list for unknown tables)
+        return [col for col, _ in self.tables.get(table, [])]
+
+    def column_type(self, table, column):  # MySQL DATA_TYPE of one column, or None if unknown
+        return dict(self.tables.get(table, [])).get(column)
+
+    def text_columns(self, table):  # Columns holding free text (names, cities, comma lists ...)
+        return [col for col, dtype in self.tables.get(table, []) if dtype in TEXT_TYPES]
+
+    def has_table(self, table):  # True when the table exists (and has columns)
+        return bool(self.tables.get(table))
+
+    def alias(self, table):  # Join alias for a table, e.g. 'Students' -> 's'
+        return TABLE_ALIASES[table]
+
+    def columns_by_alias(self):  # {'s': [...], 'pr': [...], 'ss': [...], 'p': [...]} for the query builders
+        return {TABLE_ALIASES[table]: self.columns(table) for table in TABLE_ALIASES}
+
+    def flat_columns(self):  # Every column across the four tables, in alias order
+        return [col for cols in self.columns_by_alias().values() for col in cols]
+
+
+# Catalog built from the static CREATE TABLE definitions
+FALLBACK_CATALOG = SchemaCatalog(FALLBACK_COLUMNS)
+
+# ___________________________________________ #
+
+# Define loader: one information_schema query for the four tables (and Student_Profile), cached per db_config with a TTL
+@st.cache_resource(ttl=SCHEMA_TTL_SECONDS, show_spinner=False)
+def _load_catalog(key):  # key is db_pool.config_key(db_config)
+    db_config = dict(key)
+    table_names = list(TABLE_ALIASES) + [PROFILE_TABLE]
+    placeholders = ", ".join(["%s"] * len(table_names))
+    query = f"""
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """
+    with pooled_connection(db_config) as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, [db_config['database']] + table_names)
+        rows = cursor.fetchall()
+        cursor.close()
+    # Map information_schema names back to the canonical spelling (table names may differ in case)
+    canonical = {name.lower(): name for name in table_names}
+    tables = {name: [] for name in table_names}
+    for table_name, column_name, data_type in rows:
+        table = canonical.get(str(table_name).lower())
+        if table:
+            tables[table].append((column_name, str(data_type).lower()))
+    return SchemaCatalog(tables)
+
+
+# Define accessor used by the UI
+def get_schema_catalog(db_config=None):  # Live catalog when a db_config is given, static fallback otherwise
+    if not db_config:
+        return FALLBACK_CATALOG
+    return _load_catalog(config_key(db_config))
+
+
+# Define explicit invalidation (after migrations or schema changes)
+def invalidate_schema_catalog():  # Forces the next get_schema_catalog() call to re-read information_schema
+    _load_catalog.clear()
@@ -0,0 +1,195 @@
+# Import os for reading index settings from the environment
+import os
+# Import re for tokenizing cell values and keywords
+import re
+# Import bisect for prefix lookups over the sorted vocabulary
+import bisect
+# Import threading so only one session refreshes a shared index at a time
+import threading
+# Import hashlib for per-student content hashes (incremental refresh)
+import hashlib
+# Import defaultdict for the token -> postings map
+from collections import defaultdict
+# Import streamlit library as st for the shared resource cache
+import streamlit as st
+
+# Import pooled connection helpers and the config key used to share pools
+from db_pool import pooled_connection, config_key
+# Import the schema catalog for the text columns of each table
+from schema_catalog import get_schema_catalog, TABLE_ALIASES
+# Import the data-version probe used to decide when to refresh
+from data_version import current_data_version
+
+# ___________________________________________ #
+
+# Maximum number of ranked Student_IDs a search returns
+SEARCH_RESULT_LIMIT = int(os.environ.get("GUVI_SEARCH_LIMIT", "5000"))
+
+# Tokens are runs of letters/digits ("rahul.sharma@gmail.com" -> rahul, sharma, gmail, com)
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Score for a keyword that matches a whole token vs. only the start of one
+EXACT_WEIGHT = 2
+PREFIX_WEIGHT = 1
+
+# ___________________________________________ #
+
+# Define tokenizer shared by indexing and querying
+def tokenize(value):  # Lower-cased tokens of one cell, plus the whole cell value for exact lookups
+    text = str(value).strip().lower()
+    if not text:
+        return set()
+    tokens = set(TOKEN_RE.findall(text))
+    tokens.add(text)  # Whole value, so "g25aiml_001" or "not ready" hit directly
+    return tokens
+
+# ___________________________________________ #
+
+# Define the in-process inverted index: token -> set of internal doc ids
+class InvertedIndex:  # One document per Student_ID, built from all four tables
+
+    def __init__(self):
+        self.postings = defaultdict(set)  # token -> {doc id}
+        self.doc_tokens = {}  # doc id -> frozenset of tokens (for removing stale postings)
+        self.doc_hash = {}  # doc id -> content hash (skip unchanged students on refresh)
+        self.doc_of = {}  # Student_ID -> doc id
+        self.student_of = []  # doc id -> Student_ID
+        self._vocab = None  # Sorted token list, rebuilt lazily after changes
+        self.lock = threading.RLock()  # Held by sync() and search(): sessions search while another one refreshes
+
+    def __len__(self):
+        return len(self.doc_of)
+
+    def upsert(self, student_id, values):  # Index (or re-index) one student's row; returns True if it changed
+        digest = hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+        doc = self.doc_of.get(student_id)
+        if doc is not None and self.doc_hash.get(doc) == digest:
+            return False  # Content unchanged since the last refresh
+        if doc is None:  # New student: assign the next doc id
+            doc = len(self.student_of)
+            self.student_of.append(student_id)
+            self.doc_of[student_id] = doc
+        else:  # Changed student: drop the old postings first
+            self._unpost(doc)
+        tokens = set()
+        for value in values:
+            if value is not None:
+                tokens |= tokenize(value)
+        for token in tokens:
+            self.postings[token].add(doc)
+        self.doc_tokens[doc] = frozenset(tokens)
+        self.doc_hash[doc] = digest
+        self._vocab = None
+        return True
+
+    def remove(self, student_id):  # Drop a student that no longer exists
+        doc = self.doc_of.pop(student_id, None)
+        if doc is not None:
+            self._unpost(doc)
+            self.doc_hash.pop(doc, None)
+            self._vocab = None
+
+    def _unpost(self, doc):
+        for token in self.doc_tokens.pop(doc, ()):
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.discard(doc)
+                if not docs:
+                    del self.postings[token]
+
+    def sync(self, rows):  # Bring the index in line with {Student_ID: values}; returns number of changed students
+        with self.lock:
+            changed = sum(1 for student_id, values in rows.items() if self.upsert(student_id, values))
+            for student_id in [sid for sid in self.doc_of if sid not in rows]:
+                self.remove(student_id)
+                changed += 1
+            return changed
+
+    def _prefix_postings(self, term):  # Lock held; {doc: weight} for docs with a token equal to / starting with term
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        hits = {}
+        start = bisect.bisect_left(self._vocab, term)
+        for token in self._vocab[start:]:
+            if not token.startswith(term):
+                break
+            weight = EXACT_WEIGHT if token == term else PREFIX_WEIGHT
+            for doc in self.postings.get(token, ()):  # .get(): reading a defaultdict must not add keys
+                if hits.get(doc, 0) < weight:
+                    hits[doc] = weight
+        return hits
+
+    def _keyword_postings(self, keyword):  # {doc: weight} for one comma-separated keyword
+        keyword = keyword.strip().lower()
+        hits = self._prefix_postings(keyword)  # Whole keyword against whole values / single tokens
+        terms = TOKEN_RE.findall(keyword)
+        if len(terms) > 1:  # Multi-word keyword: every word must match the same student
+            per_term = [self._prefix_postings(term) for term in terms]
+            common = set.intersection(*(set(p) for p in per_term))
+            for doc in common:
+                hits[doc] = max(hits.get(doc, 0), min(p[doc] for p in per_term))
+        return hits
+
+    def search(self, keywords, limit=SEARCH_RESULT_LIMIT):  # Ranked Student_IDs matching ALL keywords
+        with self.lock:  # The postings, vocabulary and doc ids must not change mid-search
+            return self._search(keywords, limit)
+
+    def _search(self, keywords, limit):  # Lock held
+        scores = None
+        # Intersect the smallest posting lists first so later keywords touch fewer docs
+        for hits in sorted((self._keyword_postings(k) for k in keywords if k.strip()), key=len):
+            if scores is None:
+                scores = dict(hits)
+            else:
+                scores = {doc: score + hits[doc] for doc, score in scores.items() if doc in hits}
+            if not scores:
+                return []
+        if not scores:
+            return []
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], self.student_of[doc]))
+        return [self.student_of[doc] for doc in ranked[:limit]]
+
+# ___________________________________________ #
+
+# Define the indexed columns: Student_ID plus the text columns (numbers and dates are searched with field:value / mock>=80)
+def index_columns(catalog):  # Qualified with the join aliases, e.g. ['s.Student_ID', 's.Name', ..., 'p.Placement_Status']
+    return ['s.Student_ID'] + [
+        f'{catalog.alias(table)}.{col}' for table in TABLE_ALIASES for col in catalog.text_columns(table) if col != 'Student_ID'
+    ]
+
+
+# Define loader: one joined scan of the four tables -> {Student_ID: values}
+def fetch_index_rows(db_config):  # Student_ID plus every text column, keyed by student
+    query = f"""
+    SELECT {', '.join(index_columns(get_schema_catalog(db_config)))}
+    FROM Students s
+    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+    LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+    LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
+    """
+    rows = {}
+    with pooled_connection(db_config) as conn:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        for row in cursor:
+            rows[row[0]] = row  # Student_ID is part of the searchable values too
+        cursor.close()
+    return rows
+
+
+# Define shared holder: one index per db_config for the whole process
+@st.cache_resource(show_spinner=False)
+def _index_holder(key):
+    return {'index': InvertedIndex(), 'version': None, 'lock': threading.Lock()}
+
+
+# Define accessor: returns an index that is current with the database
+def get_search_index(db_config):  # Refreshes incrementally whenever the data-version probe changes
+    holder = _index_holder(config_key(db_config))
+    version = current_data_version(db_config)
+    if holder['version'] != version:
+        with holder['lock']:
+            if holder['version'] != version:  # Another session may have refreshed while we waited
+                holder['index'].sync(fetch_index_rows(db_config))
+                holder['version'] = version
+    return holder['index']
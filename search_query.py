@@ -0,0 +1,215 @@
+# Search-box query language: comma-separated terms parsed into typed predicates on the columns they name
+#   field:value      exact match (text) or equality (numbers); field:a|b matches any of the values
+#   field>=n         numeric/date comparison with >, >=, <, <= or =, e.g. mock>=80
+#   field:a..b       inclusive range, e.g. grad:2024..2025
+#   ready, placed, not ready   exact Placement_Status
+#   a column name or field alias (e.g. "mock") adds that column to the results; a known skill goes through Student_Skills
+#   anything else is free text, looked up in the search index over text columns only
+# Predicates compare bare columns with parameters (no LIKE, no functions), so MySQL can use the secondary indexes
+
+# Import re for splitting field terms
+import re
+# Import datetime for validating date values
+import datetime
+
+# Import the table aliases and the MySQL types treated as text
+from schema_catalog import TABLE_ALIASES, TEXT_TYPES
+# Import the skill-tag kinds and SQL fragments (Language / Certifications_Earned are comma lists)
+from skill_tags import SKILL_SOURCES, all_skills_sql, any_skill_sql
+# Import IN-list padding so similar searches share one prepared statement
+from data_access import in_placeholders
+# Import the vectorized keyword-to-column matcher for the displayed columns
+from matching_columns import find_matching_columns
+
+# ___________________________________________ #
+
+# Short field names accepted before ':' or a comparison (full column names work too, in any case)
+FIELD_ALIASES = {
+    'id': 'Student_ID', 'name': 'Name', 'age': 'Age', 'gender': 'Gender', 'email': 'Email', 'phone': 'Phone',
+    'enrolled': 'Enrollment_Year', 'batch': 'Course_Batch', 'city': 'City', 'grad': 'Graduation_Year',
+    'lang': 'Language', 'language': 'Language', 'cert': 'Certifications_Earned', 'certs': 'Certifications_Earned',
+    'problems': 'Problems_Solved', 'assessments': 'Assessments_Completed', 'projects': 'Mini_Projects',
+    'project': 'Latest_Project_Score', 'communication': 'Communication_Score', 'teamwork': 'Teamwork_Score',
+    'presentation': 'Presentation_Score', 'leadership': 'Leadership_Score', 'critical': 'Critical_Thinking',
+    'interpersonal': 'Interpersonal_Skills', 'soft': 'Avg_Soft_Skills', 'mock': 'Mock_Interview_Score',
+    'internships': 'Internships_Completed', 'company': 'Company_Name', 'package': 'Placement_Package',
+    'rounds': 'Interview_Rounds_Cleared', 'date': 'Placement_Date', 'status': 'Placement_Status',
+}
+
+# Placement_Status values a bare term matches exactly ("ready" no longer matches "Not Ready")
+STATUS_VALUES = ('Ready', 'Not Ready', 'Placed')
+
+# MySQL DATA_TYPE values compared as numbers / dates
+NUMERIC_TYPES = {'tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint', 'decimal', 'numeric', 'float', 'double', 'real'}
+DATE_TYPES = {'date', 'datetime', 'timestamp'}
+
+# field, operator, value: "mock>=80", "city:chennai", "grad:2024..2025"
+FIELD_TERM_RE = re.compile(r"^([a-z_]+)\s*(>=|<=|>|<|=|:)\s*(.+)$")
+
+# Columns shown for common words that aren't column names
+SYNONYM_COLUMNS = {
+    'internship': 'Internships_Completed', 'certification': 'Certifications_Earned',
+    'interview': 'Mock_Interview_Score', 'mock': 'Mock_Interview_Score',
+}
+
+# ___________________________________________ #
+
+# Define the parsed search: predicates for SQL, skills for Student_Skills, free text for the index
+class SearchPlan:
+    def __init__(self):
+        self.predicates = []  # (table, column, op, values); op is '=', '>', '>=', '<', '<=', 'in', 'between' or 'skill'
+        self.statuses = []  # Bare status terms (any of them)
+        self.skills = []  # Bare known skills (all of them)
+        self.text = []  # Free-text terms for the search index
+        self.columns = []  # Columns named by a term or filtered on, shown in the results
+        self.terms = []  # Every term as typed (lower-cased)
+
+    def where(self, ids=None, profile=False):  # Returns (where clause, params); ids: ranked free-text matches (None = no free text)
+        student = 's.Student_ID'
+        clauses, params = [], []
+        for table, column, op, values in self.predicates:
+            col = f"s.{column}" if profile else f"{TABLE_ALIASES[table]}.{column}"
+            if op == 'skill':  # Comma-list columns: one indexed probe of the skill tags
+                sql, skill_params = any_skill_sql(values, student, kind=SKILL_SOURCES[column])
+                clauses.append(sql)
+                params += skill_params
+            elif op == 'in':
+                placeholders, padded = in_placeholders(values)
+                clauses.append(f"{col} IN ({placeholders})")
+                params += padded
+            elif op == 'between':
+                clauses.append(f"{col} BETWEEN %s AND %s")
+                params += list(values)
+            else:
+                clauses.append(f"{col} {op} %s")
+                params.append(values[0])
+        if self.statuses:
+            placeholders, padded = in_placeholders(self.statuses)
+            clauses.append(f"{'s' if profile else 'p'}.Placement_Status IN ({placeholders})")
+            params += padded
+        if self.skills:  # Students having every skill (GROUP BY on the Student_Skills primary key)
+            sql, skill_params = all_skills_sql(self.skills, student)
+            clauses.append(sql)
+            params += skill_params
+        if ids is not None:
+            if not ids:
+                return "1=0", []
+            placeholders, padded = in_placeholders(ids)  # Primary-key lookup of the index matches
+            clauses.append(f"{student} IN ({placeholders})")
+            params += padded
+        return " AND ".join(clauses) or "1=1", params
+
+# ___________________________________________ #
+
+# Define lookup: field name -> (table, column, MySQL type), or None
+def resolve_field(name, catalog):
+    wanted = FIELD_ALIASES.get(name, name).lower()
+    for table in TABLE_ALIASES:  # Students first, so Student_ID resolves to the primary table
+        for column in catalog.columns(table):
+            if column.lower() == wanted:
+                return table, column, catalog.column_type(table, column)
+    return None
+
+
+# Define function converting one value to the column's type
+def _typed_value(field, value, dtype):  # Raises ValueError with a message for the search box
+    value = value.strip()
+    if dtype in NUMERIC_TYPES:
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"{field}: expected a number, got '{value}'")
+        return int(number) if number.is_integer() else number
+    if dtype in DATE_TYPES:
+        try:
+            return datetime.date.fromisoformat(value).isoformat()
+        except ValueError:
+            raise ValueError(f"{field}: expected a date like 2024-06-30, got '{value}'")
+    return value
+
+
+# Define function turning one field term into a predicate
+def _field_predicate(field, op, value, catalog):
+    resolved = resolve_field(field, catalog)
+    if resolved is None:
+        if op != ':' or '..' in value:  # "mok>=80" or "soft>=70" before derived_metrics.py: free text would just match nothing
+            raise ValueError(f"unknown field '{field}'")
+        return None  # "word:word" that isn't a field: the caller treats the whole term as free text
+    table, column, dtype = resolved
+    text = dtype in TEXT_TYPES
+    if op == ':' and '..' in value:
+        if text:
+            raise ValueError(f"{field}: ranges need a numeric or date column")
+        low, high = value.split('..', 1)
+        return table, column, 'between', [_typed_value(field, low, dtype), _typed_value(field, high, dtype)]
+    if op in ('>', '>=', '<', '<=') and text:
+        raise ValueError(f"{field}: '{op}' needs a numeric or date column")
+    values = [_typed_value(field, v, dtype) for v in value.split('|') if v.strip()]
+    if not values:
+        raise ValueError(f"{field}: missing value")
+    if column in SKILL_SOURCES:  # "lang:python" means the skill, not the whole comma list
+        return table, column, 'skill', [v.lower() for v in values]
+    if len(values) > 1:
+        if op not in (':', '='):
+            raise ValueError(f"{field}: '|' only works with ':'")
+        return table, column, 'in', values
+    return table, column, '=' if op == ':' else op, values
+
+
+# Define lookup for a column-selector term: a column name, a field alias or a common word for a column
+def _selected_column(term, catalog):  # Exact matches only, so "ai" (in "Email") stays a search term
+    resolved = resolve_field(term, catalog)
+    return resolved[1] if resolved else SYNONYM_COLUMNS[term]
+
+
+# Define the parser
+def parse_search(criteria, catalog, skills=frozenset()):  # Returns a SearchPlan; raises ValueError for malformed terms
+    plan = SearchPlan()
+    statuses = {status.lower(): status for status in STATUS_VALUES}
+    flat_columns = {col.lower() for col in catalog.flat_columns()}
+    for term in (t.strip().lower() for t in criteria.split(',')):
+        if not term:
+            continue
+        plan.terms.append(term)
+        if term in statuses:
+            plan.statuses.append(statuses[term])
+            continue
+        match = FIELD_TERM_RE.match(term)
+        predicate = _field_predicate(*match.groups(), catalog) if match else None
+        if predicate is not None:
+            plan.predicates.append(predicate)
+            plan.columns.append(predicate[1])
+        elif term in flat_columns or term in FIELD_ALIASES or term in SYNONYM_COLUMNS:  # Names a column: show it, don't filter
+            plan.columns.append(_selected_column(term, catalog))
+        elif term in skills:
+            plan.skills.append(term)
+        else:
+            plan.text.append(term)
+    return plan
+
+# ___________________________________________ #
+
+# Define function listing the text columns of the four tables (the only ones free text is matched against)
+def text_columns(catalog):
+    return {col for table in TABLE_ALIASES for col in catalog.text_columns(table)}
+
+
+# Define function choosing the result columns: defaults, then named/filtered columns, then text columns the free text hit
+def display_columns(plan, result, catalog):
+    default_cols = ['Name', 'Student_ID', 'Course_Batch', 'Placement_Status']
+    chosen = set(plan.columns)
+    searchable = text_columns(catalog)
+    non_text = [col for col in result.columns if col not in searchable]
+    chosen |= find_matching_columns(result, plan.text + plan.skills, exclude=default_cols + non_text)
+    terms = ' '.join(plan.terms)
+    chosen |= {column for word, column in SYNONYM_COLUMNS.items() if word in terms}
+    return [col for col in default_cols if col in result.columns] + \
+        [col for col in result.columns if col in chosen and col not in default_cols]
+
+
+# Define function restoring the search-index ranking (IN (...) returns rows in key order)
+def order_by_rank(result, ids):  # ids: ranked Student_IDs, or None to keep the SQL order
+    if not ids or result.empty:
+        return result
+    rank = {sid: i for i, sid in enumerate(ids)}
+    return result.sort_values('Student_ID', key=lambda col: col.map(rank)).reset_index(drop=True)
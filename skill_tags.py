@@ -0,0 +1,161 @@
+# Normalized skill tags: one Student_Skills row per (student, skill, kind) parsed from Programming's comma lists
+# Usage: python skill_tags.py   (creates the table if needed and re-syncs it from Programming)
+
+# Import argparse for the command-line options
+import argparse
+# Import os for reading the cache TTL from the environment
+import os
+# Import streamlit library as st for caching the known-skill list
+import streamlit as st
+
+# Import shared command-line connection helpers
+from cli_common import add_db_arguments, db_config_from_args, connect
+# Import pooled connection helpers and the config key used to share pools
+from db_pool import pooled_connection, config_key
+
+# ___________________________________________ #
+
+# How long the list of known skills is trusted (seconds)
+SKILL_LIST_TTL_SECONDS = int(os.environ.get("GUVI_SKILL_LIST_TTL", "300"))
+
+# Programming column -> Kind stored in Student_Skills
+SKILL_SOURCES = {
+    'Language': 'language',
+    'Certifications_Earned': 'certification',
+}
+
+# Longest tag stored; the source columns are TEXT, so longer tags are skipped (and reported) rather than truncated
+SKILL_MAX_LENGTH = 255
+
+# Tags are lower-cased in Python, so Skill compares exactly (binary): "café" and "cafe" stay two tags instead of colliding
+# (Skill, Kind, Student_ID) primary key serves "students with skill X"; the Student_ID index serves EXISTS probes and re-syncs
+STUDENT_SKILLS_DDL = f"""
+CREATE TABLE IF NOT EXISTS Student_Skills (
+    Student_ID VARCHAR(20) NOT NULL,
+    Skill VARCHAR({SKILL_MAX_LENGTH}) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    Kind VARCHAR(20) NOT NULL,
+    PRIMARY KEY (Skill, Kind, Student_ID),
+    INDEX idx_student_skills_student (Student_ID, Kind, Skill)
+)
+"""
+
+# ___________________________________________ #
+
+# Define function splitting a comma-joined list into normalized skill tags
+def parse_skills(text):  # "python, mysql, PyTorch" -> ['python', 'mysql', 'pytorch']
+    if text is None:
+        return []
+    seen = []
+    for part in str(text).split(','):
+        skill = part.strip().lower()
+        if skill and skill not in seen:
+            seen.append(skill)
+    return seen
+
+
+# Define function turning Programming rows into Student_Skills rows
+def skill_rows(programming_rows, too_long=None):  # Rows of (Student_ID, Language, Certifications_Earned); too_long collects skipped tags
+    rows = []
+    for student_id, language, certifications in programming_rows:
+        for column, text in (('Language', language), ('Certifications_Earned', certifications)):
+            kind = SKILL_SOURCES[column]
+            for skill in parse_skills(text):
+                if len(skill) <= SKILL_MAX_LENGTH:
+                    rows.append((student_id, skill, kind))
+                elif too_long is not None:
+                    too_long.append((student_id, skill, kind))
+    return rows
+
+
+# Define function upgrading a Student_Skills table created with the older VARCHAR(50), case-insensitive Skill column
+def widen_skill_column(cursor):
+    cursor.execute(
+        "SELECT CHARACTER_MAXIMUM_LENGTH, COLLATION_NAME FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Student_Skills' AND COLUMN_NAME = 'Skill'"
+    )
+    row = cursor.fetchone()
+    if row is not None and (row[0] < SKILL_MAX_LENGTH or row[1] != 'utf8mb4_bin'):
+        cursor.execute(f"ALTER TABLE Student_Skills MODIFY Skill VARCHAR({SKILL_MAX_LENGTH}) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL")
+        print(f"Changed Student_Skills.Skill to VARCHAR({SKILL_MAX_LENGTH}) with a binary collation.")
+
+
+# Define function re-syncing Student_Skills from Programming (all students, or just the given IDs)
+def sync_student_skills(conn, student_ids=None, batch_rows=5000):  # Call from every data load; one transaction
+    cursor = conn.cursor()
+    cursor.execute(STUDENT_SKILLS_DDL)
+    widen_skill_column(cursor)
+    too_long = []
+    if student_ids is None:
+        cursor.execute("SELECT Student_ID, Language, Certifications_Earned FROM Programming")
+        rows = skill_rows(cursor.fetchall(), too_long)
+        cursor.execute("DELETE FROM Student_Skills")
+    else:
+        student_ids = list(student_ids)
+        rows = []
+        for start in range(0, len(student_ids), 1000):  # Batches keep the IN (...) list bounded
+            batch = student_ids[start:start + 1000]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"SELECT Student_ID, Language, Certifications_Earned FROM Programming WHERE Student_ID IN ({placeholders})", batch)
+            rows.extend(skill_rows(cursor.fetchall(), too_long))
+            cursor.execute(f"DELETE FROM Student_Skills WHERE Student_ID IN ({placeholders})", batch)
+    # No IGNORE: parse_skills already de-duplicates, so a key collision is a real error, not something to drop silently
+    insert = "INSERT INTO Student_Skills (Student_ID, Skill, Kind) VALUES (%s, %s, %s)"
+    for start in range(0, len(rows), batch_rows):
+        cursor.executemany(insert, rows[start:start + batch_rows])  # Sent as multi-row INSERTs by the connector
+    conn.commit()
+    cursor.close()
+    print(f"Synced Student_Skills ({len(rows)} tags).")
+    for student_id, skill, kind in too_long:
+        print(f"Skipped {kind} tag longer than {SKILL_MAX_LENGTH} characters for {student_id}: {skill[:40]}...")
+    return len(rows)
+
+# ___________________________________________ #
+
+# Define SQL fragment: students having ALL the given skills (indexed GROUP BY on the primary key)
+def all_skills_sql(skills, student_column="s.Student_ID", kind=None):  # Returns (sql, params)
+    skills = [s.lower() for s in skills]
+    placeholders = ", ".join(["%s"] * len(skills))
+    kind_clause = " AND Kind = %s" if kind else ""
+    sql = (f"{student_column} IN (SELECT Student_ID FROM Student_Skills WHERE Skill IN ({placeholders}){kind_clause} "
+           f"GROUP BY Student_ID HAVING COUNT(DISTINCT Skill) = {len(skills)})")
+    return sql, skills + ([kind] if kind else [])
+
+
+# Define SQL fragment: students having ANY of the given skills
+def any_skill_sql(skills, student_column="s.Student_ID", kind=None):  # Returns (sql, params)
+    skills = [s.lower() for s in skills]
+    placeholders = ", ".join(["%s"] * len(skills))
+    kind_clause = " AND k.Kind = %s" if kind else ""
+    sql = (f"EXISTS (SELECT 1 FROM Student_Skills k WHERE k.Student_ID = {student_column} "
+           f"AND k.Skill IN ({placeholders}){kind_clause})")
+    return sql, skills + ([kind] if kind else [])
+
+
+# Define cached list of known skills (used to route search keywords)
+@st.cache_resource(ttl=SKILL_LIST_TTL_SECONDS, show_spinner=False)
+def _known_skills(key):
+    with pooled_connection(dict(key)) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT Skill FROM Student_Skills")
+        skills = frozenset(row[0] for row in cursor.fetchall())
+        cursor.close()
+    return skills
+
+
+def known_skills(db_config):  # Frozen set of lower-cased skills present in Student_Skills
+    return _known_skills(config_key(db_config))
+
+# ___________________________________________ #
+
+def main():
+    parser = add_db_arguments(argparse.ArgumentParser(description='Create and re-sync the Student_Skills table'))
+    args = parser.parse_args()
+    conn = connect(db_config_from_args(args))
+    try:
+        sync_student_skills(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
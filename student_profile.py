@@ -0,0 +1,206 @@
+# Denormalized Student_Profile: one wide row per student, pre-joined from the four base tables
+# Usage: python student_profile.py   (creates the table if needed and rebuilds it)
+
+# Import argparse for the command-line options
+import argparse
+# Import threading to guard the freshness memo shared by portal sessions
+import threading
+
+# Import shared command-line connection helpers
+from cli_common import add_db_arguments, db_config_from_args, connect
+# Import the known column list of each base table and the profile table name
+from schema_catalog import FALLBACK_CATALOG, PROFILE_TABLE
+# Import the index check shared with the other maintenance scripts
+from derived_metrics import index_exists, column_exists
+# Import the data-version watermark the profile is stamped with
+from data_version import read_data_version, current_data_version
+# Import pooled connection helpers for the portal's freshness check
+from db_pool import pooled_connection, config_key
+
+# ___________________________________________ #
+
+# Inner-join markers: the profile is a LEFT JOIN from Students, so queries that inner-joined a table filter on these
+PRESENCE_COLUMNS = {
+    'pr': 'Has_Programming',
+    'ss': 'Has_Soft_Skills',
+    'p': 'Has_Placement',
+}
+
+# Same column names as the joined search SELECT (Student_ID once, then every other column of s, pr, ss, p)
+STUDENT_PROFILE_DDL = """
+CREATE TABLE IF NOT EXISTS Student_Profile (
+    Student_ID VARCHAR(20) PRIMARY KEY,
+    Name VARCHAR(100),
+    Age INT,
+    Gender VARCHAR(10),
+    Email VARCHAR(100),
+    Phone VARCHAR(10),
+    Enrollment_Year VARCHAR(4),
+    Course_Batch VARCHAR(20),
+    City VARCHAR(20),
+    Graduation_Year INT,
+    Programming_ID VARCHAR(20),
+    Language TEXT,
+    Problems_Solved INT,
+    Assessments_Completed INT,
+    Mini_Projects INT,
+    Certifications_Earned TEXT,
+    Latest_Project_Score INT,
+    Soft_Skills_ID VARCHAR(20),
+    Communication_Score INT,
+    Teamwork_Score INT,
+    Presentation_Score INT,
+    Leadership_Score INT,
+    Critical_Thinking INT,
+    Interpersonal_Skills INT,
+    Avg_Soft_Skills DECIMAL(7,4),
+    Mock_Interview_Score INT,
+    Internships_Completed INT,
+    Company_Name VARCHAR(50),
+    Placement_Package INT,
+    Interview_Rounds_Cleared INT,
+    Placement_Date DATE,
+    Placement_Status VARCHAR(20),
+    Has_Programming TINYINT NOT NULL,
+    Has_Soft_Skills TINYINT NOT NULL,
+    Has_Placement TINYINT NOT NULL
+)
+"""
+
+# Data version the profile was last built at; the portal reads the profile only while this matches the live version
+# (a notebook reload or a manual edit changes the base tables without touching the profile)
+PROFILE_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS Student_Profile_Version (
+    Id TINYINT PRIMARY KEY,
+    Data_Version VARCHAR(2000) NOT NULL,
+    Built_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+)
+"""
+
+# Freshness checks per (db_config, data version): key -> bool
+_current = {}
+_current_lock = threading.Lock()
+
+# (index name, columns, read path it serves); every insight filters on Placement_Status first
+PROFILE_INDEXES = [
+    ('idx_profile_status_mock', '(Placement_Status, Mock_Interview_Score)', "Insights 1, 3 and 9 (sort by mock score)"),
+    ('idx_profile_status_avg', '(Placement_Status, Avg_Soft_Skills)', "Insights 6, 7 and 10"),
+    ('idx_profile_status_problems', '(Placement_Status, Problems_Solved, Mini_Projects)', "Insights 5 and 7"),
+    ('idx_profile_status_city', '(Placement_Status, City)', "Insight 8 (covering)"),
+    ('idx_profile_grad_year', '(Graduation_Year, Placement_Status, Mock_Interview_Score)', "Insight 9"),
+]
+
+
+# Define function building the SELECT that produces profile rows
+def profile_select():  # Column list follows the base tables, so a schema change only touches the DDL above
+    columns_by_alias = FALLBACK_CATALOG.columns_by_alias()
+    select_cols = ['s.Student_ID'] + [
+        f'{alias}.{col}' for alias, cols in columns_by_alias.items() for col in cols if col != 'Student_ID'
+    ]
+    select_cols += [f'CASE WHEN {alias}.Student_ID IS NULL THEN 0 ELSE 1 END AS {flag}' for alias, flag in PRESENCE_COLUMNS.items()]
+    return f"""
+    SELECT {', '.join(select_cols)}
+    FROM Students s
+    LEFT JOIN Programming pr ON s.Student_ID = pr.Student_ID
+    LEFT JOIN Soft_Skills ss ON s.Student_ID = ss.Student_ID
+    LEFT JOIN Placements p ON s.Student_ID = p.Student_ID
+    """
+
+# ___________________________________________ #
+
+# Define function creating the table and its indexes, then rebuilding it (safe to run repeatedly)
+def apply_student_profile(conn):
+    cursor = conn.cursor()
+    cursor.execute(STUDENT_PROFILE_DDL)
+    for index, columns, _ in PROFILE_INDEXES:
+        if not index_exists(cursor, PROFILE_TABLE, index):
+            cursor.execute(f"CREATE INDEX {index} ON {PROFILE_TABLE} {columns}")
+            print(f"Created index {index}.")
+    conn.commit()
+    cursor.close()
+    refresh_student_profile(conn)
+    mark_profile_current(conn)
+
+
+# Define function refreshing Student_Profile (all students, or just the given IDs)
+def refresh_student_profile(conn, student_ids=None):  # Call after every data load
+    cursor = conn.cursor()
+    if not column_exists(cursor, PROFILE_TABLE, 'Student_ID'):  # Not created yet: the portal keeps using the joins
+        cursor.close()
+        print(f"{PROFILE_TABLE} not created yet (run student_profile.py or migrations.py migrate); skipped.")
+        return 0
+    if student_ids is None:
+        # Build a fresh copy and swap it in atomically, so readers never see a half-built profile
+        cursor.execute(f"DROP TABLE IF EXISTS {PROFILE_TABLE}_New, {PROFILE_TABLE}_Old")
+        cursor.execute(f"CREATE TABLE {PROFILE_TABLE}_New LIKE {PROFILE_TABLE}")
+        cursor.execute(f"INSERT INTO {PROFILE_TABLE}_New " + profile_select())
+        refreshed = cursor.rowcount
+        cursor.execute(f"RENAME TABLE {PROFILE_TABLE} TO {PROFILE_TABLE}_Old, {PROFILE_TABLE}_New TO {PROFILE_TABLE}")
+        cursor.execute(f"DROP TABLE {PROFILE_TABLE}_Old")
+    else:
+        refreshed = 0
+        student_ids = list(student_ids)
+        for start in range(0, len(student_ids), 1000):  # Batches keep the IN (...) list bounded
+            batch = student_ids[start:start + 1000]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"DELETE FROM {PROFILE_TABLE} WHERE Student_ID IN ({placeholders})", batch)
+            cursor.execute(f"INSERT INTO {PROFILE_TABLE} " + profile_select() + f" WHERE s.Student_ID IN ({placeholders})", batch)
+            refreshed += cursor.rowcount
+            conn.commit()  # One transaction per batch: readers see either the old or the new rows
+    conn.commit()
+    cursor.close()
+    print(f"Refreshed {PROFILE_TABLE} ({refreshed} rows).")
+    return refreshed
+
+
+# Define the stamp compared for freshness: the data version without the TABLE_ROWS estimates
+def _version_stamp(version):  # InnoDB re-estimates row counts in the background, after the stamp may have been written
+    return repr(tuple((entry[0], entry[2]) if isinstance(entry, tuple) else entry for entry in version))
+
+
+# Define function stamping the profile with the current data version
+def mark_profile_current(conn):  # Call after the profile is refreshed and any data-version bump is committed
+    cursor = conn.cursor()
+    cursor.execute(PROFILE_VERSION_DDL)
+    version = _version_stamp(read_data_version(conn, conn.database))
+    cursor.execute("REPLACE INTO Student_Profile_Version (Id, Data_Version) VALUES (1, %s)", (version,))
+    conn.commit()
+    cursor.close()
+
+
+# Define the portal's check: is Student_Profile built from the data the base tables hold now?
+def profile_is_current(db_config):  # False when it was never stamped or the data changed since; the portal then uses the joins
+    version = current_data_version(db_config)
+    key = (config_key(db_config), version)
+    with _current_lock:
+        if key in _current:
+            return _current[key]
+    try:
+        with pooled_connection(db_config) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT Data_Version FROM Student_Profile_Version WHERE Id = 1")
+            row = cursor.fetchone()
+            cursor.close()
+    except Exception:  # No stamp table yet: built before this check existed, so it can't be trusted
+        row = None
+    current = row is not None and row[0] == _version_stamp(version)
+    with _current_lock:
+        if len(_current) > 64:  # Old versions are never asked for again
+            _current.clear()
+        _current[key] = current
+    return current
+
+# ___________________________________________ #
+
+def main():
+    parser = add_db_arguments(argparse.ArgumentParser(description='Create and rebuild the Student_Profile table'))
+    args = parser.parse_args()
+    conn = connect(db_config_from_args(args))
+    try:
+        apply_student_profile(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
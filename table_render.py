@@ -0,0 +1,104 @@
+# Table rendering for the portal: only the visible window is sent, as Arrow (data grid) or escaped HTML
+# Rendered windows are memoized per session, keyed by (result fingerprint, sort, page)
+
+# Import os for reading renderer settings from the environment
+import os
+# Import OrderedDict for the per-session LRU of rendered windows
+from collections import OrderedDict
+# Import streamlit library as st for the grid, markdown and session state
+import streamlit as st
+# Import pandas for dtype checks
+import pandas as pd
+
+# Import display formatting shared with the exports
+from typed_frames import format_for_display
+# Import the timing span for the render stage
+from instrumentation import span
+
+# ___________________________________________ #
+
+# "grid": st.dataframe (Arrow, virtualized scrolling); "html": the MySQL Workbench-styled table
+TABLE_RENDERER = os.environ.get("GUVI_TABLE_RENDERER", "grid")
+
+# Rendered windows kept per session (a few pages for each of the three sections)
+RENDER_CACHE_ENTRIES = int(os.environ.get("GUVI_RENDER_CACHE_ENTRIES", "32"))
+
+# Grid geometry: rows beyond this height scroll inside the grid instead of growing the page
+GRID_ROW_PX = 35
+GRID_MAX_HEIGHT_PX = 420
+
+# ___________________________________________ #
+
+# Define accessor for this session's LRU of rendered windows
+def _render_cache():
+    cache = st.session_state.get('_render_cache')
+    if cache is None:
+        cache = OrderedDict()
+        st.session_state['_render_cache'] = cache
+    return cache
+
+
+# Define memoizer: build(key) runs only on a miss; hits are moved to the recent end
+def memoized_window(key, build):  # key must be hashable, e.g. (fingerprint, sort column, descending, page)
+    cache = _render_cache()
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    window = build()
+    if window.empty:  # Failed queries come back empty; don't pin them
+        return window
+    cache[key] = window
+    while len(cache) > RENDER_CACHE_ENTRIES:
+        cache.popitem(last=False)
+    return window
+
+
+# Define function measuring this session's rendered windows (shown in the admin panel)
+def render_cache_bytes():
+    return int(sum(window.memory_usage(index=True, deep=True).sum() for window in _render_cache().values()))
+
+
+# Define fingerprint for an in-memory result held in the result store
+def frame_fingerprint(df):  # id() is reused once a replaced frame is freed, so key on the store's generation stamp
+    generation = df.attrs.get('result_generation')
+    if generation is None:  # Not from the result store: fall back to hashing the contents
+        generation = ('hash', int(pd.util.hash_pandas_object(df, index=True).sum()))
+    return (generation, df.shape, tuple(df.columns))
+
+
+# Define window builder for in-memory results (sort once per key, keep only the visible rows)
+def frame_window(df, sort_column, ascending, rows):
+    key = ('frame', frame_fingerprint(df), sort_column, ascending, rows)
+    return memoized_window(key, lambda: (df.sort_values(by=sort_column, ascending=ascending) if sort_column else df).head(rows))
+
+# ___________________________________________ #
+
+# Define function rendering one window of rows
+def render_table(window, key, renderer=None):  # window: the rows to show (already sorted and sliced)
+    renderer = renderer or TABLE_RENDERER
+    with span('render', renderer=renderer, section=key) as info:
+        info['rows'] = len(window)
+        if renderer == 'html':
+            # Cell values are user data: escape them (only the wrapper markup is trusted)
+            html_table = format_for_display(window).to_html(index=False, classes="mysql-table", escape=True)
+            info['bytes'] = len(html_table)
+            st.markdown(f'<div class="mysql-table-container">{html_table}</div>', unsafe_allow_html=True)
+        else:
+            _render_grid(window, key)
+
+
+# Define grid rendering (Arrow)
+def _render_grid(window, key):
+    # Typed columns go over the wire as Arrow; dates render without the time part
+    column_config = {
+        col: st.column_config.DateColumn(col, format="YYYY-MM-DD")
+        for col in window.columns if pd.api.types.is_datetime64_any_dtype(window[col])
+    }
+    st.dataframe(
+        window,
+        hide_index=True,
+        width="stretch",
+        height=min(GRID_MAX_HEIGHT_PX, GRID_ROW_PX * (len(window) + 1) + 3),
+        column_config=column_config,
+        key=f"{key}_grid",
+    )
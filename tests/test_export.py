@@ -0,0 +1,55 @@
+# Checks for the chunked exports
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export  # noqa: E402
+from export import write_chunks, HAS_PYARROW  # noqa: E402
+
+# ___________________________________________ #
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="Parquet export needs pyarrow")
+def test_parquet_all_null_first_chunk():  # The first chunk's null-typed columns must not fix the file schema
+    import pyarrow.parquet as pq
+    chunks = [
+        pd.DataFrame({'c': [None, None], 'Company_Name': [None, None], 'Placement_Date': [None, None],
+                      'Placement_Status': [None, None]}),
+        pd.DataFrame({'c': ['TCS'], 'Company_Name': ['TCS'], 'Placement_Date': ['2024-05-01'],
+                      'Placement_Status': ['Placed']}),
+    ]
+    result = pq.read_table(io.BytesIO(write_chunks(iter(chunks), 'Parquet'))).to_pandas()
+    assert len(result) == 3
+    assert result['c'].tolist()[2] == 'TCS'
+    assert result['Company_Name'].tolist()[2] == 'TCS'
+    assert str(result['Placement_Date'].iloc[2].date()) == '2024-05-01'
+    assert result['Placement_Status'].tolist()[2] == 'Placed'
+
+
+def test_csv_chunks_share_one_header():
+    chunks = [pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': [3]})]
+    assert write_chunks(iter(chunks), 'CSV').decode().splitlines() == ['a', '1', '2', '3']
+
+
+def test_query_export_rebuilt_after_data_load(monkeypatch):  # The data version is part of the export cache key
+    state = {'version': 1, 'builds': 0}
+
+    def fake_chunks(db_config, sql, params=None):
+        state['builds'] += 1
+        yield pd.DataFrame({'v': [state['version']]})
+
+    monkeypatch.setattr(export, 'iter_query_chunks', fake_chunks)
+    monkeypatch.setattr(export, 'current_data_version', lambda db_config: state['version'])
+    export._export_query_cached.clear()
+    config = {'host': 'test', 'database': 'student_db'}
+    first = export.export_query(config, "SELECT 1", [], 'CSV')
+    assert export.export_query(config, "SELECT 1", [], 'CSV') == first  # Served from cache
+    state['version'] = 2
+    assert export.export_query(config, "SELECT 1", [], 'CSV') != first
+    assert state['builds'] == 2
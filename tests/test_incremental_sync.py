@@ -0,0 +1,98 @@
+# Checks for the incremental sync's change detection (row_hash) and the per-chunk upsert
+import datetime
+import io
+import os
+import sys
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental_sync import row_hash, sync_chunk, generated_table_chunks, GENERATED_COLUMNS  # noqa: E402
+
+# ___________________________________________ #
+
+
+def test_csv_strings_and_stored_values_hash_alike():  # "58" from a CSV, 58 from MySQL
+    csv_row = ['G25AIML_001', '58', '2025-07-14', None]
+    stored_row = ['G25AIML_001', np.int64(58), datetime.date(2025, 7, 14), None]
+    assert row_hash(csv_row) == row_hash(stored_row)
+    assert row_hash(['7.5']) == row_hash([Decimal('7.5')])
+    assert row_hash([pd.Timestamp('2025-07-14')]) == row_hash([datetime.date(2025, 7, 14)])
+
+
+def test_null_is_not_empty_or_text():
+    assert row_hash([None]) == row_hash([float('nan')]) == row_hash([pd.NA])
+    assert row_hash([None]) != row_hash([''])
+    assert row_hash([None]) != row_hash(['None'])
+
+
+def test_changes_and_column_boundaries_are_seen():
+    assert row_hash(['a', '58']) != row_hash(['a', '59'])
+    assert row_hash(['ab', 'c']) != row_hash(['a', 'bc'])  # Values are joined with a separator
+    assert len(row_hash(['a'])) == 16
+
+
+def test_generated_rows_round_trip_through_csv():  # A re-sync of an unchanged export writes nothing
+    for table, frames in generated_table_chunks(50).items():
+        df = frames[0]
+        columns = [col for col in df.columns if col not in GENERATED_COLUMNS]
+        buffer = io.StringIO()
+        df[columns].to_csv(buffer, index=False, na_rep='\\N')
+        buffer.seek(0)
+        back = pd.read_csv(buffer, na_values=['\\N'], keep_default_na=False, dtype=str)
+        typed = df[columns].astype(object).where(df[columns].notna(), None).values.tolist()
+        strings = back.astype(object).where(back.notna(), None).values.tolist()
+        assert [row_hash(row) for row in typed] == [row_hash(row) for row in strings], table
+
+# ___________________________________________ #
+
+
+class _FakeCursor:
+    def __init__(self, stored):
+        self.stored = stored
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.stored
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, stored):
+        self.cursor_ = _FakeCursor(stored)
+        self.commits = 0
+
+    def cursor(self):
+        return self.cursor_
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def test_sync_chunk_upserts_only_changed_rows():
+    df = pd.DataFrame({'Student_ID': ['S1', 'S2', 'S3'], 'Mock_Interview_Score': ['58', '70', '40']})
+    conn = _FakeConnection([('S1', 58), ('S2', 71)])  # S2 changed, S3 is new
+    assert sync_chunk(conn, 'Placements', df) == {'S2', 'S3'}
+    sql, params = conn.cursor_.executed[-1]
+    assert sql.startswith("INSERT INTO Placements") and "ON DUPLICATE KEY UPDATE" in sql
+    assert params == ['S2', '70', 'S3', '40']
+    assert conn.commits == 1
+
+
+def test_sync_chunk_skips_unchanged_chunk():
+    df = pd.DataFrame({'Student_ID': ['S1'], 'Mock_Interview_Score': ['58']})
+    conn = _FakeConnection([('S1', 58)])
+    assert sync_chunk(conn, 'Placements', df) == set()
+    assert len(conn.cursor_.executed) == 1  # Only the SELECT of stored rows
@@ -0,0 +1,55 @@
+# Regression checks for server-side paging of ranked insights on the offline engine
+import os
+import sys
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datagen import generate_sample_data  # noqa: E402
+from offline_engine import engine_for  # noqa: E402
+from insights import INSIGHT_SPECS, build_insight, insight_order  # noqa: E402
+from pagination import make_paged_query, page_sql, next_cursor  # noqa: E402
+
+# ___________________________________________ #
+
+ENGINE = engine_for(*generate_sample_data(500))
+PAGE_SIZE = 10
+
+
+def _paged(qid, values=None):
+    sql, params = build_insight(qid, values)
+    paged = make_paged_query(sql, params, order=insight_order(qid))
+    paged['columns'] = list(ENGINE.query(f"SELECT * FROM ({paged['sql']}) AS q LIMIT 0", paged['params']).columns)
+    return paged, ENGINE.query(sql, params)
+
+
+def test_first_page_keeps_insight_ranking():  # No sort column picked: the page follows the insight's ORDER BY
+    for qid, spec in INSIGHT_SPECS.items():
+        if not spec.get('order_by'):
+            continue
+        paged, full = _paged(qid)
+        page = ENGINE.query(*page_sql(paged, None, False, {'offset': 0, 'after': None}, PAGE_SIZE))
+        for column, desc in insight_order(qid):
+            expected = full[column].head(PAGE_SIZE).tolist()
+            assert page[column].tolist() == expected, (qid, column)
+
+
+def test_keyset_pages_follow_ranking():  # Walking every page returns the whole ranked result, in order, once
+    paged, full = _paged(7)
+    cursor, pages = {'offset': 0, 'after': None}, []
+    while cursor['offset'] < len(full):
+        page = ENGINE.query(*page_sql(paged, None, False, cursor, PAGE_SIZE))
+        assert not page.empty
+        pages.append(page)
+        cursor = next_cursor(paged, page, None, cursor)
+    walked = [row for page in pages for row in page['Student_ID']]
+    assert len(walked) == len(set(walked)) == len(full)
+    for column, _ in insight_order(7):
+        assert [v for page in pages for v in page[column]] == full[column].tolist()
+
+
+def test_top_k_keeps_best_rows():  # A top-K LIMIT inside the query isn't re-sorted by Student_ID
+    paged, full = _paged(6, {'top_k': 5})
+    page = ENGINE.query(*page_sql(paged, None, False, {'offset': 0, 'after': None}, PAGE_SIZE))
+    assert set(page['Student_ID']) == set(full['Student_ID'])
+    assert page['Avg_Soft_Skills'].tolist() == full['Avg_Soft_Skills'].tolist()
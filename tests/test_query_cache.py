@@ -0,0 +1,80 @@
+# Checks for the shared query-result cache: budgets, version invalidation and loads landing mid-query
+import os
+import sys
+
+import pandas as pd
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import query_cache  # noqa: E402
+from query_cache import QueryResultCache, normalize_sql  # noqa: E402
+
+# ___________________________________________ #
+
+DB = (('database', 'student_db'), ('host', 'test'))
+
+
+def _frame(rows):
+    return pd.DataFrame({'v': range(rows)})
+
+
+def test_entry_limit_evicts_least_recently_used():
+    cache = QueryResultCache(max_entries=2, max_bytes=10 ** 9)
+    for name in ('a', 'b'):
+        cache.put((DB, name, ()), _frame(1))
+    cache.get((DB, 'a', ()))  # 'a' is now the most recent
+    cache.put((DB, 'c', ()), _frame(1))
+    assert cache.get((DB, 'b', ())) is None
+    assert cache.get((DB, 'a', ())) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget():
+    size = int(_frame(100).memory_usage(index=True, deep=True).sum())
+    cache = QueryResultCache(max_entries=100, max_bytes=size * 2)
+    for name in ('a', 'b', 'c'):
+        cache.put((DB, name, ()), _frame(100))
+    assert cache.stats()['bytes'] <= size * 2
+    assert cache.get((DB, 'a', ())) is None
+    cache.put((DB, 'huge', ()), _frame(10000))  # Larger than the whole budget: not cached
+    assert cache.get((DB, 'huge', ())) is None
+
+
+def test_version_change_drops_entries():
+    cache = QueryResultCache()
+    cache.check_version(DB, 1)
+    cache.put((DB, 'a', ()), _frame(1), 1)
+    cache.check_version(DB, 1)
+    assert cache.get((DB, 'a', ())) is not None
+    cache.check_version(DB, 2)
+    assert cache.get((DB, 'a', ())) is None
+    assert cache.stats()['invalidations'] == 2
+
+
+def test_result_read_across_a_load_is_not_stored():  # The load commits while the query runs
+    cache = QueryResultCache()
+    cache.check_version(DB, 1)
+    cache.check_version(DB, 2)  # Another session probed the new version meanwhile
+    cache.put((DB, 'a', ()), _frame(1), 1)
+    assert cache.get((DB, 'a', ())) is None
+
+
+def test_cached_query_reads_through(monkeypatch):
+    cache = QueryResultCache()
+    version = {'v': 1}
+    monkeypatch.setattr(query_cache, 'get_query_cache', lambda: cache)
+    monkeypatch.setattr(query_cache, 'current_data_version', lambda db_config: version['v'])
+    calls = []
+
+    def run():
+        calls.append(1)
+        return _frame(len(calls))
+
+    config = dict(DB)
+    query_cache.cached_query(config, "SELECT  *\nFROM Students;", [], run)
+    query_cache.cached_query(config, "SELECT * FROM Students", [], run)  # Same normalized SQL
+    assert len(calls) == 1
+    version['v'] = 2
+    assert len(query_cache.cached_query(config, "SELECT * FROM Students", [], run)) == 2
+    assert normalize_sql("SELECT 1 ;") == "SELECT 1"
@@ -0,0 +1,91 @@
+# Checks for the session result store: per-session and global budgets, eviction and re-fetch
+import os
+import sys
+
+import pandas as pd
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_store import ResultStore, result_source  # noqa: E402
+
+# ___________________________________________ #
+
+SQL = "SELECT Student_ID FROM Students WHERE City = %s"
+
+
+def _frame(rows=100):
+    return pd.DataFrame({'v': range(rows)})
+
+
+SIZE = int(_frame().memory_usage(index=True, deep=True).sum())
+
+
+def test_session_budget_evicts_least_recently_used():
+    store = ResultStore(session_budget=SIZE * 2, global_budget=SIZE * 100)
+    for name in ('a', 'b'):
+        store.put('s1', name, _frame(), result_source(SQL, ['pune']))
+    store.get('s1', 'a')  # 'a' is now the most recent
+    store.put('s1', 'c', _frame(), result_source(SQL, ['delhi']))
+    assert store.get('s1', 'b') is None
+    assert store.get('s1', 'a') is not None and store.get('s1', 'c') is not None
+    assert store.stats()['evictions'] == 1
+    assert store.session_usage('s1')[0] == {'name': 'b', 'bytes': 0, 'evicted': True, 'idle_s': 0,
+                                            'fingerprint': result_source(SQL)['fingerprint']}
+
+
+def test_global_budget_spans_sessions():
+    store = ResultStore(session_budget=SIZE * 100, global_budget=SIZE * 2)
+    store.put('s1', 'a', _frame(), result_source(SQL))
+    store.put('s2', 'a', _frame(), result_source(SQL))
+    store.put('s3', 'a', _frame(), result_source(SQL))
+    assert store.get('s1', 'a') is None
+    assert store.stats()['total_bytes'] <= SIZE * 2
+
+
+def test_newest_frame_is_kept_over_budget():  # The page still has to render what it just stored
+    store = ResultStore(session_budget=SIZE // 2, global_budget=SIZE // 2)
+    store.put('s1', 'a', _frame())
+    assert store.get('s1', 'a') is not None
+
+
+def test_frame_without_source_is_forgotten_on_eviction():
+    store = ResultStore(session_budget=SIZE, global_budget=SIZE * 100)
+    store.put('s1', 'a', _frame())
+    store.put('s1', 'b', _frame())
+    assert store.get('s1', 'a', refetch=lambda source: _frame()) is None
+    assert [row['name'] for row in store.session_usage('s1')] == ['b']
+
+
+def test_refetch_rebuilds_and_keeps_generation():
+    store = ResultStore(session_budget=SIZE, global_budget=SIZE * 100)
+    first = _frame()
+    store.put('s1', 'a', first, result_source(SQL, ['pune']))
+    generation = first.attrs['result_generation']
+    store.put('s1', 'b', _frame(), result_source(SQL, ['delhi']))  # Evicts 'a'
+    seen = []
+
+    def refetch(source):
+        seen.append(source['params'])
+        return _frame()
+
+    again = store.get('s1', 'a', refetch)
+    assert seen == [['pune']]
+    assert again.attrs['result_generation'] == generation  # Same rows: rendered windows stay valid
+    assert store.stats()['refetches'] == 1
+    assert {row['name']: row['evicted'] for row in store.session_usage('s1')} == {'a': False, 'b': True}
+    store.put('s1', 'a', _frame(), result_source(SQL, ['pune']))  # A new search is a new generation
+    assert store.get('s1', 'a').attrs['result_generation'] != generation
+
+
+def test_discard_and_drop_session_release_bytes():
+    store = ResultStore()
+    store.put('s1', 'a', _frame(), result_source(SQL))
+    store.put('s1', 'b', _frame(), result_source(SQL))
+    store.put('s2', 'a', _frame(), result_source(SQL))
+    store.discard('s1', 'a')
+    assert store.get('s1', 'a') is None
+    assert store.session_bytes['s1'] == SIZE
+    store.drop_session('s1')
+    assert store.session_usage('s1') == []
+    assert store.stats()['total_bytes'] == SIZE and store.stats()['sessions'] == 1
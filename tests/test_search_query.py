@@ -0,0 +1,125 @@
+# Checks for the search-box grammar (search_query.py) and the SQL it produces
+import os
+import sys
+
+import pytest
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema_catalog import FALLBACK_CATALOG  # noqa: E402
+from search_query import parse_search, display_columns  # noqa: E402
+from datagen import generate_sample_data  # noqa: E402
+from offline_engine import engine_for  # noqa: E402
+from search_index import SEARCH_RESULT_LIMIT  # noqa: E402
+
+# ___________________________________________ #
+
+SKILLS = frozenset({'python', 'ai', 'pytorch'})
+
+
+def _parse(criteria):
+    return parse_search(criteria, FALLBACK_CATALOG, SKILLS)
+
+
+def test_field_value_is_exact_match():
+    plan = _parse("city:Chennai")
+    assert plan.predicates == [('Students', 'City', '=', ['chennai'])]
+    assert plan.where() == ("s.City = %s", ['chennai'])
+    assert plan.where(profile=True) == ("s.City = %s", ['chennai'])
+
+
+def test_alternatives_become_padded_in_list():
+    clause, params = _parse("city:chennai|pune|delhi").where()
+    assert clause == "s.City IN (%s, %s, %s, %s)"
+    assert params == ['chennai', 'pune', 'delhi', 'delhi']  # Padded to a power of two
+
+
+def test_comparison_is_typed():
+    plan = _parse("mock>=80")
+    assert plan.predicates == [('Placements', 'Mock_Interview_Score', '>=', [80])]
+    assert plan.where() == ("p.Mock_Interview_Score >= %s", [80])
+    assert plan.columns == ['Mock_Interview_Score']
+
+
+def test_range():
+    plan = _parse("grad:2024..2025")
+    assert plan.where() == ("s.Graduation_Year BETWEEN %s AND %s", [2024, 2025])
+
+
+def test_date_values_are_validated():
+    assert _parse("date>=2024-06-30").where()[1] == ['2024-06-30']
+    with pytest.raises(ValueError, match="expected a date"):
+        _parse("date>=30-06-2024")
+
+
+def test_status_terms_are_exact():
+    plan = _parse("ready, not ready")
+    assert plan.statuses == ['Ready', 'Not Ready']
+    assert plan.where()[0] == "p.Placement_Status IN (%s, %s)"
+
+
+def test_bad_values_and_unknown_fields_raise():
+    with pytest.raises(ValueError, match="expected a number"):
+        _parse("mock>=abc")
+    with pytest.raises(ValueError, match="unknown field 'mok'"):
+        _parse("mok>=80")
+    with pytest.raises(ValueError, match="unknown field"):
+        _parse("grade:1..2")
+    with pytest.raises(ValueError, match="needs a numeric or date column"):
+        _parse("city>chennai")
+
+
+def test_word_colon_word_is_free_text():
+    assert _parse("foo:bar").text == ['foo:bar']
+
+
+def test_column_selector_needs_exact_name():  # "ai" is inside "Email" but is a skill, not a column selector
+    plan = _parse("ai")
+    assert plan.columns == [] and plan.skills == ['ai']
+    assert _parse("Email").columns == ['Email']
+    assert _parse("mock").columns == ['Mock_Interview_Score']  # Field alias
+    assert _parse("internship").columns == ['Internships_Completed']  # Common word for a column
+    assert _parse("nai").text == ['nai']  # Part of a column name: free text
+
+
+def test_skills_and_text():
+    plan = _parse("python, pytorch, chennai")
+    assert plan.skills == ['python', 'pytorch']
+    assert plan.text == ['chennai']
+    clause, params = plan.where(ids=['G25AIML_001'])
+    assert "Student_Skills" in clause and clause.endswith("s.Student_ID IN (%s)")
+    assert params[-1] == 'G25AIML_001'
+
+
+def test_no_free_text_matches_means_nothing():
+    assert _parse("chennai").where(ids=[]) == ("1=0", [])
+
+
+def test_comma_list_fields_use_skill_tags():
+    plan = _parse("lang:Python")
+    assert plan.predicates == [('Programming', 'Language', 'skill', ['python'])]
+    assert "Student_Skills" in plan.where()[0]
+
+# ___________________________________________ #
+
+ENGINE = engine_for(*generate_sample_data(500))
+
+
+def test_offline_search_matches_filters():
+    result = ENGINE.search("ready, mock>=55")
+    assert not result.empty
+    assert (result['Placement_Status'] == 'Ready').all()
+    assert (result['Mock_Interview_Score'] >= 55).all()
+
+
+def test_column_only_search_is_bounded():
+    sql, _, ids = ENGINE.search_query("email")
+    assert ids is None and sql.endswith(f"LIMIT {SEARCH_RESULT_LIMIT}")
+
+
+def test_display_columns_follow_the_plan():
+    plan = _parse("mock>=80")
+    result = ENGINE.search("mock>=80")
+    assert display_columns(plan, result, FALLBACK_CATALOG)[:5] == \
+        ['Name', 'Student_ID', 'Course_Batch', 'Placement_Status', 'Mock_Interview_Score']
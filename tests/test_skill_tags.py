@@ -0,0 +1,30 @@
+# Checks for the skill-tag parser that fills Student_Skills
+import os
+import sys
+
+# Run from the repository root or from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_tags import parse_skills, skill_rows, SKILL_MAX_LENGTH  # noqa: E402
+
+# ___________________________________________ #
+
+
+def test_parse_skills_normalizes_and_dedups():
+    assert parse_skills("Python, mysql,  PyTorch, python,,") == ['python', 'mysql', 'pytorch']
+    assert parse_skills(None) == []
+
+
+def test_skill_rows_tag_both_kinds():
+    rows = skill_rows([('S1', 'Python, SQL', 'AWS, python')])
+    assert rows == [('S1', 'python', 'language'), ('S1', 'sql', 'language'),
+                    ('S1', 'aws', 'certification'), ('S1', 'python', 'certification')]
+
+
+def test_over_long_tags_are_reported_not_truncated():
+    long_tag = 'x' * (SKILL_MAX_LENGTH + 1)
+    too_long = []
+    rows = skill_rows([('S1', f"python, {long_tag}", None)], too_long)
+    assert rows == [('S1', 'python', 'language')]
+    assert too_long == [('S1', long_tag, 'language')]
+    assert skill_rows([('S1', 'x' * SKILL_MAX_LENGTH, None)])[0][1] == 'x' * SKILL_MAX_LENGTH
@@ -0,0 +1,86 @@
+# Import pandas library for dtype conversion
+import pandas as pd
+
+# Attempt to import pyarrow for Arrow-backed string columns
+try:
+    import pyarrow  # noqa: F401
+    # Set HAS_PYARROW to True if import succeeds
+    HAS_PYARROW = True
+# Handle ModuleNotFoundError if pyarrow is not installed
+except ModuleNotFoundError:
+    HAS_PYARROW = False
+
+# ___________________________________________ #
+
+# Arrow-backed strings when pyarrow is installed, pandas' own string dtype otherwise
+STRING_DTYPE = "string[pyarrow]" if HAS_PYARROW else "string"
+
+# Compact dtypes for the columns in the CREATE TABLE definitions (nullable, so NULL stays NA)
+SCHEMA_DTYPES = {
+    # Students
+    'Student_ID': STRING_DTYPE,
+    'Name': STRING_DTYPE,
+    'Age': 'Int8',
+    'Gender': 'category',
+    'Email': STRING_DTYPE,
+    'Phone': STRING_DTYPE,
+    'Enrollment_Year': 'category',
+    'Course_Batch': 'category',
+    'City': 'category',
+    'Graduation_Year': 'Int16',
+    # Programming
+    'Programming_ID': STRING_DTYPE,
+    'Language': STRING_DTYPE,
+    'Problems_Solved': 'Int16',
+    'Assessments_Completed': 'Int8',
+    'Mini_Projects': 'Int8',
+    'Certifications_Earned': STRING_DTYPE,
+    'Latest_Project_Score': 'Int8',
+    # Soft_Skills
+    'Soft_Skills_ID': STRING_DTYPE,
+    'Communication_Score': 'Int8',
+    'Teamwork_Score': 'Int8',
+    'Presentation_Score': 'Int8',
+    'Leadership_Score': 'Int8',
+    'Critical_Thinking': 'Int8',
+    'Interpersonal_Skills': 'Int8',
+    # Placements
+    'Mock_Interview_Score': 'Int8',
+    'Internships_Completed': 'Int8',
+    'Company_Name': STRING_DTYPE,
+    'Placement_Package': 'Int32',
+    'Interview_Rounds_Cleared': 'Int8',
+    'Placement_Date': 'datetime64[s]',
+    'Placement_Status': 'category',
+    # Insight aliases and aggregates
+    'Location': 'category',
+    'Avg_Soft_Skills': 'Float64',  # DECIMAL(7,4): float32 would show (and export) 72.833336 for 72.8333
+    'Ready_Students_Count': 'Int32',
+}
+
+# ___________________________________________ #
+
+# Define function converting a raw result frame to the compact schema dtypes
+def apply_schema_dtypes(df):  # Unknown columns (and values that don't fit) keep their inferred dtype
+    converted = {}
+    for col in df.columns:
+        dtype = SCHEMA_DTYPES.get(col)
+        if dtype is None or str(df[col].dtype) == dtype:
+            continue
+        try:
+            if dtype.startswith('datetime64'):
+                converted[col] = pd.to_datetime(df[col], errors='coerce').astype(dtype)
+            else:
+                converted[col] = df[col].astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            continue  # Out-of-range or unexpected values: leave the column as loaded
+    return df.assign(**converted) if converted else df
+
+
+# Define function formatting only the rows that are about to be rendered
+def format_for_display(df):  # NA -> '' and dates without the time part, on the visible page only
+    display = df.astype(object)
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            display[col] = df[col].dt.strftime('%Y-%m-%d').astype(object)
+    return display.where(df.notna(), '')